@@ -0,0 +1,45 @@
+import argparse
+import tempfile
+import time
+
+from benchmarks.program_generator import generate_program
+from src.lexer.lexer import Lexer
+from src.parser.ast_cache import AstCache
+from src.parser.parser import Parser
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="AST cache load vs parse")
+    arg_parser.add_argument("--classes", type=int, nargs="+", default=[100, 1000])
+    args = arg_parser.parse_args()
+
+    print(
+        f"{'classes':>8} {'parse (s)':>10} {'store (s)':>10} {'load (s)':>9} "
+        f"{'entry (MB)':>11} {'speedup':>8}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        cache = AstCache(directory)
+        for class_count in args.classes:
+            source = generate_program(class_count)
+            start = time.perf_counter()
+            program = Parser(Lexer(source).tokenize_buffer()).parse_program()
+            parsing = time.perf_counter() - start
+
+            start = time.perf_counter()
+            cache.store(cache.key(source), program)
+            storing = time.perf_counter() - start
+
+            start = time.perf_counter()
+            cache.load(cache.key(source))
+            loading = time.perf_counter() - start
+
+            size = sum(size for _, size, _ in cache.entries()) / 1_000_000
+            cache.clear()
+            print(
+                f"{class_count:>8} {parsing:>10.3f} {storing:>10.3f} {loading:>9.3f} "
+                f"{size:>11.2f} {parsing / loading:>7.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
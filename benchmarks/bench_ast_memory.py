@@ -0,0 +1,74 @@
+import argparse
+import tracemalloc
+
+from benchmarks.program_generator import generate_program
+from src.lexer.lexer import Lexer
+from src.parser.ast_serialization import (NODE, NODE_SCHEMA, NODES,
+                                          node_to_tuple)
+from src.parser.parser import Parser
+
+
+class DictNode:
+    # Stand-in for a node class without __slots__, for comparison
+    pass
+
+
+def build_dict_nodes(encoded) -> tuple:
+    # Rebuilds an encoded tree out of DictNode objects, returns (node, count)
+    if encoded is None:
+        return None, 0
+    node = DictNode()
+    count = 1
+    for (name, kind), value in zip(NODE_SCHEMA[encoded[0]][1], encoded[1:]):
+        if kind == NODE:
+            value, children = build_dict_nodes(value)
+            count += children
+        elif kind == NODES and value is not None:
+            items = []
+            for item in value:
+                child, children = build_dict_nodes(item)
+                items.append(child)
+                count += children
+            value = items
+        setattr(node, name, value)
+    return node, count
+
+
+def traced(build) -> tuple:
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="AST memory per node")
+    arg_parser.add_argument("--classes", type=int, nargs="+", default=[100, 1000, 3000])
+    args = arg_parser.parse_args()
+
+    print(
+        f"{'classes':>8} {'nodes':>9} {'source (MB)':>12} {'form':>9} "
+        f"{'AST (MB)':>9} {'bytes/node':>11}"
+    )
+    for class_count in args.classes:
+        source = generate_program(class_count)
+        tokens = Lexer(source).tokenize_buffer()
+        # Identifiers are interned before measuring, so only the tree counts
+        Parser(tokens).parse_program()
+
+        program, slotted = traced(lambda: Parser(tokens).parse_program())
+        encoded = node_to_tuple(program)
+        del program
+        (_, node_count), with_dict = traced(lambda: build_dict_nodes(encoded))
+
+        megabytes = len(source) / 1_000_000
+        for form, size in [("__dict__", with_dict), ("__slots__", slotted)]:
+            print(
+                f"{class_count:>8} {node_count:>9} {megabytes:>12.2f} {form:>9} "
+                f"{size / 1_000_000:>9.2f} {size / node_count:>11.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import argparse
+import time
+import tracemalloc
+
+from benchmarks.program_generator import generate_program
+from src.code_generator.code_generator import CodeGenerator
+from src.code_generator.flat_code_generator import FlatCodeGenerator
+from src.lexer.lexer import Lexer
+from src.parser.ast_serialization import deserialize_nodes, serialize_nodes
+from src.parser.flat_ast import FlatAst, flatten
+from src.parser.parser import Parser
+
+
+def timed(function) -> tuple:
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def traced(function) -> tuple:
+    tracemalloc.start()
+    result = function()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Object AST vs flat AST")
+    arg_parser.add_argument("--classes", type=int, nargs="+", default=[100, 1000])
+    args = arg_parser.parse_args()
+
+    print(
+        f"{'nodes':>9} {'form':>7} {'bytes/node':>11} {'codegen (s)':>12} "
+        f"{'save (s)':>9} {'load (s)':>9} {'saved (MB)':>11}"
+    )
+    for class_count in args.classes:
+        tokens = Lexer(generate_program(class_count)).tokenize_buffer()
+        Parser(tokens).parse_program()  # Interns identifiers before measuring
+        program, tree_memory = traced(lambda: Parser(tokens).parse_program())
+        flat, flat_memory = traced(lambda: flatten(program))
+        node_count = len(flat)
+
+        _, tree_codegen = timed(lambda: CodeGenerator().visit(program))
+        tree_data, tree_save = timed(lambda: serialize_nodes([program]))
+        _, tree_load = timed(lambda: deserialize_nodes(tree_data))
+
+        _, flat_codegen = timed(lambda: FlatCodeGenerator().generate(flat))
+        flat_data, flat_save = timed(flat.to_bytes)
+        _, flat_load = timed(lambda: FlatAst.from_bytes(flat_data))
+
+        for form, memory, codegen, save, load, data in [
+            ("objects", tree_memory, tree_codegen, tree_save, tree_load, tree_data),
+            ("flat", flat_memory, flat_codegen, flat_save, flat_load, flat_data),
+        ]:
+            print(
+                f"{node_count:>9} {form:>7} {memory / node_count:>11.1f} "
+                f"{codegen:>12.3f} {save:>9.3f} {load:>9.3f} "
+                f"{len(data) / 1_000_000:>11.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import argparse
+import time
+
+from benchmarks.program_generator import generate_program
+from src.lexer.lexer import Lexer
+from src.parser.incremental_parser import IncrementalParser
+from src.parser.parser import Parser
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description="Full parse vs incremental reparse after a one-method edit"
+    )
+    arg_parser.add_argument("--classes", type=int, default=2000)
+    arg_parser.add_argument("--edits", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    source = generate_program(args.classes)
+    print(f"source: {len(source) / 1_000_000:.1f} MB, {args.classes} classes")
+
+    start = time.perf_counter()
+    Parser(Lexer(source).tokenize()).parse_program()
+    full = time.perf_counter() - start
+
+    parser = IncrementalParser()
+    start = time.perf_counter()
+    parser.parse(source)
+    first = time.perf_counter() - start
+
+    # Each edit changes one statement in one method of a different class
+    incremental = 0.0
+    for edit in range(args.edits):
+        class_start = source.index(f"class Class{edit * args.classes // args.edits} ")
+        offset = source.index("floor_result + 1", class_start) + len("floor_result + ")
+        source = source[:offset] + str(edit + 2) + source[offset + 1 :]
+        start = time.perf_counter()
+        parser.parse(source)
+        incremental += time.perf_counter() - start
+    incremental /= args.edits
+
+    print(f"{'parse':>20} {'time (s)':>9} {'classes parsed':>15}")
+    print(f"{'full':>20} {full:>9.3f} {args.classes:>15}")
+    print(f"{'incremental, first':>20} {first:>9.3f} {args.classes:>15}")
+    print(f"{'incremental, edit':>20} {incremental:>9.3f} {parser.parsed_classes:>15}")
+    print(f"speedup per edit: {full / incremental:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import argparse
+import time
+
+from benchmarks.program_generator import generate_program
+from src.lexer.lexer import Lexer
+from src.parser.lazy_parser import LazyParser
+from src.parser.parser import Parser
+
+
+# A signature-only pass: class hierarchy and method signatures
+def outline(program) -> list:
+    lines = []
+    for class_def in program.class_defs:
+        lines.append(f"class {class_def.class_name}({class_def.extend_class_name})")
+        for method in class_def.methods:
+            parameters = ", ".join(f"{kind} {name}" for kind, name in method.parameters)
+            lines.append(f"  {method.method_type} {method.method_name}({parameters})")
+    return lines
+
+
+def time_outline(parser_class, tokens, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        outline(parser_class(tokens).parse_program())
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description="Signature-only pass with eager vs lazy method bodies"
+    )
+    arg_parser.add_argument("--classes", type=int, nargs="+", default=[100, 1000])
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    print(
+        f"{'classes':>8} {'lex (s)':>8} {'eager (s)':>10} {'lazy (s)':>9} {'speedup':>8}"
+    )
+    for class_count in args.classes:
+        source = generate_program(class_count)
+        start = time.perf_counter()
+        tokens = Lexer(source).tokenize_buffer()
+        lexing = time.perf_counter() - start
+        eager = time_outline(Parser, tokens, args.repeat)
+        lazy = time_outline(LazyParser, tokens, args.repeat)
+        print(
+            f"{class_count:>8} {lexing:>8.3f} {eager:>10.3f} {lazy:>9.3f} "
+            f"{eager / lazy:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import argparse
+import time
+
+from benchmarks.program_generator import generate_program
+from src.lexer.lexer import Lexer, numpy_available
+
+# (label, engine, output form)
+CONFIGURATIONS = [
+    ("reference", "reference", "list"),
+    ("regex", "regex", "list"),
+    ("regex/buffer", "regex", "buffer"),
+]
+if numpy_available():
+    CONFIGURATIONS.append(("numpy/buffer", "numpy", "buffer"))
+
+
+def time_engine(source: str, engine: str, form: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        lexer = Lexer(source, engine=engine)
+        start = time.perf_counter()
+        if form == "buffer":
+            lexer.tokenize_buffer()
+        else:
+            lexer.tokenize()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Lexer throughput benchmark")
+    arg_parser.add_argument("--classes", type=int, nargs="+", default=[100, 1000, 5000])
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    print(f"{'size (MB)':>10} {'engine':>13} {'MB/s':>8} {'vs reference':>13}")
+    for class_count in args.classes:
+        source = generate_program(class_count)
+        megabytes = len(source) / 1_000_000
+        reference = None
+        for label, engine, form in CONFIGURATIONS:
+            elapsed = time_engine(source, engine, form, args.repeat)
+            reference = reference or elapsed
+            print(
+                f"{megabytes:>10.2f} {label:>13} {megabytes / elapsed:>8.2f} "
+                f"{reference / elapsed:>12.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
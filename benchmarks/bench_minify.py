@@ -0,0 +1,70 @@
+import argparse
+import io
+import os
+import shutil
+import subprocess
+import tempfile
+
+from benchmarks.program_generator import generate_program
+from src.compiler import COMPACT, MINIFY, PRETTY, write_javascript
+from src.lexer.lexer import Lexer
+from src.parser.parser import Parser
+
+# Prints how long node takes to parse and compile the script, best of 5
+NODE_COMPILE = """
+const fs = require("fs");
+const vm = require("vm");
+const source = fs.readFileSync(process.argv[1], "utf8");
+let best = Infinity;
+for (let run = 0; run < 5; run++) {
+    const start = process.hrtime.bigint();
+    new vm.Script(source, { filename: "run" + run + ".js" });
+    best = Math.min(best, Number(process.hrtime.bigint() - start) / 1e9);
+}
+console.log(best);
+"""
+
+
+def node_compile_time(path: str):
+    if shutil.which("node") is None:
+        return None
+    result = subprocess.run(
+        ["node", "-e", NODE_COMPILE, path], capture_output=True, text=True
+    )
+    return float(result.stdout)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Minified JS output")
+    arg_parser.add_argument("--classes", type=int, nargs="+", default=[100, 1000])
+    args = arg_parser.parse_args()
+
+    print(
+        f"{'classes':>8} {'style':>8} {'JS (KB)':>9} {'size':>6} "
+        f"{'node compile (ms)':>18}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "out.js")
+        for class_count in args.classes:
+            tokens = Lexer(generate_program(class_count)).tokenize_buffer()
+            program = Parser(tokens).parse_program()
+            pretty_size = None
+            for style in [PRETTY, COMPACT, MINIFY]:
+                sink = io.StringIO()
+                write_javascript(program, sink, style, mangle_private=True)
+                with open(path, "w") as file:
+                    file.write(sink.getvalue())
+                size = os.path.getsize(path)
+                pretty_size = pretty_size or size
+                compile_time = node_compile_time(path)
+                compile_text = (
+                    "-" if compile_time is None else f"{compile_time * 1000:.2f}"
+                )
+                print(
+                    f"{class_count:>8} {style:>8} {size / 1000:>9.1f} "
+                    f"{size / pretty_size:>5.0%} {compile_text:>18}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.program_generator import generate_program
+
+# Lexes the file in a fresh interpreter and prints its peak RSS in KB. VmHWM is
+# used because ru_maxrss is inherited from the (large) parent process.
+LEX_SCRIPT = """
+import sys
+from src.lexer.lexer import Lexer
+from src.lexer.mapped_source import map_source, release_behind
+
+path, mode = sys.argv[1], sys.argv[2]
+if mode == "mmap":
+    with map_source(path) as source:
+        for token in release_behind(Lexer(source).iter_tokens(), source):
+            pass
+else:
+    with open(path) as file:
+        source = file.read()
+    for token in Lexer(source).iter_tokens():
+        pass
+with open("/proc/self/status") as status:
+    for line in status:
+        if line.startswith("VmHWM:"):
+            print(line.split()[1])
+"""
+
+
+def peak_rss(path: str, mode: str) -> int:
+    result = subprocess.run(
+        [sys.executable, "-c", LEX_SCRIPT, path, mode],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return int(result.stdout)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description="Peak RSS of streaming lexing, read() vs. memory-mapped input"
+    )
+    arg_parser.add_argument("--classes", type=int, nargs="+", default=[10000, 50000])
+    args = arg_parser.parse_args()
+
+    print(f"{'file (MB)':>10} {'read (MB)':>10} {'mmap (MB)':>10}")
+    for class_count in args.classes:
+        with tempfile.NamedTemporaryFile("w", suffix=".pp", delete=False) as file:
+            file.write(generate_program(class_count))
+        try:
+            size = os.path.getsize(file.name) / 1_000_000
+            read_rss = peak_rss(file.name, "read") / 1000
+            mmap_rss = peak_rss(file.name, "mmap") / 1000
+            print(f"{size:>10.1f} {read_rss:>10.1f} {mmap_rss:>10.1f}")
+        finally:
+            os.unlink(file.name)
+
+
+if __name__ == "__main__":
+    main()
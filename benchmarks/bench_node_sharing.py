@@ -0,0 +1,53 @@
+import argparse
+import time
+import tracemalloc
+
+from benchmarks.program_generator import generate_program
+from src.lexer.lexer import Lexer
+from src.parser.node_factory import HashConsingFactory
+from src.parser.parser import Parser
+
+
+def measure(tokens, make_factory) -> tuple:
+    # (seconds, retained bytes, factory) of one parse
+    Parser(tokens, factory=make_factory()).parse_program()
+    start = time.perf_counter()
+    Parser(tokens, factory=make_factory()).parse_program()
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    factory = make_factory()
+    program = Parser(tokens, factory=factory).parse_program()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del program
+    return seconds, size, factory
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Hash-consed AST sharing")
+    arg_parser.add_argument("--classes", type=int, nargs="+", default=[100, 1000])
+    args = arg_parser.parse_args()
+
+    print(
+        f"{'classes':>8} {'factory':>13} {'parse (s)':>10} {'AST (MB)':>9} "
+        f"{'nodes':>9} {'distinct':>9}"
+    )
+    for class_count in args.classes:
+        tokens = Lexer(generate_program(class_count)).tokenize_buffer()
+        for name, make_factory in [
+            ("plain", lambda: None),
+            ("hash-consing", HashConsingFactory),
+        ]:
+            seconds, size, factory = measure(tokens, make_factory)
+            if factory is None:
+                nodes = distinct = "-"
+            else:
+                nodes, distinct = factory.requested, len(factory.table)
+            print(
+                f"{class_count:>8} {name:>13} {seconds:>10.3f} "
+                f"{size / 1_000_000:>9.2f} {nodes:>9} {distinct:>9}"
+            )
+
+
+if __name__ == "__main__":
+    main()
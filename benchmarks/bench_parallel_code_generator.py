@@ -0,0 +1,57 @@
+import argparse
+import io
+import os
+import time
+
+from benchmarks.program_generator import generate_program
+from src.code_generator.parallel_code_generator import generate_parallel
+from src.code_generator.pretty_code_generator import PrettyCodeGenerator
+from src.code_generator.streaming_code_generator import StreamingCodeGenerator
+from src.lexer.lexer import Lexer
+from src.parser.parser import Parser
+
+GENERATORS = {"pretty": PrettyCodeGenerator, "compact": StreamingCodeGenerator}
+
+
+def main():
+    cpu_count = os.cpu_count() or 1
+    default_workers = [2**power for power in range(1, 6) if 2**power <= cpu_count]
+    arg_parser = argparse.ArgumentParser(
+        description="Parallel class code generation speedup by number of worker processes"
+    )
+    arg_parser.add_argument("--classes", type=int, default=5000)
+    arg_parser.add_argument(
+        "--workers", type=int, nargs="+", default=default_workers or [2]
+    )
+    arg_parser.add_argument("--style", choices=GENERATORS, default="pretty")
+    arg_parser.add_argument(
+        "--no-fork",
+        action="store_true",
+        help="send the classes to the workers serialized instead of forking",
+    )
+    args = arg_parser.parse_args()
+
+    source = generate_program(args.classes)
+    program = Parser(Lexer(source).tokenize()).parse_program()
+    generator_class = GENERATORS[args.style]
+    print(f"source: {len(source) / 1_000_000:.1f} MB, {cpu_count} CPUs")
+
+    sink = io.StringIO()
+    start = time.perf_counter()
+    generator_class().generate(program, sink)
+    sequential = time.perf_counter() - start
+    expected = sink.getvalue()
+    print(f"{'workers':>8} {'time (s)':>9} {'speedup':>8}")
+    print(f"{'seq':>8} {sequential:>9.3f} {1.0:>7.2f}x")
+    for workers in args.workers:
+        sink = io.StringIO()
+        # Shipping the classes to the workers is included
+        start = time.perf_counter()
+        generate_parallel(program, sink, workers, generator_class, 0, not args.no_fork)
+        elapsed = time.perf_counter() - start
+        assert sink.getvalue() == expected
+        print(f"{workers:>8} {elapsed:>9.3f} {sequential / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import argparse
+import os
+import time
+
+from benchmarks.program_generator import generate_program
+from src.lexer.lexer import Lexer
+from src.lexer.parallel_lexer import tokenize_parallel
+
+
+def main():
+    cpu_count = os.cpu_count() or 1
+    default_workers = [1] + [2**power for power in range(1, 6) if 2**power <= cpu_count]
+    arg_parser = argparse.ArgumentParser(
+        description="Parallel lexing speedup by number of worker processes"
+    )
+    arg_parser.add_argument("--classes", type=int, default=20000)
+    arg_parser.add_argument("--workers", type=int, nargs="+", default=default_workers)
+    args = arg_parser.parse_args()
+
+    source = generate_program(args.classes)
+    print(f"source: {len(source) / 1_000_000:.1f} MB, {cpu_count} CPUs")
+
+    start = time.perf_counter()
+    Lexer(source).tokenize_buffer()
+    sequential = time.perf_counter() - start
+    print(f"{'workers':>8} {'time (s)':>9} {'speedup':>8}")
+    print(f"{'seq':>8} {sequential:>9.3f} {1.0:>7.2f}x")
+    for workers in args.workers:
+        start = time.perf_counter()
+        tokenize_parallel(source, workers, min_size=0)
+        elapsed = time.perf_counter() - start
+        print(f"{workers:>8} {elapsed:>9.3f} {sequential / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import argparse
+import time
+
+from benchmarks.program_generator import generate_expressions, generate_program
+from src.lexer.lexer import Lexer
+from src.lexer.token import TokenType
+from src.parser.ast_nodes import BinaryOpNode
+from src.parser.parser import Parser
+from src.parser.parser_constants import COMPARISON_OPERATORS, EQUAL_OPERATORS
+
+
+class DescentChainParser(Parser):
+    # The original one-method-per-level expression chain, kept here only as
+    # the baseline for the precedence-climbing parser
+    def parse_expression(self, min_precedence: int = 1):
+        return self.parse_equality()
+
+    def parse_equality(self):
+        left_expression = self.parse_comparison()
+        while self.current_type in EQUAL_OPERATORS:
+            operator = self.current_value
+            self.next_token()
+            right_expression = self.parse_comparison()
+            left_expression = BinaryOpNode(operator, left_expression, right_expression)
+        return left_expression
+
+    def parse_comparison(self):
+        left_expression = self.parse_addition()
+        while self.current_type in COMPARISON_OPERATORS:
+            operator = self.current_value
+            self.next_token()
+            right_expression = self.parse_addition()
+            left_expression = BinaryOpNode(operator, left_expression, right_expression)
+        return left_expression
+
+    def parse_addition(self):
+        left_expression = self.parse_multiplication()
+        while self.current_type in (TokenType.PLUS, TokenType.MINUS):
+            operator = self.current_value
+            self.next_token()
+            right_expression = self.parse_multiplication()
+            left_expression = BinaryOpNode(operator, left_expression, right_expression)
+        return left_expression
+
+    def parse_multiplication(self):
+        left_expression = self.parse_call()
+        while self.current_type in (TokenType.MULTIPLY, TokenType.DIVIDE):
+            operator = self.current_value
+            self.next_token()
+            right_expression = self.parse_call()
+            left_expression = BinaryOpNode(operator, left_expression, right_expression)
+        return left_expression
+
+
+def time_parser(parser_class, tokens: list, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parser_class(tokens).parse_program()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Parser microbenchmark")
+    arg_parser.add_argument("--statements", type=int, default=50000)
+    arg_parser.add_argument("--classes", type=int, default=500)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    inputs = [
+        ("expressions", generate_expressions(args.statements)),
+        ("classes", generate_program(args.classes)),
+    ]
+    print(
+        f"{'input':>12} {'tokens':>9} {'chain (s)':>10} {'climbing (s)':>13} {'speedup':>8}"
+    )
+    for name, source in inputs:
+        tokens = Lexer(source).tokenize()
+        chain = time_parser(DescentChainParser, tokens, args.repeat)
+        climbing = time_parser(Parser, tokens, args.repeat)
+        print(
+            f"{name:>12} {len(tokens):>9} {chain:>10.3f} {climbing:>13.3f} "
+            f"{chain / climbing:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
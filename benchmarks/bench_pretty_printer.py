@@ -0,0 +1,49 @@
+import argparse
+import io
+import time
+
+from benchmarks.program_generator import generate_program
+from src.compiler import JSBEAUTIFIER, PRETTY, write_javascript
+from src.lexer.lexer import Lexer
+from src.parser.parser import Parser
+
+
+def timed(function) -> float:
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Formatted JS output")
+    arg_parser.add_argument("--classes", type=int, nargs="+", default=[10, 100, 300])
+    args = arg_parser.parse_args()
+
+    # jsbeautifier is imported on first use, time that separately
+    import_time = timed(lambda: __import__("jsbeautifier"))
+    print(f"jsbeautifier import: {import_time:.3f} s")
+    print(
+        f"{'classes':>8} {'parse (s)':>10} {'jsbeautifier (s)':>17} "
+        f"{'built-in (s)':>13} {'speedup':>8}"
+    )
+    for class_count in args.classes:
+        source = generate_program(class_count)
+        program = None
+
+        def parse():
+            nonlocal program
+            program = Parser(Lexer(source).tokenize_buffer()).parse_program()
+
+        parse_time = timed(parse)
+        beautified = timed(
+            lambda: write_javascript(program, io.StringIO(), JSBEAUTIFIER)
+        )
+        pretty = timed(lambda: write_javascript(program, io.StringIO(), PRETTY))
+        print(
+            f"{class_count:>8} {parse_time:>10.3f} {beautified:>17.3f} "
+            f"{pretty:>13.3f} {beautified / pretty:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
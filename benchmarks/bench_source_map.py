@@ -0,0 +1,66 @@
+import argparse
+import io
+import time
+
+from benchmarks.program_generator import generate_program
+from src.code_generator.pretty_code_generator import PrettyCodeGenerator
+from src.code_generator.source_map import MappedPrettyCodeGenerator, SourceMap
+from src.lexer.lexer import Lexer
+from src.lexer.line_index import LineIndex
+from src.parser.parser import Parser
+
+
+# Best of a few runs, to keep out noise
+def best_time(function, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def compile_plain(source: str):
+    program = Parser(Lexer(source).tokenize()).parse_program()
+    PrettyCodeGenerator().generate(program, io.StringIO())
+
+
+def compile_mapped(source: str):
+    source_map = SourceMap("program.pp", LineIndex(source), file="program.js")
+    program = Parser(
+        Lexer(source).tokenize(), offsets=source_map.offsets
+    ).parse_program()
+    MappedPrettyCodeGenerator().generate_mapped(program, io.StringIO(), source_map)
+    source_map.to_json()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description="Cost of writing a source map along with the JavaScript"
+    )
+    arg_parser.add_argument("--classes", type=int, nargs="+", default=[100, 1000])
+    args = arg_parser.parse_args()
+
+    print(
+        f"{'classes':>8} {'mappings':>9} {'map (KB)':>9} {'plain (s)':>10} "
+        f"{'mapped (s)':>11} {'overhead':>9}"
+    )
+    for class_count in args.classes:
+        source = generate_program(class_count)
+        plain = best_time(lambda: compile_plain(source))
+        mapped = best_time(lambda: compile_mapped(source))
+
+        source_map = SourceMap("program.pp", LineIndex(source))
+        program = Parser(
+            Lexer(source).tokenize(), offsets=source_map.offsets
+        ).parse_program()
+        MappedPrettyCodeGenerator().generate_mapped(program, io.StringIO(), source_map)
+        map_size = len(source_map.to_json()) / 1024
+        print(
+            f"{class_count:>8} {len(source_map.mappings):>9} {map_size:>9.0f} "
+            f"{plain:>10.3f} {mapped:>11.3f} {mapped / plain - 1:>8.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import argparse
+import io
+import time
+
+from benchmarks.program_generator import generate_program
+from src.code_generator.stack_code_generator import StackCodeGenerator
+from src.code_generator.streaming_code_generator import StreamingCodeGenerator
+from src.lexer.lexer import Lexer
+from src.parser.iterative_parser import IterativeParser
+
+
+def timed(generator, program):
+    # Seconds to generate, or None if the tree is too deep to recurse
+    start = time.perf_counter()
+    try:
+        generator.generate(program, io.StringIO())
+    except RecursionError:
+        return None
+    return time.perf_counter() - start
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Explicit-stack codegen")
+    arg_parser.add_argument(
+        "--terms", type=int, nargs="+", default=[500, 50_000, 200_000, 800_000]
+    )
+    arg_parser.add_argument("--classes", type=int, default=1000)
+    args = arg_parser.parse_args()
+
+    inputs = [(f"{args.classes} classes", generate_program(args.classes))]
+    for terms in args.terms:
+        inputs.append((f"{terms} terms", "x = " + " + ".join(["a"] * terms) + ";"))
+
+    print(f"{'input':>15} {'recursive (s)':>14} {'stack (s)':>10} {'us/token':>9}")
+    for name, source in inputs:
+        tokens = Lexer(source).tokenize_buffer()
+        program = IterativeParser(tokens).parse_program()
+        recursive = timed(StreamingCodeGenerator(), program)
+        stack = timed(StackCodeGenerator(), program)
+        recursive_text = "overflow" if recursive is None else f"{recursive:.3f}"
+        per_token = stack / len(tokens) * 1_000_000
+        print(f"{name:>15} {recursive_text:>14} {stack:>10.3f} {per_token:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
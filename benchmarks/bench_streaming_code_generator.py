@@ -0,0 +1,63 @@
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.program_generator import generate_program
+from src.code_generator.code_generator import CodeGenerator
+from src.code_generator.streaming_code_generator import StreamingCodeGenerator
+from src.lexer.lexer import Lexer
+from src.parser.parser import Parser
+
+
+def write_joined(program, path: str):
+    with open(path, "w") as file:
+        file.write(CodeGenerator().visit(program))
+
+
+def write_streamed(program, path: str):
+    with open(path, "w") as file:
+        StreamingCodeGenerator().generate(program, file)
+
+
+def measure(write, program, path: str) -> tuple:
+    # (seconds, peak bytes) of writing the program's JavaScript to path
+    start = time.perf_counter()
+    write(program, path)
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    write(program, path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Streaming JS output")
+    arg_parser.add_argument("--classes", type=int, nargs="+", default=[100, 1000, 3000])
+    args = arg_parser.parse_args()
+
+    print(
+        f"{'classes':>8} {'JS (MB)':>8} {'generator':>10} {'time (s)':>9} "
+        f"{'peak (MB)':>10}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "out.js")
+        for class_count in args.classes:
+            tokens = Lexer(generate_program(class_count)).tokenize_buffer()
+            program = Parser(tokens).parse_program()
+            for name, write in [
+                ("joined", write_joined),
+                ("streaming", write_streamed),
+            ]:
+                seconds, peak = measure(write, program, path)
+                size = os.path.getsize(path) / 1_000_000
+                print(
+                    f"{class_count:>8} {size:>8.2f} {name:>10} {seconds:>9.3f} "
+                    f"{peak / 1_000_000:>10.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import argparse
+import time
+import tracemalloc
+
+from benchmarks.program_generator import generate_program
+from src.lexer.lexer import Lexer
+from src.parser.parser import Parser
+
+
+def measure(source: str, build) -> tuple:
+    # Memory is measured in a separate run, tracemalloc slows allocation down
+    tracemalloc.start()
+    tokens = build(Lexer(source))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tokens
+
+    start = time.perf_counter()
+    tokens = build(Lexer(source))
+    lex_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    Parser(tokens).parse_program()
+    parse_time = time.perf_counter() - start
+    return len(tokens), peak, lex_time, parse_time
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description="Token list vs. TokenBuffer memory and throughput benchmark"
+    )
+    arg_parser.add_argument("--classes", type=int, nargs="+", default=[100, 1000, 3000])
+    args = arg_parser.parse_args()
+
+    forms = [
+        ("list[Token]", lambda lexer: lexer.tokenize()),
+        ("TokenBuffer", lambda lexer: lexer.tokenize_buffer()),
+    ]
+    print(
+        f"{'tokens':>10} {'form':>12} {'bytes/token':>12} "
+        f"{'lex (s)':>8} {'parse (s)':>10}"
+    )
+    for class_count in args.classes:
+        source = generate_program(class_count)
+        for name, build in forms:
+            token_count, peak, lex_time, parse_time = measure(source, build)
+            print(
+                f"{token_count:>10} {name:>12} {peak / token_count:>12.1f} "
+                f"{lex_time:>8.3f} {parse_time:>10.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
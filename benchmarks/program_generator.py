@@ -0,0 +1,67 @@
+"""
+GENERATES LARGE (BUT VALID) P++ PROGRAMS FOR THE BENCHMARKS.
+
+THE SHAPE IS MODELED ON test_files/fizzbuzz.pp SO THE TOKEN MIX IS REALISTIC.
+"""
+
+METHOD_TEMPLATE = """    def int compute{index}(int i, int j) {{
+        int x = i / {divisor};
+        int floor_result = 0;
+        while (x >= 1) {{
+            x = x - 1;
+            floor_result = floor_result + 1;
+        }}
+        int mod_result = i - (floor_result * {divisor});
+        if (mod_result == 0) {{
+            return this.compute{index}(j, i + {index});
+        }} else {{
+            mod_result = (mod_result + j) * (x - {index}) / 2;
+        }}
+        return mod_result;
+    }}
+"""
+
+
+def generate_class(class_index: int, method_count: int) -> str:
+    lines = []
+    if class_index > 0:
+        lines.append(f"class Class{class_index} extends Class{class_index - 1} {{")
+    else:
+        lines.append(f"class Class{class_index} {{")
+    lines.append("    int count;")
+    lines.append("    bool ready;")
+    if class_index > 0:
+        lines.append("    init(int start) { super(start); count = start; }")
+    else:
+        lines.append("    init(int start) { count = start; }")
+    for method_index in range(method_count):
+        lines.append(
+            METHOD_TEMPLATE.format(index=method_index, divisor=method_index % 7 + 2)
+        )
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def generate_program(class_count: int, method_count: int = 5) -> str:
+    classes = [generate_class(index, method_count) for index in range(class_count)]
+    statements = []
+    for index in range(class_count):
+        statements.append(f"Class{index} object{index} = new Class{index}({index});")
+        statements.append(f"println(object{index}.compute0({index}, {index} + 1));")
+    return "\n\n".join(classes) + "\n\n" + "\n".join(statements) + "\n"
+
+
+EXPRESSION_TEMPLATES = [
+    "x{index} = ((a + {index}) * b - c / 2) <= d == true;",
+    "y{index} = a * b + c * d - e / f + {index} * (g - h);",
+    "println(obj.method(a + 1, b * {index}) >= c != false);",
+    "z{index} = (((((a)))) + ((b)) * (c + (d - (e * {index}))));",
+]
+
+
+def generate_expressions(statement_count: int) -> str:
+    statements = []
+    for index in range(statement_count):
+        template = EXPRESSION_TEMPLATES[index % len(EXPRESSION_TEMPLATES)]
+        statements.append(template.format(index=index))
+    return "\n".join(statements) + "\n"
@@ -0,0 +1,220 @@
+from src.code_generator.code_generator import CodeGeneratorException
+from src.parser.ast_nodes import *
+from src.parser.ast_serialization import NODE_CODES
+from src.parser.flat_ast import NO_NODE, FlatAst
+
+# Type codes of the node classes in a FlatAst
+INTEGER = NODE_CODES[IntegerNode][0]
+IDENTIFIER = NODE_CODES[IdentifierNode][0]
+BINARY_OP = NODE_CODES[BinaryOpNode][0]
+BOOLEAN = NODE_CODES[BooleanNode][0]
+PRINT = NODE_CODES[PrintNode][0]
+THIS = NODE_CODES[ThisNode][0]
+NEW = NODE_CODES[NewNode][0]
+CALL = NODE_CODES[CallNode][0]
+EXPRESSION_STATEMENT = NODE_CODES[ExpressionStatement][0]
+VAR_DEC = NODE_CODES[VarDecStatement][0]
+ASSIGNMENT = NODE_CODES[AssignmentStatement][0]
+WHILE = NODE_CODES[WhileStatement][0]
+BREAK = NODE_CODES[BreakStatement][0]
+RETURN = NODE_CODES[ReturnStatement][0]
+IF = NODE_CODES[IfStatement][0]
+BLOCK = NODE_CODES[BlockStatement][0]
+METHOD_DEF = NODE_CODES[MethodDef][0]
+CONSTRUCTOR = NODE_CODES[Constructor][0]
+CLASS_DEF = NODE_CODES[ClassDef][0]
+PROGRAM = NODE_CODES[ProgramNode][0]
+
+
+class FlatCodeGenerator:
+    # Generates the same JavaScript as CodeGenerator.visit, straight from a
+    # FlatAst. Nodes are visited from the last index to the first, so every
+    # child is done before its parent and no recursion is needed. A child's
+    # code is dropped as soon as its parent has used it.
+    def __init__(self):
+        # Emit method of each type code
+        self.emitters = [None] * len(NODE_CODES)
+        for code, emitter in [
+            (INTEGER, self.emit_integer),
+            (BOOLEAN, self.emit_boolean),
+            (IDENTIFIER, self.emit_identifier),
+            (BINARY_OP, self.emit_binary_op),
+            (PRINT, self.emit_print),
+            (THIS, self.emit_this),
+            (NEW, self.emit_new),
+            (CALL, self.emit_call),
+            (EXPRESSION_STATEMENT, self.emit_expression_statement),
+            (VAR_DEC, self.emit_var_dec),
+            (ASSIGNMENT, self.emit_assignment),
+            (WHILE, self.emit_while),
+            (BREAK, self.emit_break),
+            (RETURN, self.emit_return),
+            (IF, self.emit_if),
+            (BLOCK, self.emit_block),
+            (METHOD_DEF, self.emit_method_def),
+            (CONSTRUCTOR, self.emit_constructor),
+            (CLASS_DEF, self.emit_class_def),
+            (PROGRAM, self.emit_program),
+        ]:
+            self.emitters[code] = emitter
+        self.reset()
+
+    def reset(self):
+        self.code: list = []
+        self.operands: list = []
+        self.payloads: list = []
+        self.children = None
+        self.list_starts = None
+        self.list_lengths = None
+
+    def generate(self, flat: FlatAst) -> str:
+        if not len(flat):
+            raise CodeGeneratorException()
+        # Plain lists index faster than arrays
+        self.operands = flat.operands.tolist()
+        self.payloads = flat.payloads
+        self.children = flat.children.tolist()
+        self.list_starts = flat.list_starts.tolist()
+        self.list_lengths = flat.list_lengths.tolist()
+        self.code = [None] * len(flat)
+        code = self.code
+        emitters = self.emitters
+        nodes = zip(
+            range(len(flat) - 1, -1, -1),
+            reversed(flat.kinds.tolist()),
+            reversed(flat.operand_starts.tolist()),
+        )
+        try:
+            # Each emitter reads its node's operands from its first one on
+            for index, kind, start in nodes:
+                code[index] = emitters[kind](start)
+            return code[0]
+        finally:
+            self.reset()
+
+    # Code of a child node, or of every node in a child list
+    def take(self, operand: int) -> str:
+        code = self.code
+        taken = code[operand]
+        code[operand] = None
+        return taken
+
+    def take_list(self, operand: int) -> list:
+        if operand == NO_NODE:
+            return []
+        code = self.code
+        start = self.list_starts[operand]
+        children = self.children[start : start + self.list_lengths[operand]]
+        taken = [code[child] for child in children]
+        for child in children:
+            code[child] = None
+        return taken
+
+    def emit_integer(self, start: int) -> str:
+        return str(self.payloads[self.operands[start]])
+
+    def emit_boolean(self, start: int) -> str:
+        return str(self.payloads[self.operands[start]]).lower()
+
+    def emit_identifier(self, start: int) -> str:
+        return self.payloads[self.operands[start]]
+
+    def emit_binary_op(self, start: int) -> str:
+        operands = self.operands
+        op = self.payloads[operands[start]]
+        left = self.take(operands[start + 1])
+        right = self.take(operands[start + 2])
+        op = "===" if op == "==" else op
+        return f"{left} {op} {right}"
+
+    def emit_print(self, start: int) -> str:
+        return f"console.log({self.take(self.operands[start])})"
+
+    def emit_this(self, start: int) -> str:
+        return "this"
+
+    def emit_new(self, start: int) -> str:
+        operands = self.operands
+        arguments = ", ".join(self.take_list(operands[start + 1]))
+        return f"new {self.payloads[operands[start]]}({arguments})"
+
+    def emit_call(self, start: int) -> str:
+        operands = self.operands
+        obj_name = self.take(operands[start])
+        arguments = ", ".join(self.take_list(operands[start + 2]))
+        return f"{obj_name}.{self.payloads[operands[start + 1]]}({arguments})"
+
+    def emit_expression_statement(self, start: int) -> str:
+        return f"{self.take(self.operands[start])};"
+
+    def emit_var_dec(self, start: int) -> str:
+        operands = self.operands
+        return f"let {self.payloads[operands[start + 1]]} = {self.take(operands[start + 2])};"
+
+    def emit_assignment(self, start: int) -> str:
+        operands = self.operands
+        return f"{self.payloads[operands[start]]} = {self.take(operands[start + 1])};"
+
+    def emit_while(self, start: int) -> str:
+        operands = self.operands
+        exp = self.take(operands[start])
+        stmt = self.take(operands[start + 1])
+        return f"while ({exp}) {stmt}"
+
+    def emit_break(self, start: int) -> str:
+        return "break;"
+
+    def emit_return(self, start: int) -> str:
+        operands = self.operands
+        if operands[start] != NO_NODE:
+            return f"return {self.take(operands[start])};"
+        return "return;"
+
+    def emit_if(self, start: int) -> str:
+        operands = self.operands
+        exp = self.take(operands[start])
+        then_stmt = self.take(operands[start + 1])
+        if operands[start + 2] != NO_NODE:
+            else_stmt = self.take(operands[start + 2])
+            return f"if ({exp}) {then_stmt} else {else_stmt}"
+        return f"if ({exp}) {then_stmt}"
+
+    def emit_block(self, start: int) -> str:
+        stmts = " ".join(self.take_list(self.operands[start]))
+        return f"{{ {stmts} }}"
+
+    def emit_method_def(self, start: int) -> str:
+        operands = self.operands
+        params = ", ".join(param[1] for param in self.payloads[operands[start + 2]])
+        stmts = " ".join(self.take_list(operands[start + 3]))
+        return f"{self.payloads[operands[start + 1]]}({params}) {{ {stmts} }}"
+
+    def emit_constructor(self, start: int) -> str:
+        operands = self.operands
+        params = ", ".join(param[1] for param in self.payloads[operands[start]])
+        stmts = " ".join(self.take_list(operands[start + 2]))
+        if operands[start + 1] != NO_NODE:
+            super_args = ", ".join(self.take_list(operands[start + 1]))
+            return f"constructor({params}) {{ super({super_args}); {stmts} }}"
+        return f"constructor({params}) {{ {stmts} }}"
+
+    def emit_class_def(self, start: int) -> str:
+        operands = self.operands
+        class_name = self.payloads[operands[start]]
+        extend_class_name = self.payloads[operands[start + 1]]
+        instance_vars = "; ".join(
+            instance_var[1] for instance_var in self.payloads[operands[start + 2]]
+        )
+        if instance_vars:
+            instance_vars += ";"
+        constructor = self.take(operands[start + 3])
+        methods = " ".join(self.take_list(operands[start + 4]))
+        if extend_class_name:
+            return f"class {class_name} extends {extend_class_name} {{ {instance_vars} {constructor} {methods} }}"
+        return f"class {class_name} {{{instance_vars} {constructor} {methods} }}"
+
+    def emit_program(self, start: int) -> str:
+        operands = self.operands
+        classes = " ".join(self.take_list(operands[start]))
+        statements = " ".join(self.take_list(operands[start + 1]))
+        return f"{classes}{statements}"
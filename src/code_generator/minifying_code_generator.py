@@ -0,0 +1,217 @@
+import itertools
+import string
+from typing import Iterator, TextIO
+
+from src.code_generator.streaming_code_generator import StreamingCodeGenerator
+from src.parser.ast_nodes import *
+from src.parser.node_visitor import NodeVisitor
+
+# Short names that are still keywords or globals in JavaScript
+RESERVED_NAMES = {"do", "if", "in", "for", "let", "new", "try", "var", "NaN"}
+
+
+# a, b, ..., z, aa, ab, ... skipping reserved names and the names to avoid
+def short_names(avoid: set) -> Iterator[str]:
+    for length in itertools.count(1):
+        for letters in itertools.product(string.ascii_lowercase, repeat=length):
+            name = "".join(letters)
+            if name not in avoid and name not in RESERVED_NAMES:
+                yield name
+
+
+class NameCollector(NodeVisitor):
+    # Every variable, class and method name used in a subtree
+    def __init__(self):
+        self.names: set = set()
+        self.methods: set = set()  # Defined or called
+        self.defined_methods: set = set()
+        self.public_methods: set = set()  # Called on something but 'this'
+        self.declared: list = []  # Variables of each 'let', in order
+
+    def visit_IdentifierNode(self, node: IdentifierNode):
+        self.names.add(node.value)
+
+    def visit_NewNode(self, node: NewNode):
+        self.names.add(node.class_name)
+        self.generic_visit(node)
+
+    def visit_CallNode(self, node: CallNode):
+        self.methods.add(node.method_name)
+        if not isinstance(node.obj_node, ThisNode):
+            self.public_methods.add(node.method_name)
+        self.generic_visit(node)
+
+    def visit_VarDecStatement(self, node: VarDecStatement):
+        self.names.add(node.var)
+        self.declared.append(node.var)
+        self.generic_visit(node)
+
+    def visit_AssignmentStatement(self, node: AssignmentStatement):
+        self.names.add(node.var)
+        self.generic_visit(node)
+
+    def visit_MethodDef(self, node: MethodDef):
+        self.methods.add(node.method_name)
+        self.defined_methods.add(node.method_name)
+        self.names.update(parameter[1] for parameter in node.parameters)
+        self.generic_visit(node)
+
+    def visit_Constructor(self, node: Constructor):
+        self.names.update(parameter[1] for parameter in node.parameters)
+        self.generic_visit(node)
+
+
+# Names declared by the statements of one block, not by nested blocks
+def declared_names(statements: list) -> set:
+    return {
+        statement.var
+        for statement in statements
+        if isinstance(statement, VarDecStatement)
+    }
+
+
+class MinifyingCodeGenerator(StreamingCodeGenerator):
+    # Streams the smallest JavaScript for a program: no spaces or line breaks
+    # that are not needed, and the parameters and local variables of each
+    # method and constructor renamed to a, b, c, ... Names are resolved with
+    # JavaScript's block scoping, an identifier is only renamed where it
+    # refers to a parameter or a 'let' of an enclosing block. Short names
+    # never clash with another name used in the same method. Top level
+    # variables, fields, classes and methods keep their names. P++ has no
+    # private methods, with mangle_private a method that is only ever called
+    # on 'this' counts as one: it is renamed to _a, _b, ... in every class
+    # and at every call. P++ names can't start with '_', so these never
+    # clash with another name.
+    def __init__(self, mangle_private: bool = False):
+        super().__init__()
+        self.mangle_private = mangle_private
+        self.local_names: dict = {}  # Short name of each local of the method
+        self.scopes: list = []  # Names declared by each enclosing block
+        self.method_names: dict = {}  # Short name of each private method
+
+    def generate(self, node: Node, sink: TextIO):
+        self.local_names = {}
+        self.scopes = []
+        self.method_names = {}
+        if self.mangle_private:
+            collector = NameCollector()
+            collector.visit(node)
+            private = sorted(collector.defined_methods - collector.public_methods)
+            names = short_names(set())
+            self.method_names = {name: "_" + next(names) for name in private}
+        super().generate(node, sink)
+
+    def local(self, name: str) -> str:
+        for scope in reversed(self.scopes):
+            if name in scope:
+                return self.local_names.get(name, name)
+        return name
+
+    def method(self, name: str) -> str:
+        return self.method_names.get(name, name)
+
+    # Renames the locals of a method or constructor, then writes its body
+    def write_function(self, node, super_args=None):
+        collector = NameCollector()
+        collector.visit(node)
+        names = short_names(collector.names)
+        parameters = [parameter[1] for parameter in node.parameters]
+        self.local_names = {}
+        for name in parameters + collector.declared:
+            if name not in self.local_names:
+                self.local_names[name] = next(names)
+        self.scopes = [set(parameters) | declared_names(node.statements)]
+        try:
+            self.write("(")
+            self.write(",".join(self.local(name) for name in parameters))
+            self.write("){")
+            if super_args is not None:
+                self.write("super(")
+                self.visit_list(super_args, ",")
+                self.write(");")
+            for statement in node.statements:
+                self.visit(statement)
+            self.write("}")
+        finally:
+            self.local_names = {}
+            self.scopes = []
+
+    def visit_IdentifierNode(self, node: IdentifierNode):
+        self.write(self.local(node.value))
+
+    def visit_BinaryOpNode(self, node: BinaryOpNode):
+        self.visit(node.left_child)
+        self.write("===" if node.op == "==" else node.op)
+        self.visit(node.right_child)
+
+    def visit_NewNode(self, node: NewNode):
+        self.write(f"new {node.class_name}(")
+        self.visit_list(node.arguments, ",")
+        self.write(")")
+
+    def visit_CallNode(self, node: CallNode):
+        self.visit(node.obj_node)
+        self.write(f".{self.method(node.method_name)}(")
+        self.visit_list(node.arguments, ",")
+        self.write(")")
+
+    def visit_VarDecStatement(self, node: VarDecStatement):
+        self.write(f"let {self.local(node.var)}=")
+        self.visit(node.val)
+        self.write(";")
+
+    def visit_AssignmentStatement(self, node: AssignmentStatement):
+        self.write(f"{self.local(node.var)}=")
+        self.visit(node.exp)
+        self.write(";")
+
+    def visit_WhileStatement(self, node: WhileStatement):
+        self.write("while(")
+        self.visit(node.exp)
+        self.write(")")
+        self.visit(node.stmt)
+
+    def visit_IfStatement(self, node: IfStatement):
+        self.write("if(")
+        self.visit(node.exp)
+        self.write(")")
+        self.visit(node.then_stmt)
+        if node.else_stmt is not None:
+            # A space keeps 'else' apart from a following name or keyword
+            if isinstance(node.else_stmt, BlockStatement):
+                self.write("else")
+            else:
+                self.write("else ")
+            self.visit(node.else_stmt)
+
+    def visit_BlockStatement(self, node: BlockStatement):
+        self.scopes.append(declared_names(node.stmts))
+        self.write("{")
+        for statement in node.stmts:
+            self.visit(statement)
+        self.write("}")
+        self.scopes.pop()
+
+    def visit_MethodDef(self, node: MethodDef):
+        self.write(self.method(node.method_name))
+        self.write_function(node)
+
+    def visit_Constructor(self, node: Constructor):
+        self.write("constructor")
+        self.write_function(node, node.super_args)
+
+    def visit_ClassDef(self, node: ClassDef):
+        if node.extend_class_name:
+            self.write(f"class {node.class_name} extends {node.extend_class_name}{{")
+        else:
+            self.write(f"class {node.class_name}{{")
+        for instance_var in node.class_instance_vars:
+            self.write(f"{instance_var[1]};")
+        self.visit(node.constructor)
+        for method in node.methods:
+            self.visit(method)
+        self.write("}")
+
+    def visit_ProgramNode(self, node: ProgramNode):
+        for item in [*node.class_defs, *node.statements]:
+            self.visit(item)
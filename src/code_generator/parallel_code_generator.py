@@ -0,0 +1,119 @@
+import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, TextIO
+
+from src.code_generator.pretty_code_generator import PrettyCodeGenerator
+from src.code_generator.stack_code_generator import (PrettyStackCodeGenerator,
+                                                     StackCodeGenerator)
+from src.code_generator.streaming_code_generator import StreamingCodeGenerator
+from src.parser.ast_nodes import ProgramNode
+from src.parser.ast_serialization import deserialize_nodes, serialize_nodes
+from src.parser.parallel_parser import BATCHES_PER_WORKER
+
+# Fewer classes than this are not worth starting worker processes for
+MIN_PARALLEL_CLASSES = 64
+
+# How each generator lays out a program: what goes between two classes and
+# what goes between the last class and the first statement
+PROGRAM_LAYOUTS: dict = {
+    StreamingCodeGenerator: (" ", ""),
+    StackCodeGenerator: (" ", ""),
+    PrettyCodeGenerator: ("\n", "\n"),
+    PrettyStackCodeGenerator: ("\n", "\n"),
+}
+
+# Classes of the program being generated, set before forking the workers so
+# they inherit the tree instead of receiving a copy of it
+inherited_classes: list = []
+
+
+def generate_classes(class_defs: list, generator_class: type) -> list:
+    generator = generator_class()
+    codes = []
+    for class_def in class_defs:
+        sink = io.StringIO()
+        generator.generate(class_def, sink)
+        codes.append(sink.getvalue())
+    return codes
+
+
+# Runs in a forked worker process. Returns the code of each inherited class
+# in the range, in order.
+def generate_range(start: int, end: int, generator_class: type) -> list:
+    return generate_classes(inherited_classes[start:end], generator_class)
+
+
+# Runs in a spawned worker process, which has no copy of the tree. Returns
+# the code of each class of a serialized batch, in order.
+def generate_chunk(data: bytes, generator_class: type) -> list:
+    return generate_classes(deserialize_nodes(data), generator_class)
+
+
+# (start, end) of about batch_count runs of consecutive items
+def batch_ranges(count: int, batch_count: int) -> list:
+    size = max(1, -(-count // batch_count))
+    return [(start, min(start + size, count)) for start in range(0, count, size)]
+
+
+# Writes the same JavaScript as generator_class().generate(program, sink).
+# Batches of classes are generated by worker processes and their code is
+# written in source order as the batches come back, while the top-level
+# statements are generated here. Where processes can be forked the workers
+# already have the tree and only get the range of classes to generate.
+# Elsewhere each batch is sent in the tuple encoding of ast_serialization.
+# Falls back to generating everything here for small programs, for trees
+# too deep to encode and for generators without a known layout.
+def generate_parallel(
+    program: ProgramNode,
+    sink: TextIO,
+    workers: int,
+    generator_class: type = PrettyCodeGenerator,
+    min_classes: int = MIN_PARALLEL_CLASSES,
+    fork: bool = True,
+):
+    global inherited_classes
+    class_defs = program.class_defs
+    layout = PROGRAM_LAYOUTS.get(generator_class)
+    if workers <= 1 or not class_defs or len(class_defs) < min_classes or not layout:
+        generator_class().generate(program, sink)
+        return
+    ranges = batch_ranges(len(class_defs), workers * BATCHES_PER_WORKER)
+    # Serialized batches, None when the workers are forked
+    batches: Optional[list] = None
+    if fork and "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+    else:
+        context = None
+        try:
+            batches = [serialize_nodes(class_defs[start:end]) for start, end in ranges]
+        except (ValueError, RecursionError):
+            # Too deeply nested for the encoding
+            generator_class().generate(program, sink)
+            return
+
+    class_separator, statements_separator = layout
+    statements = io.StringIO()
+    inherited_classes = class_defs
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            generator_classes = [generator_class] * len(ranges)
+            if batches is None:
+                starts = [start for start, _ in ranges]
+                ends = [end for _, end in ranges]
+                results = pool.map(generate_range, starts, ends, generator_classes)
+            else:
+                results = pool.map(generate_chunk, batches, generator_classes)
+            generator_class().generate(ProgramNode([], program.statements), statements)
+            first = True
+            for codes in results:
+                for code in codes:
+                    if not first:
+                        sink.write(class_separator)
+                    first = False
+                    sink.write(code)
+    finally:
+        inherited_classes = []
+    if program.statements:
+        sink.write(statements_separator)
+        sink.write(statements.getvalue())
@@ -0,0 +1,102 @@
+from typing import TextIO
+
+from src.code_generator.streaming_code_generator import StreamingCodeGenerator
+from src.parser.ast_nodes import *
+
+INDENT = "    "
+
+
+class PrettyCodeGenerator(StreamingCodeGenerator):
+    # Streams indented JavaScript with one statement or member per line, laid
+    # out like jsbeautifier lays out the one-line output of CodeGenerator, so
+    # there is no second pass over the generated code. Expressions are
+    # written as StreamingCodeGenerator writes them. A statement is written
+    # from the current position, it starts a new line itself only inside a
+    # block. self.indent is the indentation of the line being written.
+    def __init__(self):
+        super().__init__()
+        self.indent = ""
+
+    def generate(self, node: Node, sink: TextIO):
+        self.indent = ""
+        super().generate(node, sink)
+
+    def new_line(self):
+        self.write("\n" + self.indent)
+
+    # Writes a '{' ... '}' body, with each statement on its own line one
+    # level deeper. A constructor's super() call comes first.
+    def write_body(self, statements: list, super_args=None):
+        if not statements and super_args is None:
+            self.write("{}")
+            return
+        self.write("{")
+        outer = self.indent
+        self.indent += INDENT
+        if super_args is not None:
+            self.new_line()
+            self.write("super(")
+            self.visit_list(super_args, ", ")
+            self.write(");")
+        for statement in statements:
+            self.new_line()
+            self.visit(statement)
+        self.indent = outer
+        self.new_line()
+        self.write("}")
+
+    def visit_IfStatement(self, node: IfStatement):
+        self.write("if (")
+        self.visit(node.exp)
+        self.write(") ")
+        self.visit(node.then_stmt)
+        if node.else_stmt is not None:
+            # 'else' goes after a '}', or on a line of its own
+            if isinstance(node.then_stmt, BlockStatement):
+                self.write(" ")
+            else:
+                self.new_line()
+            self.write("else ")
+            self.visit(node.else_stmt)
+
+    def visit_BlockStatement(self, node: BlockStatement):
+        self.write_body(node.stmts)
+
+    def visit_MethodDef(self, node: MethodDef):
+        self.write(f"{node.method_name}(")
+        self.write_names(node.parameters, ", ")
+        self.write(") ")
+        self.write_body(node.statements)
+
+    def visit_Constructor(self, node: Constructor):
+        self.write("constructor(")
+        self.write_names(node.parameters, ", ")
+        self.write(") ")
+        self.write_body(node.statements, node.super_args)
+
+    def visit_ClassDef(self, node: ClassDef):
+        if node.extend_class_name:
+            self.write(f"class {node.class_name} extends {node.extend_class_name} {{")
+        else:
+            self.write(f"class {node.class_name} {{")
+        outer = self.indent
+        self.indent += INDENT
+        for instance_var in node.class_instance_vars:
+            self.new_line()
+            self.write(f"{instance_var[1]};")
+        self.new_line()
+        self.visit(node.constructor)
+        for method in node.methods:
+            self.new_line()
+            self.visit(method)
+        self.indent = outer
+        self.new_line()
+        self.write("}")
+
+    def visit_ProgramNode(self, node: ProgramNode):
+        first = True
+        for item in [*node.class_defs, *node.statements]:
+            if not first:
+                self.new_line()
+            first = False
+            self.visit(item)
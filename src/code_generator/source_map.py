@@ -0,0 +1,220 @@
+import io
+import json
+from bisect import bisect_right
+from typing import Callable, Optional, TextIO
+
+from src.code_generator.minifying_code_generator import MinifyingCodeGenerator
+from src.code_generator.pretty_code_generator import PrettyCodeGenerator
+from src.code_generator.stack_code_generator import (PrettyStackCodeGenerator,
+                                                     StackCodeGenerator)
+from src.code_generator.streaming_code_generator import StreamingCodeGenerator
+from src.lexer.line_index import LineIndex
+from src.parser.ast_nodes import *
+from src.parser.node_visitor import NodeVisitor
+
+BASE64_DIGITS = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+
+# Characters buffered before marks are resolved and the code passed on
+FLUSH_SIZE = 1 << 16
+
+# Node classes the parser records offsets of
+LOCATED_CLASSES = (StatementNode, ClassDef, Constructor, MethodDef, CallNode, NewNode)
+
+
+# Base64 VLQ of a signed number: sign in the lowest bit, then 5 bits per
+# digit, lowest first, with bit 6 set on every digit but the last
+def encode_vlq(value: int) -> str:
+    value = (-value << 1) | 1 if value < 0 else value << 1
+    digits = ""
+    while True:
+        digit = value & 31
+        value >>= 5
+        if value:
+            digits += BASE64_DIGITS[digit | 32]
+        else:
+            return digits + BASE64_DIGITS[digit]
+
+
+# Most fields of a mapping are small steps from the previous one
+SMALL_VLQS = {value: encode_vlq(value) for value in range(-1024, 1024)}
+
+
+# Length of text in the UTF-16 code units source map columns count:
+# characters outside the Basic Multilingual Plane take two
+def utf16_length(text: str) -> int:
+    return len(text.encode("utf-16-le")) // 2
+
+
+class PositionSink:
+    # Text sink that knows the 0-based line and column of marked points of
+    # the output. Writes go to a StringIO, whose tell() gives the position
+    # in it without any Python code running per write. Marks are turned
+    # into lines and columns when the buffer is passed on to the real sink,
+    # by counting the newlines between them. Identifiers need not be ASCII,
+    # so columns are counted in UTF-16 units, which only costs anything when
+    # the buffer holds other characters.
+    def __init__(self, sink: TextIO, source_map: "SourceMap"):
+        self.sink = sink
+        self.source_map = source_map
+        self.buffer = io.StringIO()
+        self.write = self.buffer.write
+        self.marks: list = []  # (position in the buffer, source offset)
+        self.line = 0  # Line the buffer starts on
+        self.column = 0  # Column the buffer starts at
+
+    # Maps the next character written to the source offset
+    def mark(self, offset: int):
+        position = self.buffer.tell()
+        self.marks.append((position, offset))
+        if position > FLUSH_SIZE:
+            self.flush()
+
+    def flush(self):
+        text = self.buffer.getvalue()
+        is_ascii = text.isascii()
+        add = self.source_map.add
+        line = self.line
+        column = self.column
+        previous = 0
+        for position, offset in self.marks + [(len(text), None)]:
+            newlines = text.count("\n", previous, position)
+            if newlines:
+                line += newlines
+                previous = text.rfind("\n", previous, position) + 1
+                column = 0
+            if is_ascii:
+                column += position - previous
+            else:
+                column += utf16_length(text[previous:position])
+            if offset is not None:
+                add(line, column, offset)
+            previous = position
+        self.line = line
+        self.column = column
+        self.marks = []
+        self.sink.write(text)
+        self.buffer.seek(0)
+        self.buffer.truncate()
+
+
+class SourceMap:
+    # Version 3 source map from one .pp source to the generated .js. offsets
+    # is filled by the parser (see Parser), mappings by a source mapping
+    # generator in output order. Source lines and columns are only worked
+    # out when the map is written.
+    def __init__(self, source: str, line_index: LineIndex, file: str = ""):
+        self.source = source
+        self.line_index = line_index
+        self.file = file
+        self.offsets: dict = {}  # Source offset of each located node
+        self.mappings: list = []  # (generated line, generated column, offset)
+
+    def add(self, line: int, column: int, offset: int):
+        self.mappings.append((line, column, offset))
+
+    # Segments of each generated line, separated by ';'. Every field is
+    # relative to the one of the previous segment, the column only within
+    # a line. Offsets are turned into source lines here, all at once.
+    # Source columns count UTF-16 units too, bytes sources are always ASCII.
+    def encode_mappings(self) -> str:
+        self.line_index.location(0)  # Builds the table of line starts
+        line_starts = list(self.line_index.line_starts)
+        text = self.line_index.text
+        is_ascii = not isinstance(text, str) or text.isascii()
+        small = SMALL_VLQS.get
+        parts = []
+        line = 0
+        previous_column = previous_source_line = previous_source_column = 0
+        for generated_line, generated_column, offset in self.mappings:
+            if generated_line != line:
+                parts.append(";" * (generated_line - line))
+                line = generated_line
+                previous_column = 0
+            elif parts:
+                parts.append(",")
+            source_line = bisect_right(line_starts, offset) - 1
+            line_start = line_starts[source_line]
+            if is_ascii:
+                source_column = offset - line_start
+            else:
+                source_column = utf16_length(text[line_start:offset])
+            step = generated_column - previous_column
+            parts.append(small(step) or encode_vlq(step))
+            parts.append("A")  # Always the first and only source
+            step = source_line - previous_source_line
+            parts.append(small(step) or encode_vlq(step))
+            step = source_column - previous_source_column
+            parts.append(small(step) or encode_vlq(step))
+            previous_column = generated_column
+            previous_source_line = source_line
+            previous_source_column = source_column
+        return "".join(parts)
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "version": 3,
+                "file": self.file,
+                "sources": [self.source],
+                "names": [],
+                "mappings": self.encode_mappings(),
+            }
+        )
+
+
+class SourceMapping(NodeVisitor):
+    # Mixed in before a code generator class. generate_mapped() writes the
+    # same code as generate() and adds a mapping to the source map wherever
+    # the code of a located node starts. Both the recursive and the stack
+    # generators visit a node just as its code is about to be written. Only
+    # the visit methods of node classes the parser locates are wrapped, in
+    # the dispatch table, so other nodes cost nothing extra.
+    source_map: Optional[SourceMap] = None
+    output: Optional[PositionSink] = None
+    # Defined by the code generator it is mixed into
+    generate: Callable[..., None]
+
+    def generate_mapped(self, node: Node, sink: TextIO, source_map: SourceMap):
+        self.source_map = source_map
+        self.output = PositionSink(sink, source_map)
+        try:
+            self.generate(node, self.output)
+            self.output.flush()
+        finally:
+            self.source_map = None
+            self.output = None
+
+    @classmethod
+    def resolve(cls, node_class: type):
+        method = super().resolve(node_class)
+        if not issubclass(node_class, LOCATED_CLASSES):
+            return method
+
+        def visit_located(self, node: Node):
+            offset = self.source_map.offsets.get(node)
+            if offset is not None:
+                self.output.mark(offset)
+            return method(self, node)
+
+        cls.dispatch[node_class] = visit_located
+        return visit_located
+
+
+class MappedStreamingCodeGenerator(SourceMapping, StreamingCodeGenerator):
+    pass
+
+
+class MappedPrettyCodeGenerator(SourceMapping, PrettyCodeGenerator):
+    pass
+
+
+class MappedMinifyingCodeGenerator(SourceMapping, MinifyingCodeGenerator):
+    pass
+
+
+class MappedStackCodeGenerator(SourceMapping, StackCodeGenerator):
+    pass
+
+
+class MappedPrettyStackCodeGenerator(SourceMapping, PrettyStackCodeGenerator):
+    pass
@@ -0,0 +1,211 @@
+import io
+from typing import TextIO, Union
+
+from src.code_generator.code_generator import CodeGeneratorException
+from src.code_generator.pretty_code_generator import INDENT
+from src.parser.ast_nodes import *
+from src.parser.node_visitor import NodeVisitor
+
+# Layout markers that can appear among the parts of a node's code
+NEW_LINE = 0  # Line break, followed by the current indentation
+DEEPER = 1  # One more level of indentation
+SHALLOWER = 2  # One level less
+
+
+# Parts of a list of nodes with a separator (a string or NEW_LINE) between
+def separated(nodes: list, separator: Union[str, int]) -> list:
+    parts: list = []
+    for node in nodes:
+        if parts:
+            parts.append(separator)
+        parts.append(node)
+    return parts
+
+
+def names(parameters: list, separator: str) -> str:
+    # Parameters and instance variables are (type, name) pairs
+    return separator.join(parameter[1] for parameter in parameters)
+
+
+class StackCodeGenerator(NodeVisitor):
+    # Writes the same JavaScript as CodeGenerator.visit (and the streaming
+    # generators) without recursion, so any depth of tree works. visit(node)
+    # does not write anything: it returns the parts of the node's code in
+    # order, strings for fixed text and nodes for the code of children.
+    # generate() keeps the parts still to be written on a list, top last,
+    # and replaces a node on top with its parts. Every node is expanded
+    # once and every string written once, so time is linear in the size of
+    # the tree whatever its shape.
+    def generate(self, node: Node, sink: TextIO):
+        write = sink.write
+        visit = self.visit
+        indent = ""
+        stack: list = [node]
+        while stack:
+            part = stack.pop()
+            kind = part.__class__
+            if kind is str:
+                write(part)
+            elif kind is int:
+                if part == NEW_LINE:
+                    write("\n" + indent)
+                elif part == DEEPER:
+                    indent += INDENT
+                else:
+                    indent = indent[: -len(INDENT)]
+            else:
+                parts = visit(part)
+                parts.reverse()
+                stack.extend(parts)
+
+    # The code of a node as one string
+    def code(self, node: Node) -> str:
+        sink = io.StringIO()
+        self.generate(node, sink)
+        return sink.getvalue()
+
+    def visit_IntegerNode(self, node: IntegerNode):
+        return [str(node.value)]
+
+    def visit_BooleanNode(self, node: BooleanNode):
+        return [str(node.value).lower()]
+
+    def visit_IdentifierNode(self, node: IdentifierNode):
+        return [node.value]
+
+    def visit_BinaryOpNode(self, node: BinaryOpNode):
+        op = " === " if node.op == "==" else f" {node.op} "
+        return [node.left_child, op, node.right_child]
+
+    def visit_PrintNode(self, node: PrintNode):
+        return ["console.log(", node.inner_expression, ")"]
+
+    def visit_ThisNode(self, node: ThisNode):
+        return ["this"]
+
+    def visit_NewNode(self, node: NewNode):
+        return [f"new {node.class_name}(", *separated(node.arguments, ", "), ")"]
+
+    def visit_CallNode(self, node: CallNode):
+        return [
+            node.obj_node,
+            f".{node.method_name}(",
+            *separated(node.arguments, ", "),
+            ")",
+        ]
+
+    def visit_ExpressionStatement(self, node: ExpressionStatement):
+        return [node.exp, ";"]
+
+    def visit_VarDecStatement(self, node: VarDecStatement):
+        return [f"let {node.var} = ", node.val, ";"]
+
+    def visit_AssignmentStatement(self, node: AssignmentStatement):
+        return [f"{node.var} = ", node.exp, ";"]
+
+    def visit_WhileStatement(self, node: WhileStatement):
+        return ["while (", node.exp, ") ", node.stmt]
+
+    def visit_BreakStatement(self, node: BreakStatement):
+        return ["break;"]
+
+    def visit_ReturnStatement(self, node: ReturnStatement):
+        if node.exp:
+            return ["return ", node.exp, ";"]
+        return ["return;"]
+
+    def visit_IfStatement(self, node: IfStatement):
+        parts = ["if (", node.exp, ") ", node.then_stmt]
+        if node.else_stmt is not None:
+            parts += [" else ", node.else_stmt]
+        return parts
+
+    def visit_BlockStatement(self, node: BlockStatement):
+        return ["{ ", *separated(node.stmts, " "), " }"]
+
+    def visit_MethodDef(self, node: MethodDef):
+        return [
+            f"{node.method_name}({names(node.parameters, ', ')}) {{ ",
+            *separated(node.statements, " "),
+            " }",
+        ]
+
+    def visit_Constructor(self, node: Constructor):
+        parts = [f"constructor({names(node.parameters, ', ')}) {{ "]
+        if node.super_args is not None:
+            parts += ["super(", *separated(node.super_args, ", "), "); "]
+        return parts + [*separated(node.statements, " "), " }"]
+
+    def visit_ClassDef(self, node: ClassDef):
+        instance_vars = names(node.class_instance_vars, "; ")
+        if instance_vars:
+            instance_vars += ";"
+        if node.extend_class_name:
+            start = f"class {node.class_name} extends {node.extend_class_name} {{ "
+        else:
+            start = f"class {node.class_name} {{"
+        return [
+            f"{start}{instance_vars} ",
+            node.constructor,
+            " ",
+            *separated(node.methods, " "),
+            " }",
+        ]
+
+    def visit_ProgramNode(self, node: ProgramNode):
+        return [*separated(node.class_defs, " "), *separated(node.statements, " ")]
+
+    def generic_visit(self, node: Node):
+        raise CodeGeneratorException()
+
+
+class PrettyStackCodeGenerator(StackCodeGenerator):
+    # Same layout as PrettyCodeGenerator, for any depth of tree
+    def body(self, statements: list, super_args=None) -> list:
+        if not statements and super_args is None:
+            return ["{}"]
+        parts: list = ["{", DEEPER]
+        if super_args is not None:
+            parts += [NEW_LINE, "super(", *separated(super_args, ", "), ");"]
+        for statement in statements:
+            parts += [NEW_LINE, statement]
+        return parts + [SHALLOWER, NEW_LINE, "}"]
+
+    def visit_IfStatement(self, node: IfStatement):
+        parts = ["if (", node.exp, ") ", node.then_stmt]
+        if node.else_stmt is not None:
+            # 'else' goes after a '}', or on a line of its own
+            if isinstance(node.then_stmt, BlockStatement):
+                parts.append(" ")
+            else:
+                parts.append(NEW_LINE)
+            parts += ["else ", node.else_stmt]
+        return parts
+
+    def visit_BlockStatement(self, node: BlockStatement):
+        return self.body(node.stmts)
+
+    def visit_MethodDef(self, node: MethodDef):
+        start = f"{node.method_name}({names(node.parameters, ', ')}) "
+        return [start, *self.body(node.statements)]
+
+    def visit_Constructor(self, node: Constructor):
+        start = f"constructor({names(node.parameters, ', ')}) "
+        return [start, *self.body(node.statements, node.super_args)]
+
+    def visit_ClassDef(self, node: ClassDef):
+        parts: list
+        if node.extend_class_name:
+            parts = [f"class {node.class_name} extends {node.extend_class_name} {{"]
+        else:
+            parts = [f"class {node.class_name} {{"]
+        parts.append(DEEPER)
+        for instance_var in node.class_instance_vars:
+            parts += [NEW_LINE, f"{instance_var[1]};"]
+        parts += [NEW_LINE, node.constructor]
+        for method in node.methods:
+            parts += [NEW_LINE, method]
+        return parts + [SHALLOWER, NEW_LINE, "}"]
+
+    def visit_ProgramNode(self, node: ProgramNode):
+        return separated([*node.class_defs, *node.statements], NEW_LINE)
@@ -0,0 +1,151 @@
+from typing import TextIO
+
+from src.code_generator.code_generator import CodeGeneratorException
+from src.parser.ast_nodes import *
+from src.parser.node_visitor import NodeVisitor
+
+
+class StreamingCodeGenerator(NodeVisitor):
+    # Writes the same JavaScript as CodeGenerator.visit, but fragment by
+    # fragment to a text sink (an open file, io.StringIO, ...) while walking
+    # the tree. No string is built for a subtree, so time and memory only
+    # grow with the size of the program, not with its nesting.
+    def __init__(self):
+        self.write = None
+
+    def generate(self, node: Node, sink: TextIO):
+        self.write = sink.write
+        try:
+            self.visit(node)
+        finally:
+            self.write = None
+
+    # Visits each node, writing the separator between two of them
+    def visit_list(self, nodes: list, separator: str):
+        first = True
+        for node in nodes:
+            if not first:
+                self.write(separator)
+            first = False
+            self.visit(node)
+
+    def write_names(self, parameters: list, separator: str):
+        # Parameters and instance variables are (type, name) pairs
+        self.write(separator.join(parameter[1] for parameter in parameters))
+
+    def visit_IntegerNode(self, node: IntegerNode):
+        self.write(str(node.value))
+
+    def visit_BooleanNode(self, node: BooleanNode):
+        self.write(str(node.value).lower())
+
+    def visit_IdentifierNode(self, node: IdentifierNode):
+        self.write(node.value)
+
+    def visit_BinaryOpNode(self, node: BinaryOpNode):
+        self.visit(node.left_child)
+        self.write(" === " if node.op == "==" else f" {node.op} ")
+        self.visit(node.right_child)
+
+    def visit_PrintNode(self, node: PrintNode):
+        self.write("console.log(")
+        self.visit(node.inner_expression)
+        self.write(")")
+
+    def visit_ThisNode(self, node: ThisNode):
+        self.write("this")
+
+    def visit_NewNode(self, node: NewNode):
+        self.write(f"new {node.class_name}(")
+        self.visit_list(node.arguments, ", ")
+        self.write(")")
+
+    def visit_CallNode(self, node: CallNode):
+        self.visit(node.obj_node)
+        self.write(f".{node.method_name}(")
+        self.visit_list(node.arguments, ", ")
+        self.write(")")
+
+    def visit_ExpressionStatement(self, node: ExpressionStatement):
+        self.visit(node.exp)
+        self.write(";")
+
+    def visit_VarDecStatement(self, node: VarDecStatement):
+        self.write(f"let {node.var} = ")
+        self.visit(node.val)
+        self.write(";")
+
+    def visit_AssignmentStatement(self, node: AssignmentStatement):
+        self.write(f"{node.var} = ")
+        self.visit(node.exp)
+        self.write(";")
+
+    def visit_WhileStatement(self, node: WhileStatement):
+        self.write("while (")
+        self.visit(node.exp)
+        self.write(") ")
+        self.visit(node.stmt)
+
+    def visit_BreakStatement(self, node: BreakStatement):
+        self.write("break;")
+
+    def visit_ReturnStatement(self, node: ReturnStatement):
+        if node.exp:
+            self.write("return ")
+            self.visit(node.exp)
+            self.write(";")
+        else:
+            self.write("return;")
+
+    def visit_IfStatement(self, node: IfStatement):
+        self.write("if (")
+        self.visit(node.exp)
+        self.write(") ")
+        self.visit(node.then_stmt)
+        if node.else_stmt is not None:
+            self.write(" else ")
+            self.visit(node.else_stmt)
+
+    def visit_BlockStatement(self, node: BlockStatement):
+        self.write("{ ")
+        self.visit_list(node.stmts, " ")
+        self.write(" }")
+
+    def visit_MethodDef(self, node: MethodDef):
+        self.write(f"{node.method_name}(")
+        self.write_names(node.parameters, ", ")
+        self.write(") { ")
+        self.visit_list(node.statements, " ")
+        self.write(" }")
+
+    def visit_Constructor(self, node: Constructor):
+        self.write("constructor(")
+        self.write_names(node.parameters, ", ")
+        self.write(") { ")
+        if node.super_args is not None:
+            self.write("super(")
+            self.visit_list(node.super_args, ", ")
+            self.write("); ")
+        self.visit_list(node.statements, " ")
+        self.write(" }")
+
+    def visit_ClassDef(self, node: ClassDef):
+        if node.extend_class_name:
+            self.write(f"class {node.class_name} extends {node.extend_class_name} {{ ")
+        else:
+            self.write(f"class {node.class_name} {{")
+        if node.class_instance_vars:
+            self.write_names(node.class_instance_vars, "; ")
+            self.write(";")
+        self.write(" ")
+        self.visit(node.constructor)
+        self.write(" ")
+        self.visit_list(node.methods, " ")
+        self.write(" }")
+
+    def visit_ProgramNode(self, node: ProgramNode):
+        self.visit_list(node.class_defs, " ")
+        self.visit_list(node.statements, " ")
+
+    def generic_visit(self, node: Node):
+        raise CodeGeneratorException()
@@ -1,47 +1,414 @@
+import argparse
+import io
+import os
 import subprocess
-import sys
-import jsbeautifier # type: ignore
+import time
+from typing import Optional, TextIO
 
-from src.code_generator.code_generator import CodeGenerator
-from src.lexer.lexer import Lexer
-from src.parser.parser import Parser
+from src.code_generator.minifying_code_generator import MinifyingCodeGenerator
+from src.code_generator.parallel_code_generator import generate_parallel
+from src.code_generator.pretty_code_generator import PrettyCodeGenerator
+from src.code_generator.source_map import (MappedMinifyingCodeGenerator,
+                                           MappedPrettyCodeGenerator,
+                                           MappedPrettyStackCodeGenerator,
+                                           MappedStackCodeGenerator,
+                                           MappedStreamingCodeGenerator,
+                                           SourceMap, SourceMapping)
+from src.code_generator.stack_code_generator import (PrettyStackCodeGenerator,
+                                                     StackCodeGenerator)
+from src.code_generator.streaming_code_generator import StreamingCodeGenerator
+from src.lexer.lexer import Lexer, TokenizerExceptions
+from src.lexer.line_index import LineIndex
+from src.lexer.mapped_source import map_source, release_behind
+from src.lexer.parallel_lexer import tokenize_parallel
+from src.lexer.token_stream import TokenStream
+from src.parser.ast_cache import AstCache
+from src.parser.ast_nodes import ProgramNode
+from src.parser.incremental_parser import IncrementalParser
+from src.parser.iterative_parser import IterativeParser
+from src.parser.parallel_parser import parse_parallel
+from src.parser.parser import (Parser, ParserException,
+                               ParserParenthesisException)
 
+# Seconds between checks of the watched file
+WATCH_INTERVAL = 0.5
 
-def compile_file(input_path: str):
-    with open(input_path, "r") as file:
-        source_code = file.read()
-    # print(f"Source Code: {source_code}")
+# Layouts of the generated JavaScript
+PRETTY = "pretty"  # Indented, one statement per line
+COMPACT = "compact"  # All on one line
+JSBEAUTIFIER = "jsbeautifier"  # One line, then reformatted by jsbeautifier
+MINIFY = "minify"  # No extra whitespace, locals renamed to short names
 
-    # Create Lexer and tokenize
+
+# Given an offsets dict, the parser fills it with where nodes start in the
+# source. Nodes parsed in worker processes would come back without theirs,
+# so then only lexing is done in parallel.
+def parse_source(
+    source_code, jobs: int = 1, iterative: bool = False, offsets: Optional[dict] = None
+) -> ProgramNode:
+    # The iterative parser handles any nesting depth, the recursive one is faster
+    parser_class = IterativeParser if iterative else Parser
+    if jobs > 1 and not iterative and offsets is None:
+        # Lex and parse class definitions in worker processes
+        return parse_parallel(source_code, jobs)
+    if jobs > 1:
+        # Lex chunks of the source in worker processes, then parse the buffer
+        tokens = tokenize_parallel(source_code, jobs)
+        parser = parser_class(tokens, LineIndex(source_code), offsets=offsets)
+        return parser.parse_program()
+
+    # Create Lexer, tokens are produced lazily as the parser asks for them
     lexer = Lexer(source_code)
-    tokens = lexer.tokenize()
+    token_iterator = release_behind(lexer.iter_tokens(), source_code)
+    try:
+        # Create Parser and parse tokens, the line index is only built for errors
+        parser = parser_class(
+            TokenStream(token_iterator), LineIndex(source_code), offsets=offsets
+        )
+        return parser.parse_program()
+    finally:
+        # Releases the lexer's hold on the source (needed to unmap it)
+        token_iterator.close()
+
+
+# Parses the source, or loads its tree from the cache if it was parsed before.
+# Cached trees have no source offsets, so the source is always parsed when
+# offsets are wanted.
+def load_or_parse(
+    source_code,
+    cache: Optional[AstCache],
+    jobs: int = 1,
+    iterative: bool = False,
+    offsets: Optional[dict] = None,
+) -> ProgramNode:
+    if cache is None or offsets is not None:
+        return parse_source(source_code, jobs, iterative, offsets)
+    key = cache.key(source_code)
+    ast = cache.load(key)
+    if ast is not None:
+        return ast
+    ast = parse_source(source_code, jobs, iterative)
+    cache.store(key, ast)
+    return ast
+
 
-    # Create Parser and parse tokens
-    parser = Parser(tokens)
-    ast = parser.parse_program()
+def compile_file(
+    input_path: str,
+    use_mmap: bool = False,
+    jobs: int = 1,
+    iterative: bool = False,
+    use_cache: bool = True,
+    cache_dir: Optional[str] = None,
+    style: str = PRETTY,
+    mangle_private: bool = False,
+    source_map: bool = False,
+):
+    cache = AstCache(cache_dir) if use_cache else None
+    mapping = None
+    if use_mmap:
+        with map_source(input_path) as mapped:
+            if source_map:
+                mapping = new_source_map(input_path, mapped)
+                # Lines must be found while the source is still mapped
+                mapping.line_index.location(0)
+            offsets = mapping.offsets if mapping else None
+            ast = load_or_parse(mapped, cache, jobs, iterative, offsets)
+    else:
+        with open(input_path, "r") as file:
+            source_code = file.read()
+        # print(f"Source Code: {source_code}")
+        if source_map:
+            mapping = new_source_map(input_path, source_code)
+        offsets = mapping.offsets if mapping else None
+        ast = load_or_parse(source_code, cache, jobs, iterative, offsets)
+    # Trees from the iterative parser are likely too deep to generate
+    # recursively, so that is not tried
+    generate_and_run(input_path, ast, style, mangle_private, iterative, jobs, mapping)
 
-    # Create Code Generator and generate JavaScript code
-    code_generator = CodeGenerator()
-    output_js_code = jsbeautifier.beautify(code_generator.visit(ast))
 
-    # Create output JS file
+# Source map of the JavaScript written next to the source file
+def new_source_map(input_path: str, source_code) -> SourceMap:
+    output_name = os.path.basename(input_path.replace(".pp", ".js"))
+    return SourceMap(
+        os.path.basename(input_path), LineIndex(source_code), file=output_name
+    )
+
+
+# Streams the JavaScript of the tree into the sink. jsbeautifier needs the
+# whole program, so for it the code is generated into memory first.
+# mangle_private also renames methods only called on 'this' when minifying.
+# deep generates without recursion (slower), for any depth of tree, except
+# when minifying. Without it, a tree too deep to generate recursively is
+# generated again with deep, replacing what was written, so the sink has to
+# be seekable (other sinks are always generated deep). With jobs > 1 the
+# classes of large programs are generated by that many worker processes,
+# except when minifying. Given a source map (with the offsets of the tree's
+# nodes), the code is generated here and its mappings are added to the map.
+def write_javascript(
+    ast: ProgramNode,
+    sink: TextIO,
+    style: str = PRETTY,
+    mangle_private: bool = False,
+    deep: bool = False,
+    jobs: int = 1,
+    source_map: Optional[SourceMap] = None,
+):
+    if deep or not sink.seekable():
+        write_generated(ast, sink, style, mangle_private, True, jobs, source_map)
+        return
+    start = sink.tell()
+    mapping_count = len(source_map.mappings) if source_map is not None else 0
+    try:
+        write_generated(ast, sink, style, mangle_private, False, jobs, source_map)
+    except RecursionError:
+        if style == MINIFY:
+            raise
+        sink.seek(start)
+        sink.truncate()
+        if source_map is not None:
+            del source_map.mappings[mapping_count:]
+        write_generated(ast, sink, style, mangle_private, True, jobs, source_map)
+
+
+def write_generated(
+    ast: ProgramNode,
+    sink: TextIO,
+    style: str,
+    mangle_private: bool,
+    deep: bool,
+    jobs: int,
+    source_map: Optional[SourceMap],
+):
+    if source_map is not None:
+        write_mapped_javascript(ast, sink, source_map, style, mangle_private, deep)
+    elif style == PRETTY:
+        pretty_class = PrettyStackCodeGenerator if deep else PrettyCodeGenerator
+        generate_parallel(ast, sink, jobs, pretty_class)
+    elif style == COMPACT:
+        compact_class = StackCodeGenerator if deep else StreamingCodeGenerator
+        generate_parallel(ast, sink, jobs, compact_class)
+    elif style == MINIFY:
+        MinifyingCodeGenerator(mangle_private).generate(ast, sink)
+    elif style == JSBEAUTIFIER:
+        # Only imported when asked for, it is slow to import
+        import jsbeautifier  # type: ignore
+
+        buffer = io.StringIO()
+        write_generated(ast, buffer, COMPACT, False, deep, jobs, None)
+        sink.write(jsbeautifier.beautify(buffer.getvalue()))
+    else:
+        raise ValueError(f"Unknown output style: {style}")
+
+
+# jsbeautifier moves the code around after it is generated, so its layout
+# can't be mapped
+def write_mapped_javascript(
+    ast: ProgramNode,
+    sink: TextIO,
+    source_map: SourceMap,
+    style: str = PRETTY,
+    mangle_private: bool = False,
+    deep: bool = False,
+):
+    generator: SourceMapping
+    if style == PRETTY:
+        if deep:
+            generator = MappedPrettyStackCodeGenerator()
+        else:
+            generator = MappedPrettyCodeGenerator()
+    elif style == COMPACT:
+        if deep:
+            generator = MappedStackCodeGenerator()
+        else:
+            generator = MappedStreamingCodeGenerator()
+    elif style == MINIFY:
+        generator = MappedMinifyingCodeGenerator(mangle_private)
+    else:
+        raise ValueError(f"No source map for the {style} output style")
+    generator.generate_mapped(ast, sink, source_map)
+
+
+def generate_and_run(
+    input_path: str,
+    ast: ProgramNode,
+    style: str = PRETTY,
+    mangle_private: bool = False,
+    deep: bool = False,
+    jobs: int = 1,
+    source_map: Optional[SourceMap] = None,
+):
+    # Generate JavaScript code into the output JS file
     output_path = input_path.replace(".pp", ".js")
     with open(output_path, "w") as file:
-        file.write(output_js_code)
+        write_javascript(ast, file, style, mangle_private, deep, jobs, source_map)
+        if source_map is not None:
+            map_name = os.path.basename(output_path) + ".map"
+            file.write(f"\n//# sourceMappingURL={map_name}\n")
     print(f"Generated: {output_path}")
+    node_command = ["node", output_path]
+    if source_map is not None:
+        with open(output_path + ".map", "w") as file:
+            file.write(source_map.to_json())
+        print(f"Generated: {output_path}.map")
+        # Error stack traces point into the .pp source
+        node_command.insert(1, "--enable-source-maps")
 
     # Run JS file with Node
     print(f"Running: {output_path}")
-    result = subprocess.run(["node", output_path], capture_output=True, text=True)
+    result = subprocess.run(node_command, capture_output=True, text=True)
     print(result.stdout)
     if result.stderr:
         print(f"Error: {result.stderr}")
 
 
+# Recompiles the file whenever it changes, with the same options as
+# compile_file. Only the classes and statements that were edited are parsed
+# again, except with source maps or the iterative parser: reused subtrees
+# would keep the offsets of an older version of the file, and the
+# incremental parser is recursive, so then every change is parsed in full.
+def watch_file(
+    input_path: str,
+    interval: float = WATCH_INTERVAL,
+    jobs: int = 1,
+    iterative: bool = False,
+    style: str = PRETTY,
+    mangle_private: bool = False,
+    source_map: bool = False,
+):
+    parser = IncrementalParser()
+    incremental = not (source_map or iterative)
+    last_modified = None
+    try:
+        while True:
+            modified = os.stat(input_path).st_mtime_ns
+            if modified != last_modified:
+                last_modified = modified
+                with open(input_path, "r") as file:
+                    source_code = file.read()
+                mapping = (
+                    new_source_map(input_path, source_code) if source_map else None
+                )
+                try:
+                    if incremental:
+                        ast = parser.parse(source_code)
+                    else:
+                        offsets = mapping.offsets if mapping else None
+                        ast = parse_source(source_code, jobs, iterative, offsets)
+                except (
+                    TokenizerExceptions,
+                    ParserException,
+                    ParserParenthesisException,
+                ) as error:
+                    print(f"Error: {error}")
+                else:
+                    if incremental:
+                        print(
+                            f"Parsed {parser.parsed_classes} classes, "
+                            f"{parser.parsed_methods} methods and "
+                            f"{parser.parsed_statements} statements again"
+                        )
+                    generate_and_run(
+                        input_path,
+                        ast,
+                        style,
+                        mangle_private,
+                        iterative,
+                        jobs,
+                        mapping,
+                    )
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+
+
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: ppp <input.pp>")
+    arg_parser = argparse.ArgumentParser(prog="ppp", description="P++ compiler")
+    arg_parser.add_argument("input_file", help="path to the .pp file to compile")
+    arg_parser.add_argument(
+        "--mmap",
+        action="store_true",
+        help="memory-map the source instead of reading it into memory",
+    )
+    arg_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="worker processes for lexing, parsing and generating large sources",
+    )
+    arg_parser.add_argument(
+        "--iterative-parser",
+        action="store_true",
+        help="parse and generate with an explicit stack, for very deep nesting",
+    )
+    arg_parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="recompile whenever the file changes, re-parsing only what changed",
+    )
+    arg_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="always lex and parse, without reading or writing the AST cache",
+    )
+    arg_parser.add_argument(
+        "--cache-dir",
+        help="directory of the AST cache (default: ~/.cache/ppp)",
+    )
+    output_style = arg_parser.add_mutually_exclusive_group()
+    arg_parser.set_defaults(style=PRETTY)
+    output_style.add_argument(
+        "--no-beautify",
+        dest="style",
+        action="store_const",
+        const=COMPACT,
+        help="write the JavaScript on one line",
+    )
+    output_style.add_argument(
+        "--jsbeautifier",
+        dest="style",
+        action="store_const",
+        const=JSBEAUTIFIER,
+        help="format the JavaScript with jsbeautifier instead of the built-in printer",
+    )
+    output_style.add_argument(
+        "--minify",
+        dest="style",
+        action="store_const",
+        const=MINIFY,
+        help="write the smallest JavaScript, with short names for local variables",
+    )
+    arg_parser.add_argument(
+        "--mangle-private",
+        action="store_true",
+        help="with --minify, also shorten names of methods only ever called on 'this'",
+    )
+    arg_parser.add_argument(
+        "--source-map",
+        action="store_true",
+        help="also write a .js.map mapping the JavaScript back to the .pp source",
+    )
+    args = arg_parser.parse_args()
+    if args.source_map and args.style == JSBEAUTIFIER:
+        arg_parser.error("--source-map can't be used with --jsbeautifier")
+    print(f"Compiling: {args.input_file}")
+    if args.watch:
+        watch_file(
+            args.input_file,
+            jobs=args.jobs,
+            iterative=args.iterative_parser,
+            style=args.style,
+            mangle_private=args.mangle_private,
+            source_map=args.source_map,
+        )
         return
-    input_file = sys.argv[1]
-    print(f"Compiling: {input_file}")
-    compile_file(input_file)
+    compile_file(
+        args.input_file,
+        use_mmap=args.mmap,
+        jobs=args.jobs,
+        iterative=args.iterative_parser,
+        use_cache=not args.no_cache,
+        cache_dir=args.cache_dir,
+        style=args.style,
+        mangle_private=args.mangle_private,
+        source_map=args.source_map,
+    )
@@ -1,91 +1,360 @@
-from typing import List
+import importlib.util
+import re
+from array import array
+from bisect import bisect_left
+from mmap import mmap
+from typing import Iterator, List, Optional, Tuple, Union, cast
 
-from src.lexer.lexer_constants import (AMBIGUOUS_OPERATORS,
+from src.lexer.lexer_constants import (AMBIGUOUS_OPERATORS, LEXER_ENGINES,
                                        MULTI_CHAR_OPERATORS, RESERVED_WORDS,
                                        SINGLE_CHAR_OPERATORS)
+from src.lexer.line_index import LineIndex
+from src.lexer.scanner import (BYTES_MASTER_PATTERN, BYTES_OPERATORS,
+                               BYTES_RESERVED_WORDS, INTEGER_GROUP,
+                               MASTER_PATTERN, OPERATOR_GROUP, OPERATORS,
+                               WORD_GROUP)
+from src.lexer.symbol_table import SymbolTable
 from src.lexer.token import Token, TokenType
+from src.lexer.token_buffer import (BYTES_OPERATOR_CODES, BYTES_RESERVED_CODES,
+                                    EOF_CODE, IDENTIFIER_CODE, INTEGER_CODE,
+                                    OPERATOR_CODES, RESERVED_CODES,
+                                    TokenBuffer)
 
 
 class TokenizerExceptions(Exception):
     pass
 
 
+# Whether the numpy engine can run. numpy is looked up without importing it,
+# the import alone costs more than lexing a small program.
+def numpy_available() -> bool:
+    return importlib.util.find_spec("numpy") is not None
+
+
 class Lexer:
-    def __init__(self, text: str):
+    # text is usually a str, but can also be bytes or a memory-mapped file
+    # (see mapped_source.py). Bytes are scanned with ASCII character classes.
+    # Identifiers are interned into `symbols`, pass one table to several lexers
+    # to share ids across a compilation
+    def __init__(
+        self,
+        text: Union[str, bytes, mmap],
+        engine: str = "regex",
+        symbols: Optional[SymbolTable] = None,
+    ):
+        if engine not in LEXER_ENGINES:
+            raise TokenizerExceptions(f"Unknown lexer engine: '{engine}'")
         self.text = text
         self.position = 0
+        self.engine = engine
+        self.symbols = symbols if symbols is not None else SymbolTable()
+        self.binary = not isinstance(text, str)
+        if self.binary and engine == "reference":
+            raise TokenizerExceptions("The reference engine only lexes str input.")
+        if engine == "numpy" and not numpy_available():
+            raise TokenizerExceptions("The numpy engine needs numpy installed.")
 
     def tokenize(self) -> List[Token]:
+        if self.engine == "reference":
+            return self.tokenize_reference()
+        if self.engine == "numpy":
+            return list(self.tokenize_buffer())
+        return list(self.iter_tokens())
+
+    # Yields tokens one at a time as the source is scanned, using the master
+    # pattern from scanner.py. Nothing past the current match is tokenized.
+    def iter_tokens(self) -> Iterator[Token]:
+        if self.engine == "reference":
+            yield from self.tokenize_reference()
+            return
+        if self.engine == "numpy":
+            yield from self.tokenize_buffer()
+            return
+
+        binary = self.binary
+        reserved_words: dict
+        operators: dict
+        if binary:
+            pattern = BYTES_MASTER_PATTERN
+            reserved_words = BYTES_RESERVED_WORDS
+            operators = BYTES_OPERATORS
+        else:
+            pattern = MASTER_PATTERN
+            reserved_words = RESERVED_WORDS
+            operators = OPERATORS
+
+        symbol_ids = self.symbols.ids
+        symbol_names = self.symbols.names
+        intern = self.symbols.intern
+
+        for match in pattern.finditer(self.text, self.position):
+            kind = match.lastgroup
+            if kind == WORD_GROUP:
+                word = match.group(kind)
+                if word in reserved_words:
+                    yield Token(*reserved_words[word], match.start(kind))
+                    continue
+                if binary:
+                    word = word.decode("ascii")
+                symbol = symbol_ids.get(word)
+                if symbol is None:
+                    symbol = intern(word)
+                yield Token(
+                    TokenType.IDENTIFIER,
+                    symbol_names[symbol],
+                    match.start(kind),
+                    symbol,
+                )
+            elif kind == OPERATOR_GROUP:
+                yield Token(*operators[match.group(kind)], match.start(kind))
+            elif kind == INTEGER_GROUP:
+                yield Token(
+                    TokenType.INTEGER, int(match.group(kind)), match.start(kind)
+                )
+            elif kind is not None:
+                self.position = match.start(kind)
+                raise self.invalid_character(self.position)
+
+        self.position = len(self.text)
+        yield Token(TokenType.EOF, None, self.position)
+
+    # Same scan as iter_tokens, but stores a type code and source offsets per
+    # token in a TokenBuffer instead of building Token objects
+    def tokenize_buffer(self) -> TokenBuffer:
+        # Non-ASCII str falls through to the regex scan, which knows Unicode
+        text = self.text
+        if self.engine == "numpy" and (not isinstance(text, str) or text.isascii()):
+            return self.tokenize_vectorized()
+
+        buffer = TokenBuffer(self.text, self.symbols)
+        add_type = buffer.types.append
+        add_start = buffer.starts.append
+        add_end = buffer.ends.append
+        pattern, reserved_codes, operator_codes = self.code_tables()
+
+        for match in pattern.finditer(self.text, self.position):
+            kind = match.lastgroup
+            if kind == WORD_GROUP:
+                add_type(reserved_codes.get(match.group(kind), IDENTIFIER_CODE))
+            elif kind == OPERATOR_GROUP:
+                add_type(operator_codes[match.group(kind)])
+            elif kind == INTEGER_GROUP:
+                add_type(INTEGER_CODE)
+            elif kind is not None:
+                self.position = match.start(kind)
+                raise self.invalid_character(self.position)
+            else:
+                break
+            start, end = match.span(kind)
+            add_start(start)
+            add_end(end)
+
+        self.position = len(self.text)
+        buffer.append(EOF_CODE, self.position, self.position)
+        return buffer
+
+    # Yields (type code, start, end) for every token from `start` on, ending
+    # with the EOF token. Used where a scan may stop early, tokenize_buffer
+    # has the same loop inlined because it always runs to the end.
+    def iter_codes(self, start: int = 0) -> Iterator[Tuple[int, int, int]]:
+        pattern, reserved_codes, operator_codes = self.code_tables()
+
+        for match in pattern.finditer(self.text, start):
+            kind = match.lastgroup
+            if kind == WORD_GROUP:
+                type_code = reserved_codes.get(match.group(kind), IDENTIFIER_CODE)
+            elif kind == OPERATOR_GROUP:
+                type_code = operator_codes[match.group(kind)]
+            elif kind == INTEGER_GROUP:
+                type_code = INTEGER_CODE
+            elif kind is not None:
+                self.position = match.start(kind)
+                raise self.invalid_character(self.position)
+            else:
+                break
+            yield (type_code, *match.span(kind))
+
+        self.position = len(self.text)
+        yield EOF_CODE, self.position, self.position
+
+    def tokenize_vectorized(self) -> TokenBuffer:
+        # Imported here so that only the numpy engine pays for numpy
+        from src.lexer.vectorized_lexer import (VectorizedLexerError,
+                                                tokenize_vectorized)
+
+        try:
+            buffer = tokenize_vectorized(self.text, self.symbols)
+        except VectorizedLexerError as error:
+            self.position = error.offset
+            raise self.invalid_character(error.offset)
+        self.position = len(self.text)
+        return buffer
+
+    def code_tables(self) -> Tuple[re.Pattern, dict, dict]:
+        if self.binary:
+            return BYTES_MASTER_PATTERN, BYTES_RESERVED_CODES, BYTES_OPERATOR_CODES
+        return MASTER_PATTERN, RESERVED_CODES, OPERATOR_CODES
+
+    # Applies an edit to the source and updates a buffer from tokenize_buffer
+    # without re-scanning the whole file. Scanning restarts after the last
+    # token that ends before the edit and stops as soon as it produces a token
+    # that already existed (shifted) after the edit, the rest is reused. On a
+    # bytes or mapped source the inserted text is encoded and the source
+    # becomes bytes, non-ASCII text then fails like it would in a full scan.
+    def relex(
+        self,
+        previous: TokenBuffer,
+        offset: int,
+        removed_length: int,
+        inserted_text: str,
+    ) -> TokenBuffer:
+        old_length = len(self.text)
+        removed_end = offset + removed_length
+        if offset < 0 or removed_length < 0 or removed_end > old_length:
+            raise TokenizerExceptions(
+                f"Edit at {offset} removing {removed_length} characters is outside "
+                f"the source ({old_length} characters)."
+            )
+        old_text = self.text
+        new_text: Union[str, bytes]
+        if isinstance(old_text, str):
+            new_text = old_text[:offset] + inserted_text + old_text[removed_end:]
+        else:
+            inserted = inserted_text.encode("utf-8")
+            new_text = old_text[:offset] + inserted + old_text[removed_end:]
+        self.text = new_text
+        delta = len(new_text) - old_length
+
+        # The first token that touches the edit could merge with new text
+        first_changed = bisect_left(previous.ends, offset)
+        restart = previous.ends[first_changed - 1] if first_changed > 0 else 0
+
+        new_types = array("B")
+        new_starts = array("q")
+        new_ends = array("q")
+        old_starts = previous.starts
+        resume = len(previous)  # Old token the stream resynchronizes at
+        try:
+            for type_code, start, end in self.iter_codes(restart):
+                old_start = start - delta
+                if old_start >= removed_end:
+                    index = bisect_left(old_starts, old_start)
+                    if (
+                        index < len(previous)
+                        and old_starts[index] == old_start
+                        and previous.types[index] == type_code
+                        and previous.ends[index] == end - delta
+                    ):
+                        resume = index
+                        break
+                new_types.append(type_code)
+                new_starts.append(start)
+                new_ends.append(end)
+        except TokenizerExceptions:
+            # Leave the lexer on the text `previous` was built from
+            self.text = old_text
+            raise
+
+        buffer = TokenBuffer(self.text, previous.symbols)
+        buffer.types = previous.types[:first_changed] + new_types
+        buffer.types.extend(previous.types[resume:])
+        buffer.starts = previous.starts[:first_changed] + new_starts
+        buffer.ends = previous.ends[:first_changed] + new_ends
+        if delta:
+            buffer.starts.extend(start + delta for start in previous.starts[resume:])
+            buffer.ends.extend(end + delta for end in previous.ends[resume:])
+        else:
+            buffer.starts.extend(previous.starts[resume:])
+            buffer.ends.extend(previous.ends[resume:])
+        return buffer
+
+    # Original character-by-character lexer, kept as the reference engine
+    def tokenize_reference(self) -> List[Token]:
+        # __init__ only lets str through to this engine
+        text = cast(str, self.text)
         tokens = []
 
-        while self.position < len(self.text):  # While we still have input remaining
+        while self.position < len(text):  # While we still have input remaining
             # Ignores whitespace
-            if self.text[self.position].isspace():
+            if text[self.position].isspace():
                 self.position += 1
                 continue
 
+            token_start = self.position
+
             # If we find a digit
-            if self.position < len(self.text) and self.text[self.position].isdigit():
+            if self.position < len(text) and text[self.position].isdigit():
                 current_output = ""
-                while (
-                    self.position < len(self.text)
-                    and self.text[self.position].isdigit()
-                ):
-                    current_output += self.text[self.position]
+                while self.position < len(text) and text[self.position].isdigit():
+                    current_output += text[self.position]
                     self.position += 1
                 final_integer = int(current_output)
-                tokens.append(Token(TokenType.INTEGER, final_integer))
+                tokens.append(Token(TokenType.INTEGER, final_integer, token_start))
 
             # If we find a word
-            elif self.position < len(self.text) and self.text[self.position].isalpha():
+            elif self.position < len(text) and text[self.position].isalpha():
                 current_output = ""
-                while self.position < len(self.text) and (
-                    self.text[self.position].isalnum()
-                    or self.text[self.position] == "_"
+                while self.position < len(text) and (
+                    text[self.position].isalnum() or text[self.position] == "_"
                 ):
-                    current_output += self.text[self.position]
+                    current_output += text[self.position]
                     self.position += 1
                 if current_output in RESERVED_WORDS:
                     reserved_token_type, reserved_token_value = RESERVED_WORDS[
                         current_output
                     ]
-                    tokens.append(Token(reserved_token_type, reserved_token_value))
+                    tokens.append(
+                        Token(reserved_token_type, reserved_token_value, token_start)
+                    )
                 else:
-                    tokens.append(Token(TokenType.IDENTIFIER, current_output))
+                    tokens.append(
+                        Token(TokenType.IDENTIFIER, current_output, token_start)
+                    )
 
             # If we find an operator
             elif (
-                self.position < len(self.text)
-                and self.text[self.position] in SINGLE_CHAR_OPERATORS
+                self.position < len(text)
+                and text[self.position] in SINGLE_CHAR_OPERATORS
             ):
                 # The operator could consist of two characters, we have to check for this
                 if (
-                    self.text[self.position] in AMBIGUOUS_OPERATORS
-                    and self.position + 1 < len(self.text)
-                    and self.text[self.position + 1] == "="
+                    text[self.position] in AMBIGUOUS_OPERATORS
+                    and self.position + 1 < len(text)
+                    and text[self.position + 1] == "="
                 ):
-                    current_operator = (
-                        self.text[self.position] + self.text[self.position + 1]
-                    )
+                    current_operator = text[self.position] + text[self.position + 1]
                     multi_token_type, multi_token_value = MULTI_CHAR_OPERATORS[
                         current_operator
                     ]
-                    tokens.append(Token(multi_token_type, multi_token_value))
+                    tokens.append(
+                        Token(multi_token_type, multi_token_value, token_start)
+                    )
                     self.position += 2
                 else:
                     single_token_type, single_token_value = SINGLE_CHAR_OPERATORS[
-                        self.text[self.position]
+                        text[self.position]
                     ]
-                    tokens.append(Token(single_token_type, single_token_value))
+                    tokens.append(
+                        Token(single_token_type, single_token_value, token_start)
+                    )
                     self.position += 1
 
             # If character is NOT valid (i.e: '$', '@')
             else:
-                raise TokenizerExceptions(
-                    "Invalid character: '"
-                    + self.text[self.position]
-                    + "' cannot be tokenized!"
-                )
+                raise self.invalid_character(self.position)
 
-        tokens.append(Token(TokenType.EOF, None))
+        tokens.append(Token(TokenType.EOF, None, self.position))
         return tokens
+
+    # Only builds the line index once we actually have an error to report
+    def invalid_character(self, offset: int) -> TokenizerExceptions:
+        character = self.text[offset : offset + 1]
+        if not isinstance(character, str):
+            character = character.decode("ascii", errors="backslashreplace")
+        return TokenizerExceptions(
+            "Invalid character: '"
+            + character
+            + "' cannot be tokenized! (at "
+            + LineIndex(self.text).describe(offset)
+            + ")"
+        )
@@ -47,3 +47,7 @@ MULTI_CHAR_OPERATORS = {
 }
 
 AMBIGUOUS_OPERATORS = {"=", "<", ">", "!"}
+
+# "regex" is the default single-pass scanner, "reference" is the original lexer
+# and "numpy" classifies the whole source at once (needs numpy installed)
+LEXER_ENGINES = {"regex", "reference", "numpy"}
@@ -0,0 +1,32 @@
+from array import array
+from bisect import bisect_right
+from typing import Tuple
+
+
+class LineIndex:
+    # Maps source offsets to 1-based (line, column) pairs. The table of line
+    # start offsets is only built on the first lookup, so a compile that never
+    # reports a location never scans the source for newlines.
+    def __init__(self, text):
+        self.text = text
+        self.line_starts = None
+
+    def build(self) -> array:
+        newline = "\n" if isinstance(self.text, str) else b"\n"
+        line_starts = array("q", [0])
+        position = self.text.find(newline)
+        while position != -1:
+            line_starts.append(position + 1)
+            position = self.text.find(newline, position + 1)
+        return line_starts
+
+    def location(self, offset: int) -> Tuple[int, int]:
+        if self.line_starts is None:
+            self.line_starts = self.build()
+        line = bisect_right(self.line_starts, offset)
+        column = offset - self.line_starts[line - 1] + 1
+        return line, column
+
+    def describe(self, offset: int) -> str:
+        line, column = self.location(offset)
+        return f"line {line}, column {column}"
@@ -0,0 +1,66 @@
+import mmap
+import os
+from contextlib import contextmanager
+from typing import Generator, Iterator, Union
+
+from src.lexer.token import Token
+
+# How far the lexer moves before pages behind it are given back to the OS
+RELEASE_INTERVAL = 16 * 1024 * 1024
+
+# Size of the chunks read_released copies out of the mapping
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+@contextmanager
+def map_source(path: str) -> Iterator[Union[mmap.mmap, bytes]]:
+    # Maps a source file read-only so the lexer can scan it without first
+    # copying the whole file into a Python str
+    with open(path, "rb") as file:
+        # Empty files cannot be mapped
+        if os.fstat(file.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            # Read-ahead hint, not every platform has it
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            yield mapped
+
+
+# Gives the mapped pages before `end` back to the OS, where madvise exists
+def release_pages(mapped: mmap.mmap, end: int):
+    if hasattr(mmap, "MADV_DONTNEED"):
+        mapped.madvise(mmap.MADV_DONTNEED, 0, end - end % mmap.PAGESIZE)
+
+
+# The mapped source in chunks, releasing each chunk once the next one is
+# asked for
+def read_released(
+    mapped: mmap.mmap, chunk_size: int = READ_CHUNK_SIZE
+) -> Iterator[bytes]:
+    for start in range(0, len(mapped), chunk_size):
+        if start:
+            release_pages(mapped, start)
+        yield mapped[start : start + chunk_size]
+    release_pages(mapped, len(mapped))
+
+
+def release_behind(
+    tokens: Iterator[Token],
+    mapped: Union[mmap.mmap, bytes],
+    interval: int = RELEASE_INTERVAL,
+) -> Generator[Token, None, None]:
+    # Passes tokens through, dropping the mapped pages the lexer has already
+    # scanned so resident memory stays around `interval` instead of growing to
+    # the file size. Dropped pages are read back from the file if needed again.
+    if not isinstance(mapped, mmap.mmap):
+        yield from tokens
+        return
+    next_release = interval
+    for token in tokens:
+        offset = token.offset
+        if offset is not None and offset >= next_release:
+            release_pages(mapped, offset)
+            next_release = offset + interval
+        yield token
@@ -0,0 +1,72 @@
+import re
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple, Union
+
+from src.lexer.lexer import Lexer, TokenizerExceptions
+from src.lexer.symbol_table import SymbolTable
+from src.lexer.token_buffer import EOF_CODE, TokenBuffer
+
+WHITESPACE = re.compile(r"\s")
+BYTES_WHITESPACE = re.compile(rb"\s")
+
+# Below this size the process pool costs more than it saves
+MIN_PARALLEL_SIZE = 1_000_000
+
+
+# P++ has no strings or comments, so a token never contains whitespace and
+# any whitespace character is a safe place to cut the source
+def split_source(text: Union[str, bytes], chunk_count: int) -> List[int]:
+    whitespace: re.Pattern = WHITESPACE if isinstance(text, str) else BYTES_WHITESPACE
+    boundaries = [0]
+    for chunk in range(1, chunk_count):
+        target = max(len(text) * chunk // chunk_count, boundaries[-1])
+        match = whitespace.search(text, target)
+        if match is None:
+            break
+        if match.start() > boundaries[-1]:
+            boundaries.append(match.start())
+    boundaries.append(len(text))
+    return boundaries
+
+
+# Runs in a worker process. Returns the chunk's token columns with offsets
+# already moved to positions in the whole source, or the offset of an
+# invalid character so the parent can report it with the right line.
+def lex_chunk(chunk: Union[str, bytes], base: int) -> Tuple:
+    lexer = Lexer(chunk)
+    try:
+        buffer = lexer.tokenize_buffer()
+    except TokenizerExceptions:
+        return None, base + lexer.position
+    # Drop the chunk's own EOF
+    types = buffer.types[:-1]
+    starts = array("q", [start + base for start in buffer.starts[:-1]])
+    ends = array("q", [end + base for end in buffer.ends[:-1]])
+    return (types, starts, ends), None
+
+
+def tokenize_parallel(
+    text: Union[str, bytes],
+    workers: int,
+    symbols: Optional[SymbolTable] = None,
+    min_size: int = MIN_PARALLEL_SIZE,
+) -> TokenBuffer:
+    if workers <= 1 or len(text) < min_size:
+        return Lexer(text, symbols=symbols).tokenize_buffer()
+
+    boundaries = split_source(text, workers)
+    chunks = [text[start:end] for start, end in zip(boundaries, boundaries[1:])]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(lex_chunk, chunks, boundaries[:-1]))
+
+    buffer = TokenBuffer(text, symbols)
+    for columns, error_offset in results:
+        if columns is None:
+            raise Lexer(text).invalid_character(error_offset)
+        types, starts, ends = columns
+        buffer.types.extend(types)
+        buffer.starts.extend(starts)
+        buffer.ends.extend(ends)
+    buffer.append(EOF_CODE, len(text), len(text))
+    return buffer
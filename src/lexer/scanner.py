@@ -0,0 +1,48 @@
+import re
+
+from src.lexer.lexer_constants import (MULTI_CHAR_OPERATORS, RESERVED_WORDS,
+                                       SINGLE_CHAR_OPERATORS)
+
+# Group names of the master pattern, also used as the value of match.lastgroup
+INTEGER_GROUP = "integer"
+WORD_GROUP = "word"
+OPERATOR_GROUP = "operator"
+INVALID_GROUP = "invalid"
+
+# Every operator the lexer knows, with "type" and "value" for the token
+OPERATORS = {**SINGLE_CHAR_OPERATORS, **MULTI_CHAR_OPERATORS}
+
+# Lookup tables for scanning bytes (e.g. a memory-mapped file) instead of str
+BYTES_RESERVED_WORDS = {
+    word.encode("ascii"): token for word, token in RESERVED_WORDS.items()
+}
+BYTES_OPERATORS = {
+    operator.encode("ascii"): token for operator, token in OPERATORS.items()
+}
+
+
+def build_master_pattern(binary: bool = False) -> re.Pattern:
+    # Longest operators first so "<=" wins over "<" (maximal munch)
+    operators = sorted(OPERATORS, key=len, reverse=True)
+    operator_pattern = "|".join(re.escape(operator) for operator in operators)
+    # Most frequent token kinds first, every alternative is tried in order
+    alternatives = [
+        # A word starts with a letter and continues with letters, digits or '_'
+        rf"(?P<{WORD_GROUP}>[^\W\d_]\w*)",
+        rf"(?P<{OPERATOR_GROUP}>{operator_pattern})",
+        rf"(?P<{INTEGER_GROUP}>\d+)",
+        # Anything else is a character we cannot tokenize
+        rf"(?P<{INVALID_GROUP}>.)",
+        # Trailing whitespace matches with no group set
+        r"\Z",
+    ]
+    # Leading whitespace is skipped as part of the next token's match
+    pattern = r"\s*(?:" + "|".join(alternatives) + ")"
+    if binary:
+        # Over bytes the character classes are ASCII only
+        return re.compile(pattern.encode("ascii"), re.DOTALL)
+    return re.compile(pattern, re.DOTALL)
+
+
+MASTER_PATTERN = build_master_pattern()
+BYTES_MASTER_PATTERN = build_master_pattern(binary=True)
@@ -0,0 +1,27 @@
+from typing import Dict, List
+
+
+class SymbolTable:
+    # Per-compilation table of identifier names. Every name gets one small
+    # integer id and one shared str object, so repeated names in a program
+    # compare by identity and can key dicts/lists by id.
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.names: List[str] = []
+
+    def intern(self, name: str) -> int:
+        symbol = self.ids.get(name)
+        if symbol is None:
+            symbol = len(self.names)
+            self.ids[name] = symbol
+            self.names.append(name)
+        return symbol
+
+    def name(self, symbol: int) -> str:
+        return self.names[symbol]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.ids
@@ -1,6 +1,6 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum, auto
-from typing import Union
+from typing import Optional, Union
 
 
 class TokenType(Enum):
@@ -59,3 +59,7 @@ class TokenType(Enum):
 class Token:
     type: TokenType
     value: Union[int, bool, str, None]
+    # Start of the token in the source, not part of token equality
+    offset: Optional[int] = field(default=None, compare=False)
+    # Id of an identifier in the lexer's SymbolTable
+    symbol: Optional[int] = field(default=None, compare=False)
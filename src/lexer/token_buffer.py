@@ -0,0 +1,99 @@
+from array import array
+from mmap import mmap
+from typing import Iterator, Optional, Union
+
+from src.lexer.lexer_constants import RESERVED_WORDS
+from src.lexer.scanner import BYTES_OPERATORS, BYTES_RESERVED_WORDS, OPERATORS
+from src.lexer.symbol_table import SymbolTable
+from src.lexer.token import Token, TokenType
+
+# Type codes stored in the buffer are the TokenType values
+TOKEN_TYPES = {token_type.value: token_type for token_type in TokenType}
+
+# Tokens whose value never depends on the source text
+FIXED_VALUES = {
+    token_type.value: value
+    for token_type, value in [*RESERVED_WORDS.values(), *OPERATORS.values()]
+    if token_type != TokenType.BOOLEAN
+}
+FIXED_VALUES[TokenType.EOF.value] = None
+
+RESERVED_CODES = {
+    word: token_type.value for word, (token_type, _) in RESERVED_WORDS.items()
+}
+OPERATOR_CODES = {
+    operator: token_type.value for operator, (token_type, _) in OPERATORS.items()
+}
+
+BYTES_RESERVED_CODES = {
+    word: token_type.value for word, (token_type, _) in BYTES_RESERVED_WORDS.items()
+}
+BYTES_OPERATOR_CODES = {
+    operator: token_type.value for operator, (token_type, _) in BYTES_OPERATORS.items()
+}
+
+INTEGER_CODE = TokenType.INTEGER.value
+IDENTIFIER_CODE = TokenType.IDENTIFIER.value
+BOOLEAN_CODE = TokenType.BOOLEAN.value
+EOF_CODE = TokenType.EOF.value
+
+
+class TokenBuffer:
+    # Struct-of-arrays token storage: one byte for the type and two offsets
+    # into the source per token. Values are only built when a token is read.
+    def __init__(
+        self, source: Union[str, bytes, mmap], symbols: Optional[SymbolTable] = None
+    ):
+        self.source = source
+        self.symbols = symbols if symbols is not None else SymbolTable()
+        self.types = array("B")
+        self.starts = array("q")
+        self.ends = array("q")
+
+    def append(self, type_code: int, start: int, end: int):
+        self.types.append(type_code)
+        self.starts.append(start)
+        self.ends.append(end)
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def __getitem__(self, index: int) -> Token:
+        type_code = self.types[index]
+        if type_code == IDENTIFIER_CODE:
+            symbol = self.symbol_at(index)
+            return Token(
+                TokenType.IDENTIFIER,
+                self.symbols.names[symbol],
+                self.starts[index],
+                symbol,
+            )
+        return Token(TOKEN_TYPES[type_code], self.value_at(index), self.starts[index])
+
+    def __iter__(self) -> Iterator[Token]:
+        for index in range(len(self.types)):
+            yield self[index]
+
+    def type_at(self, index: int) -> TokenType:
+        return TOKEN_TYPES[self.types[index]]
+
+    def text_at(self, index: int) -> str:
+        text = self.source[self.starts[index] : self.ends[index]]
+        if isinstance(text, str):
+            return text
+        return text.decode("ascii")
+
+    # Interns the identifier on first use, identifiers are not interned while
+    # the buffer is being filled
+    def symbol_at(self, index: int) -> int:
+        return self.symbols.intern(self.text_at(index))
+
+    def value_at(self, index: int) -> Union[int, bool, str, None]:
+        type_code = self.types[index]
+        if type_code == IDENTIFIER_CODE:
+            return self.symbols.names[self.symbol_at(index)]
+        if type_code == INTEGER_CODE:
+            return int(self.text_at(index))
+        if type_code == BOOLEAN_CODE:
+            return self.text_at(index) == "true"
+        return FIXED_VALUES[type_code]
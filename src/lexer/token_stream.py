@@ -0,0 +1,41 @@
+from collections import deque
+from typing import Iterable
+
+from src.lexer.token import Token
+
+# The parser only ever looks one token past the current one
+DEFAULT_LOOKAHEAD = 2
+
+
+class TokenStream:
+    # Wraps a token iterator (e.g. Lexer.iter_tokens()) so it can be indexed
+    # like a list, while only the last few tokens are kept in memory.
+    def __init__(self, tokens: Iterable[Token], lookahead: int = DEFAULT_LOOKAHEAD):
+        if lookahead < 1:
+            raise ValueError("TokenStream needs room for at least one token.")
+        self.tokens = iter(tokens)
+        self.window: deque = deque(maxlen=lookahead)
+        self.window_start = 0  # Index of the oldest token still in the window
+        self.exhausted = False
+
+    def __getitem__(self, index: int) -> Token:
+        while index >= self.window_start + len(self.window):
+            self.pull()
+        if index < self.window_start:
+            raise IndexError(
+                f"Token {index} has already left the lookahead window of the stream."
+            )
+        return self.window[index - self.window_start]
+
+    def pull(self):
+        if self.exhausted:
+            raise IndexError("Read past the end of the token stream.")
+        try:
+            token = next(self.tokens)
+        except StopIteration:
+            self.exhausted = True
+            raise IndexError("Read past the end of the token stream.")
+        # Appending to a full deque drops the oldest token
+        if len(self.window) == self.window.maxlen:
+            self.window_start += 1
+        self.window.append(token)
@@ -0,0 +1,166 @@
+from array import array
+from mmap import mmap
+from typing import Optional, Union
+
+import numpy as np
+
+from src.lexer.lexer_constants import AMBIGUOUS_OPERATORS
+from src.lexer.symbol_table import SymbolTable
+from src.lexer.token_buffer import (BYTES_RESERVED_CODES, EOF_CODE,
+                                    IDENTIFIER_CODE, INTEGER_CODE,
+                                    OPERATOR_CODES, RESERVED_CODES,
+                                    TokenBuffer)
+
+# Character classes of the lookup table
+WHITESPACE = 0
+LETTER = 1
+DIGIT = 2
+UNDERSCORE = 3
+OPERATOR = 4
+INVALID = 5
+
+# No reserved word is longer than this, longer words skip the keyword lookup
+LONGEST_RESERVED_WORD = max(len(word) for word in RESERVED_CODES)
+
+
+def build_class_table(binary: bool):
+    table = np.full(256, INVALID, dtype=np.uint8)
+    for byte in range(128):
+        character = chr(byte)
+        # str.isspace also counts \x1c-\x1f, bytes.isspace (and re over bytes)
+        # does not, so each input kind keeps the regex engine's behavior
+        is_space = bytes([byte]).isspace() if binary else character.isspace()
+        if is_space:
+            table[byte] = WHITESPACE
+        elif character.isalpha():
+            table[byte] = LETTER
+        elif character.isdigit():
+            table[byte] = DIGIT
+        elif character == "_":
+            table[byte] = UNDERSCORE
+        elif character in OPERATOR_CODES:
+            table[byte] = OPERATOR
+    return table
+
+
+# Type codes by the operator's first character, for one-character operators
+# or for two-character operators ending in "="
+def build_operator_table(length: int):
+    table = np.zeros(256, dtype=np.uint8)
+    for operator, type_code in OPERATOR_CODES.items():
+        if len(operator) == length:
+            table[ord(operator[0])] = type_code
+    return table
+
+
+STR_CLASS_TABLE = build_class_table(binary=False)
+BYTES_CLASS_TABLE = build_class_table(binary=True)
+SINGLE_OPERATOR_TABLE = build_operator_table(1)
+PAIR_OPERATOR_TABLE = build_operator_table(2)
+AMBIGUOUS_TABLE = np.zeros(256, dtype=bool)
+AMBIGUOUS_TABLE[[ord(operator) for operator in AMBIGUOUS_OPERATORS]] = True
+
+
+class VectorizedLexerError(Exception):
+    # Raised with the offset of the first character that cannot be tokenized,
+    # the Lexer turns it into a TokenizerExceptions with a line and column
+    def __init__(self, offset: int):
+        super().__init__(offset)
+        self.offset = offset
+
+
+# Classifies every byte of the source at once with a lookup table and finds
+# token boundaries from changes in the class array. Python-level work is
+# left for keyword lookup and for pairing "=", "<", ">", "!" with a following
+# "=". The source must be ASCII str, bytes or a memory-mapped file.
+def tokenize_vectorized(
+    source: Union[str, bytes, mmap], symbols: Optional[SymbolTable] = None
+) -> TokenBuffer:
+    binary = not isinstance(source, str)
+    raw = source.encode("ascii") if isinstance(source, str) else source
+    data = np.frombuffer(raw, dtype=np.uint8)
+    length = len(data)
+    classes = (BYTES_CLASS_TABLE if binary else STR_CLASS_TABLE)[data]
+
+    invalid = np.flatnonzero(classes == INVALID)
+    first_invalid = int(invalid[0]) if len(invalid) else length
+
+    # Runs of word characters (letters, digits and '_')
+    is_word = (classes == LETTER) | (classes == DIGIT) | (classes == UNDERSCORE)
+    padded = np.concatenate(([False], is_word, [False]))
+    changes = np.flatnonzero(padded[1:] != padded[:-1])
+    run_starts = changes[0::2]
+    run_ends = changes[1::2]
+
+    # A run is digits (an integer) up to its first letter or '_', and a word
+    # from there on. A '_' that does not follow a letter is invalid.
+    not_digit = np.append(np.flatnonzero(is_word & (classes != DIGIT)), length)
+    split = np.minimum(not_digit[np.searchsorted(not_digit, run_starts)], run_ends)
+    has_integer = split > run_starts
+    has_word = split < run_ends
+    bad_underscore = np.flatnonzero(classes[split[has_word]] == UNDERSCORE)
+    if len(bad_underscore):
+        first_invalid = min(first_invalid, int(split[has_word][bad_underscore[0]]))
+    if first_invalid < length:
+        raise VectorizedLexerError(first_invalid)
+
+    integer_starts = run_starts[has_integer]
+    integer_ends = split[has_integer]
+    word_starts = split[has_word]
+    word_ends = run_ends[has_word]
+
+    # Operators, a pair is taken unless its first character already closed
+    # the previous pair (maximal munch, left to right)
+    operator_starts = np.flatnonzero(classes == OPERATOR)
+    operator_ends = operator_starts + 1
+    operator_codes = SINGLE_OPERATOR_TABLE[data[operator_starts]]
+    pair_candidates = np.flatnonzero(
+        AMBIGUOUS_TABLE[data[:-1]] & (data[1:] == ord("="))
+    )
+    if len(pair_candidates):
+        pairs = []
+        previous = -2
+        for position in pair_candidates.tolist():
+            if position != previous + 1:
+                pairs.append(position)
+                previous = position
+        pair_starts = np.array(pairs, dtype=np.int64)
+        pair_index = np.searchsorted(operator_starts, pair_starts)
+        operator_codes[pair_index] = PAIR_OPERATOR_TABLE[data[pair_starts]]
+        operator_ends[pair_index] = pair_starts + 2
+        # The '=' closing a pair is not a token of its own
+        keep = np.ones(len(operator_starts), dtype=bool)
+        keep[pair_index + 1] = False
+        operator_starts = operator_starts[keep]
+        operator_ends = operator_ends[keep]
+        operator_codes = operator_codes[keep]
+
+    # Keyword lookup, only for words short enough to be reserved
+    word_codes = np.full(len(word_starts), IDENTIFIER_CODE, dtype=np.uint8)
+    short_words = np.flatnonzero(word_ends - word_starts <= LONGEST_RESERVED_WORD)
+    for index, start, end in zip(
+        short_words.tolist(),
+        word_starts[short_words].tolist(),
+        word_ends[short_words].tolist(),
+    ):
+        code = BYTES_RESERVED_CODES.get(raw[start:end])
+        if code is not None:
+            word_codes[index] = code
+
+    starts = np.concatenate((integer_starts, word_starts, operator_starts))
+    ends = np.concatenate((integer_ends, word_ends, operator_ends))
+    codes = np.concatenate(
+        (
+            np.full(len(integer_starts), INTEGER_CODE, dtype=np.uint8),
+            word_codes,
+            operator_codes,
+        )
+    )
+    order = np.argsort(starts, kind="stable")
+
+    buffer = TokenBuffer(source, symbols)
+    buffer.types = array("B", codes[order].astype(np.uint8).tobytes())
+    buffer.starts = array("q", starts[order].astype(np.int64).tobytes())
+    buffer.ends = array("q", ends[order].astype(np.int64).tobytes())
+    buffer.append(EOF_CODE, length, length)
+    return buffer
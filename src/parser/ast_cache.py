@@ -0,0 +1,164 @@
+import hashlib
+import mmap
+import os
+import tempfile
+from importlib.metadata import PackageNotFoundError, version
+from typing import Optional, Union
+
+from src.lexer.mapped_source import read_released
+from src.parser.ast_nodes import ProgramNode
+from src.parser.ast_serialization import (NODE_SCHEMA, deserialize_nodes,
+                                          serialize_nodes)
+
+# Start of every cache entry, followed by the sha256 of the payload
+MAGIC = b"PPAST1"
+DIGEST_SIZE = hashlib.sha256().digest_size
+ENTRY_SUFFIX = ".ast"
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def compiler_version() -> str:
+    try:
+        package_version = version("pythonplusplus")
+    except PackageNotFoundError:
+        package_version = "unknown"
+    # Changing a node class or its fields also changes every key
+    schema = [
+        (node_class.__name__, [name for name, _ in fields])
+        for node_class, fields in NODE_SCHEMA
+    ]
+    return f"{package_version} {schema}"
+
+
+def default_cache_dir() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "ppp")
+
+
+class AstCache:
+    # Parsed programs on disk, one file per source, named by the sha256 of the
+    # source text and the compiler version. An entry's mtime is its last use,
+    # the least recently used entries are removed once the directory holds
+    # more than max_bytes. Unreadable or corrupt entries count as a miss.
+    # Hashing the source is the costly part, so load and store take the key
+    # and a compile works it out once.
+    def __init__(
+        self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES
+    ):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.version = compiler_version().encode("utf-8")
+
+    def key(self, source: Union[str, bytes, mmap.mmap]) -> str:
+        digest = hashlib.sha256(self.version + b"\0")
+        if isinstance(source, mmap.mmap):
+            # Pages already hashed are released, as when lexing the source
+            for chunk in read_released(source):
+                digest.update(chunk)
+        elif isinstance(source, str):
+            digest.update(source.encode("utf-8"))
+        else:
+            digest.update(source)
+        return digest.hexdigest()
+
+    def entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    def load(self, key: str) -> Optional[ProgramNode]:
+        path = self.entry_path(key)
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except OSError:
+            return None
+        program = self.decode(data)
+        if program is None:
+            self.remove(path)
+            return None
+        # Mark the entry as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return program
+
+    def store(self, key: str, program: ProgramNode) -> bool:
+        try:
+            payload = serialize_nodes([program])
+        except (ValueError, RecursionError):
+            # Too deeply nested for marshal, the program is just not cached
+            return False
+        data = MAGIC + hashlib.sha256(payload).digest() + payload
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write to a temporary file first so readers never see half an entry
+            file_descriptor, temporary_path = tempfile.mkstemp(dir=self.directory)
+            try:
+                with os.fdopen(file_descriptor, "wb") as file:
+                    file.write(data)
+                os.replace(temporary_path, self.entry_path(key))
+            except OSError:
+                self.remove(temporary_path)
+                raise
+        except OSError:
+            return False
+        self.evict()
+        return True
+
+    @staticmethod
+    def decode(data: bytes) -> Optional[ProgramNode]:
+        header_size = len(MAGIC) + DIGEST_SIZE
+        if len(data) < header_size or not data.startswith(MAGIC):
+            return None
+        payload = data[header_size:]
+        if hashlib.sha256(payload).digest() != data[len(MAGIC) : header_size]:
+            return None
+        try:
+            nodes = deserialize_nodes(payload)
+        except (ValueError, EOFError, TypeError, IndexError, KeyError):
+            return None
+        if len(nodes) != 1 or not isinstance(nodes[0], ProgramNode):
+            return None
+        return nodes[0]
+
+    def entries(self) -> list:
+        # (mtime, size, path) of every entry
+        entries: list = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return entries
+        for name in names:
+            if not name.endswith(ENTRY_SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                status = os.stat(path)
+            except OSError:
+                continue
+            entries.append((status.st_mtime_ns, status.st_size, path))
+        return entries
+
+    def evict(self):
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        # Oldest use first
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self.remove(path)
+            total -= size
+
+    def clear(self):
+        for _, _, path in self.entries():
+            self.remove(path)
+
+    @staticmethod
+    def remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
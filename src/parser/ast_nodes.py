@@ -2,20 +2,29 @@ from typing import Optional
 
 
 class Node:
-    pass
+    # Every node class lists its fields in __slots__, so nodes carry no
+    # per-instance __dict__. Subclasses must declare __slots__ too.
+    # structural_hash is only set on nodes made by a HashConsingFactory.
+    __slots__ = ("structural_hash",)
 
 
 class IntegerNode(Node):
+    __slots__ = ("value",)
+
     def __init__(self, value: int):
         self.value = value
 
 
 class IdentifierNode(Node):
+    __slots__ = ("value",)
+
     def __init__(self, value: str):
         self.value = value
 
 
 class BinaryOpNode(Node):
+    __slots__ = ("op", "left_child", "right_child")
+
     def __init__(self, op: str, left_child: Node, right_child: Node):
         self.op = op
         self.left_child = left_child
@@ -23,26 +32,34 @@ class BinaryOpNode(Node):
 
 
 class BooleanNode(Node):
+    __slots__ = ("value",)
+
     def __init__(self, value: bool):
         self.value = value
 
 
 class PrintNode(Node):
+    __slots__ = ("inner_expression",)
+
     def __init__(self, inner_expression: Node):
         self.inner_expression = inner_expression
 
 
 class ThisNode(Node):
-    pass
+    __slots__ = ()
 
 
 class NewNode(Node):
+    __slots__ = ("class_name", "arguments")
+
     def __init__(self, class_name: str, arguments: list[Node]):
         self.class_name = class_name
         self.arguments = arguments
 
 
 class CallNode(Node):
+    __slots__ = ("obj_node", "method_name", "arguments")
+
     def __init__(self, obj_node: Node, method_name: str, arguments: list[Node]):
         self.obj_node = obj_node
         self.method_name = method_name
@@ -50,15 +67,19 @@ class CallNode(Node):
 
 
 class StatementNode(Node):
-    pass
+    __slots__ = ()
 
 
 class ExpressionStatement(StatementNode):
+    __slots__ = ("exp",)
+
     def __init__(self, exp: Node):
         self.exp = exp
 
 
 class VarDecStatement(StatementNode):
+    __slots__ = ("var_type", "var", "val")
+
     def __init__(self, var_type: str, var: str, val: Node):
         self.var_type = var_type
         self.var = var
@@ -66,27 +87,35 @@ class VarDecStatement(StatementNode):
 
 
 class AssignmentStatement(StatementNode):
+    __slots__ = ("var", "exp")
+
     def __init__(self, var: str, exp: Node):
         self.var = var
         self.exp = exp
 
 
 class WhileStatement(StatementNode):
+    __slots__ = ("exp", "stmt")
+
     def __init__(self, exp: Node, stmt: StatementNode):
         self.exp = exp
         self.stmt = stmt
 
 
 class BreakStatement(StatementNode):
-    pass
+    __slots__ = ()
 
 
 class ReturnStatement(StatementNode):
+    __slots__ = ("exp",)
+
     def __init__(self, exp: Optional[Node] = None):
         self.exp = exp
 
 
 class IfStatement(StatementNode):
+    __slots__ = ("exp", "then_stmt", "else_stmt")
+
     def __init__(
         self,
         exp: Node,
@@ -99,15 +128,19 @@ class IfStatement(StatementNode):
 
 
 class BlockStatement(StatementNode):
+    __slots__ = ("stmts",)
+
     def __init__(self, stmts: list[StatementNode]):
         self.stmts = stmts
 
 
 class DeclarationNode(Node):
-    pass
+    __slots__ = ()
 
 
 class MethodDef(DeclarationNode):
+    __slots__ = ("method_type", "method_name", "parameters", "statements")
+
     def __init__(
         self,
         method_type: str,
@@ -122,6 +155,8 @@ class MethodDef(DeclarationNode):
 
 
 class Constructor(DeclarationNode):
+    __slots__ = ("parameters", "super_args", "statements")
+
     def __init__(
         self,
         parameters: list[tuple],
@@ -134,6 +169,14 @@ class Constructor(DeclarationNode):
 
 
 class ClassDef(DeclarationNode):
+    __slots__ = (
+        "class_name",
+        "extend_class_name",
+        "class_instance_vars",
+        "constructor",
+        "methods",
+    )
+
     def __init__(
         self,
         class_name: str,
@@ -150,6 +193,8 @@ class ClassDef(DeclarationNode):
 
 
 class ProgramNode(Node):
+    __slots__ = ("class_defs", "statements")
+
     def __init__(self, class_defs: list[ClassDef], statements: list[StatementNode]):
         self.class_defs = class_defs
         self.statements = statements
@@ -0,0 +1,118 @@
+"""
+COMPACT ENCODING OF AST NODES AS NESTED TUPLES, FOR SENDING TREES BETWEEN
+PROCESSES AND STORING THEM ON DISK.
+
+A NODE BECOMES (type code, field, field, ...) WITH THE FIELDS IN THE ORDER OF
+ITS __init__ ARGUMENTS. THE ENCODING ONLY HOLDS TUPLES, LISTS, STRINGS, INTS,
+BOOLS AND None, SO marshal CAN WRITE IT MUCH FASTER THAN pickle WRITES NODES.
+"""
+
+import gc
+import marshal
+
+from src.parser.ast_nodes import *
+
+# Kinds of node fields
+VALUE = 0  # str, int, bool, None or a list of parameter tuples, kept as is
+NODE = 1  # a node or None
+NODES = 2  # a list of nodes or None
+
+# The index of a node class in this list is its type code
+NODE_SCHEMA = [
+    (IntegerNode, (("value", VALUE),)),
+    (IdentifierNode, (("value", VALUE),)),
+    (BinaryOpNode, (("op", VALUE), ("left_child", NODE), ("right_child", NODE))),
+    (BooleanNode, (("value", VALUE),)),
+    (PrintNode, (("inner_expression", NODE),)),
+    (ThisNode, ()),
+    (NewNode, (("class_name", VALUE), ("arguments", NODES))),
+    (CallNode, (("obj_node", NODE), ("method_name", VALUE), ("arguments", NODES))),
+    (ExpressionStatement, (("exp", NODE),)),
+    (VarDecStatement, (("var_type", VALUE), ("var", VALUE), ("val", NODE))),
+    (AssignmentStatement, (("var", VALUE), ("exp", NODE))),
+    (WhileStatement, (("exp", NODE), ("stmt", NODE))),
+    (BreakStatement, ()),
+    (ReturnStatement, (("exp", NODE),)),
+    (IfStatement, (("exp", NODE), ("then_stmt", NODE), ("else_stmt", NODE))),
+    (BlockStatement, (("stmts", NODES),)),
+    (
+        MethodDef,
+        (
+            ("method_type", VALUE),
+            ("method_name", VALUE),
+            ("parameters", VALUE),
+            ("statements", NODES),
+        ),
+    ),
+    (
+        Constructor,
+        (("parameters", VALUE), ("super_args", NODES), ("statements", NODES)),
+    ),
+    (
+        ClassDef,
+        (
+            ("class_name", VALUE),
+            ("extend_class_name", VALUE),
+            ("class_instance_vars", VALUE),
+            ("constructor", NODE),
+            ("methods", NODES),
+        ),
+    ),
+    (ProgramNode, (("class_defs", NODES), ("statements", NODES))),
+]
+
+NODE_CODES = {
+    node_class: (code, fields) for code, (node_class, fields) in enumerate(NODE_SCHEMA)
+}
+
+
+def node_to_tuple(node):
+    if node is None:
+        return None
+    code, fields = NODE_CODES[type(node)]
+    encoded = [code]
+    for name, kind in fields:
+        value = getattr(node, name)
+        if kind == NODE:
+            value = node_to_tuple(value)
+        elif kind == NODES and value is not None:
+            value = [node_to_tuple(item) for item in value]
+        encoded.append(value)
+    return tuple(encoded)
+
+
+def tuple_to_node(encoded):
+    if encoded is None:
+        return None
+    node_class, fields = NODE_SCHEMA[encoded[0]]
+    arguments = []
+    for (_, kind), value in zip(fields, encoded[1:]):
+        if kind == NODE:
+            value = tuple_to_node(value)
+        elif kind == NODES and value is not None:
+            value = [tuple_to_node(item) for item in value]
+        arguments.append(value)
+    return node_class(*arguments)
+
+
+def serialize_nodes(nodes: list) -> bytes:
+    # Encoding builds as many tuples as there are nodes, same as below
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        return marshal.dumps([node_to_tuple(node) for node in nodes])
+    finally:
+        if collecting:
+            gc.enable()
+
+
+def deserialize_nodes(data: bytes) -> list:
+    # Building a large tree sets off many collections that each scan the
+    # whole heap. Trees have no reference cycles, so the collector is paused.
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        return [tuple_to_node(encoded) for encoded in marshal.loads(data)]
+    finally:
+        if collecting:
+            gc.enable()
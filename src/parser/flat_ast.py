@@ -0,0 +1,188 @@
+"""
+FLAT AST: EVERY NODE OF A TREE IN A FEW PARALLEL ARRAYS, REFERENCED BY INDEX.
+
+NODES ARE STORED IN PRE-ORDER, SO A PARENT ALWAYS COMES BEFORE ITS CHILDREN
+AND A PASS OVER THE INDEXES IN REVERSE SEES EVERY CHILD BEFORE ITS PARENT.
+FIELDS FOLLOW NODE_SCHEMA FROM ast_serialization, ONE OPERAND PER FIELD:
+    NODE   child node index, or -1 for None
+    NODES  index of a child list (a range of the children array), or -1
+    VALUE  index into the payloads table (names, numbers, parameter lists)
+"""
+
+import marshal
+from array import array
+
+from src.parser.ast_nodes import Node
+from src.parser.ast_serialization import NODE, NODE_CODES, NODE_SCHEMA, NODES
+
+NO_NODE = -1
+
+# Field names of each kind, by type code
+FIELD_INDEXES = [
+    {name: position for position, (name, _) in enumerate(fields)}
+    for _, fields in NODE_SCHEMA
+]
+
+
+class FlatAst:
+    def __init__(self):
+        self.kinds = array("B")  # Type code of each node
+        self.operand_starts = array("i")  # First operand of each node
+        self.operands = array("i")
+        self.list_starts = array("i")  # Child lists, as ranges of children
+        self.list_lengths = array("i")
+        self.children = array("i")
+        self.payloads: list = []
+        self.payload_indexes: dict = {}  # Payloads seen so far, for sharing
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def node_class(self, index: int) -> type:
+        return NODE_SCHEMA[self.kinds[index]][0]
+
+    def operand(self, index: int, position: int) -> int:
+        return self.operands[self.operand_starts[index] + position]
+
+    # Value of a field: a node index (or -1), a list of node indexes (or
+    # None) or a payload, depending on the kind of the field
+    def get(self, index: int, name: str):
+        code = self.kinds[index]
+        position = FIELD_INDEXES[code][name]
+        kind = NODE_SCHEMA[code][1][position][1]
+        operand = self.operand(index, position)
+        if kind == NODE:
+            return operand
+        if kind == NODES:
+            return None if operand == NO_NODE else self.child_list(operand)
+        return self.payloads[operand]
+
+    def child_list(self, list_index: int) -> array:
+        start = self.list_starts[list_index]
+        return self.children[start : start + self.list_lengths[list_index]]
+
+    # Indexes of the direct children of a node, in field order
+    def child_indexes(self, index: int) -> list:
+        indexes = []
+        start = self.operand_starts[index]
+        for position, (_, kind) in enumerate(NODE_SCHEMA[self.kinds[index]][1]):
+            operand = self.operands[start + position]
+            if operand == NO_NODE:
+                continue
+            if kind == NODE:
+                indexes.append(operand)
+            elif kind == NODES:
+                indexes.extend(self.child_list(operand))
+        return indexes
+
+    def add_payload(self, value) -> int:
+        try:
+            key = (type(value), value)
+            index = self.payload_indexes.get(key)
+        except TypeError:
+            # Parameter lists are not hashable and are stored every time
+            key = None
+            index = None
+        if index is None:
+            index = len(self.payloads)
+            self.payloads.append(value)
+            if key is not None:
+                self.payload_indexes[key] = index
+        return index
+
+    def to_bytes(self) -> bytes:
+        return marshal.dumps(
+            (
+                self.kinds.tobytes(),
+                self.operand_starts.tobytes(),
+                self.operands.tobytes(),
+                self.list_starts.tobytes(),
+                self.list_lengths.tobytes(),
+                self.children.tobytes(),
+                self.payloads,
+            )
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "FlatAst":
+        flat = cls()
+        columns = marshal.loads(data)
+        for name, column in zip(
+            [
+                "kinds",
+                "operand_starts",
+                "operands",
+                "list_starts",
+                "list_lengths",
+                "children",
+            ],
+            columns,
+        ):
+            getattr(flat, name).frombytes(column)
+        flat.payloads = columns[-1]
+        return flat
+
+
+# Flattens a tree with an explicit stack, so any depth works. Each work item
+# is a node and the operand (or children entry) that gets its index.
+def flatten(root: Node) -> FlatAst:
+    flat = FlatAst()
+    kinds = flat.kinds
+    operands = flat.operands
+    children = flat.children
+    stack = [(root, None, 0)]
+    while stack:
+        node, target, position = stack.pop()
+        index = len(kinds)
+        if target is not None:
+            target[position] = index
+        code, fields = NODE_CODES[type(node)]
+        kinds.append(code)
+        start = len(operands)
+        flat.operand_starts.append(start)
+        operands.extend([NO_NODE] * len(fields))
+        pending = []
+        for offset, (name, kind) in enumerate(fields):
+            value = getattr(node, name)
+            if kind == NODE:
+                if value is not None:
+                    pending.append((value, operands, start + offset))
+            elif kind == NODES:
+                if value is not None:
+                    operands[start + offset] = len(flat.list_starts)
+                    flat.list_starts.append(len(children))
+                    flat.list_lengths.append(len(value))
+                    for item in value:
+                        pending.append((item, children, len(children)))
+                        children.append(NO_NODE)
+            else:
+                operands[start + offset] = flat.add_payload(value)
+        # Reversed, so the first child is the next node (pre-order)
+        stack.extend(reversed(pending))
+    return flat
+
+
+# Rebuilds node objects, children first, without recursion
+def unflatten(flat: FlatAst) -> Node:
+    nodes: list = [None] * len(flat)
+    operands = flat.operands
+    payloads = flat.payloads
+    for index in range(len(flat) - 1, -1, -1):
+        node_class, fields = NODE_SCHEMA[flat.kinds[index]]
+        start = flat.operand_starts[index]
+        arguments = []
+        for offset, (_, kind) in enumerate(fields):
+            operand = operands[start + offset]
+            if kind == NODE:
+                arguments.append(None if operand == NO_NODE else nodes[operand])
+            elif kind == NODES:
+                if operand == NO_NODE:
+                    arguments.append(None)
+                else:
+                    arguments.append(
+                        [nodes[child] for child in flat.child_list(operand)]
+                    )
+            else:
+                arguments.append(payloads[operand])
+        nodes[index] = node_class(*arguments)
+    return nodes[0]
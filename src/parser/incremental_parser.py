@@ -0,0 +1,238 @@
+from typing import Callable, Optional, TypeVar, cast
+
+from src.lexer.lexer import Lexer
+from src.lexer.line_index import LineIndex
+from src.lexer.token import TokenType
+from src.lexer.token_buffer import TokenBuffer
+from src.parser.ast_nodes import *
+from src.parser.ast_serialization import node_to_tuple, tuple_to_node
+from src.parser.parser import (Parser, ParserException,
+                               ParserParenthesisException)
+from src.parser.token_spans import (TokenSlice, TokenSpanException, block_end,
+                                    split_program)
+
+NodeType = TypeVar("NodeType", bound=Node)
+
+
+# A new subtree equal to node, sharing no nodes with it
+def copy_node(node: NodeType) -> NodeType:
+    return tuple_to_node(node_to_tuple(node))
+
+
+def common_prefix_length(old: str, new: str) -> int:
+    # Binary search with slice comparisons, which run in C
+    low, high = 0, min(len(old), len(new))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if old[:middle] == new[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+# The smallest (offset, removed_length, inserted_text) edit turning old into new
+def edit_range(old: str, new: str):
+    prefix = common_prefix_length(old, new)
+    suffix = common_prefix_length(old[prefix:][::-1], new[prefix:][::-1])
+    return prefix, len(old) - prefix - suffix, new[prefix : len(new) - suffix]
+
+
+class RegionParser(Parser):
+    # Parses one span of a TokenBuffer. Methods whose text was seen in the
+    # previous parse are taken from method_cache, through reuse, instead of
+    # being parsed.
+    def __init__(
+        self,
+        region: TokenSlice,
+        type_codes: bytes,
+        method_cache: dict,
+        reuse: Callable[[MethodDef], MethodDef],
+    ):
+        super().__init__(region)
+        self.region = region
+        self.type_codes = type_codes
+        self.method_cache = method_cache
+        self.reuse = reuse
+        self.methods: list = []  # (text, MethodDef) of every method, parsed or reused
+        self.parsed_methods = 0
+
+    def parse_methoddef(self):
+        buffer = self.region.buffer
+        start = self.region.start + self.position
+        end = block_end(self.type_codes, start)
+        text = buffer.source[buffer.starts[start] : buffer.ends[end - 1]]
+        method = self.method_cache.get(text)
+        if method is None:
+            method = super().parse_methoddef()
+            self.parsed_methods += 1
+        else:
+            method = self.reuse(method)
+            self.move_to(end - self.region.start)
+        self.methods.append((text, method))
+        return method
+
+
+class IncrementalParser:
+    # Keeps the tokens and the subtrees of the last parse. The next parse
+    # relexes only around the edit and re-parses only the classes, methods
+    # and top-level statements whose text changed. Untouched ClassDef and
+    # MethodDef nodes are reused as they are. Caches are keyed by text, so
+    # a subtree whose text comes up again in the same parse is copied, every
+    # site gets its own nodes.
+    def __init__(self):
+        self.lexer: Optional[Lexer] = None
+        self.tokens: Optional[TokenBuffer] = None
+        # Text of a class -> (ClassDef, [(text, MethodDef) of its methods])
+        self.class_cache: dict = {}
+        self.method_cache: dict = {}
+        self.statement_cache: dict = {}
+        # What the last parse had to parse again
+        self.parsed_classes = 0
+        self.parsed_methods = 0
+        self.parsed_statements = 0
+        self.claimed: set = set()  # Ids of cached nodes taken by this parse
+
+    def parse(self, source: str) -> ProgramNode:
+        if self.lexer is None or self.tokens is None:
+            self.lexer = Lexer(source)
+            self.tokens = self.lexer.tokenize_buffer()
+        else:
+            # The lexer is only ever given str sources here
+            old_source = cast(str, self.lexer.text)
+            if source != old_source:
+                self.tokens = self.lexer.relex(
+                    self.tokens, *edit_range(old_source, source)
+                )
+        return self.parse_tokens(self.tokens)
+
+    # Same as parse, for callers that already know what was edited
+    def edit(self, offset: int, removed_length: int, inserted_text: str) -> ProgramNode:
+        if self.lexer is None or self.tokens is None:
+            raise ParserException("Nothing to edit, call parse first.")
+        self.tokens = self.lexer.relex(
+            self.tokens, offset, removed_length, inserted_text
+        )
+        return self.parse_tokens(self.tokens)
+
+    def parse_tokens(self, buffer: TokenBuffer) -> ProgramNode:
+        self.parsed_classes = 0
+        self.parsed_methods = 0
+        self.parsed_statements = 0
+        type_codes = buffer.types.tobytes()
+        try:
+            spans = split_program(type_codes)
+        except TokenSpanException:
+            return self.parse_everything(buffer)
+
+        texts = [
+            buffer.source[buffer.starts[start] : buffer.ends[end - 1]]
+            for _, start, end in spans
+        ]
+        # Subtrees of the last parse that go back into the tree as they are,
+        # at the first site with their text. Their nodes are claimed, so a
+        # reparsed class copies a cached method instead of sharing it.
+        reused_classes: dict = {}
+        reused_statements: dict = {}
+        self.claimed = set()
+        for (is_class, _, _), text in zip(spans, texts):
+            if is_class:
+                entry = self.class_cache.get(text)
+                if entry is not None and text not in reused_classes:
+                    reused_classes[text] = entry
+                    self.claimed.add(id(entry[0]))
+                    self.claimed.update(id(method) for _, method in entry[1])
+            else:
+                statement = self.statement_cache.get(text)
+                if statement is not None:
+                    reused_statements[text] = statement
+
+        class_cache: dict = {}
+        method_cache: dict = {}
+        statement_cache: dict = {}
+        class_defs = []
+        statements: list = []
+        for (is_class, start, end), text in zip(spans, texts):
+            if is_class:
+                if text in class_cache:
+                    # Same text as a class already in this tree
+                    class_defs.append(copy_node(class_cache[text][0]))
+                    continue
+                entry = reused_classes.get(text)
+                if entry is None:
+                    entry = self.parse_class(buffer, start, end, type_codes)
+                    if entry is None:
+                        return self.parse_everything(buffer)
+                class_cache[text] = entry
+                method_cache.update(entry[1])
+                class_defs.append(entry[0])
+            else:
+                if text in statement_cache:
+                    statements.append(copy_node(statement_cache[text]))
+                    continue
+                statement = reused_statements.get(text)
+                if statement is None:
+                    statement = self.parse_statement_span(buffer, start, end)
+                    if statement is None:
+                        return self.parse_everything(buffer)
+                    self.parsed_statements += 1
+                statement_cache[text] = statement
+                statements.append(statement)
+        self.claimed = set()
+        if not statements:
+            return self.parse_everything(buffer)
+
+        # Only what is in the current source is kept for the next parse
+        self.class_cache = class_cache
+        self.method_cache = method_cache
+        self.statement_cache = statement_cache
+        return ProgramNode(class_defs, statements)
+
+    # A cached method for a class being parsed, copied if it is already taken
+    def reuse_method(self, method: MethodDef) -> MethodDef:
+        if id(method) in self.claimed:
+            return copy_node(method)
+        self.claimed.add(id(method))
+        return method
+
+    def parse_class(self, buffer: TokenBuffer, start: int, end: int, type_codes: bytes):
+        parser = RegionParser(
+            TokenSlice(buffer, start, end),
+            type_codes,
+            self.method_cache,
+            self.reuse_method,
+        )
+        parser.next_token()  # Skip 'class'
+        class_def = self.finish(parser, parser.parse_classdef)
+        if class_def is None:
+            return None
+        self.parsed_classes += 1
+        self.parsed_methods += parser.parsed_methods
+        return class_def, parser.methods
+
+    def parse_statement_span(self, buffer: TokenBuffer, start: int, end: int):
+        parser = Parser(TokenSlice(buffer, start, end))
+        return self.finish(parser, parser.parse_statement)
+
+    # Runs one rule over a span. None if the span does not parse, or does not
+    # parse to its end, the caller then falls back to a full parse.
+    @staticmethod
+    def finish(parser: Parser, parse_rule):
+        try:
+            node = parse_rule()
+        except (ParserException, ParserParenthesisException, TokenSpanException):
+            return None
+        if parser.current_type != TokenType.EOF:
+            return None
+        return node
+
+    # Parses the whole buffer like the compiler does, so errors come out with
+    # the same message and location. The caches are left as they were.
+    def parse_everything(self, buffer: TokenBuffer) -> ProgramNode:
+        program = Parser(buffer, LineIndex(buffer.source)).parse_program()
+        self.parsed_classes = len(program.class_defs)
+        self.parsed_statements = len(program.statements)
+        self.parsed_methods = sum(
+            len(class_def.methods) for class_def in program.class_defs
+        )
+        return program
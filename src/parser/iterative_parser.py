@@ -0,0 +1,366 @@
+from src.parser.ast_nodes import *
+from src.parser.parser import (Parser, ParserException,
+                               ParserParenthesisException)
+from src.parser.parser_constants import *
+
+
+class IterativeParser(Parser):
+    # Same grammar and trees as Parser, but nesting never grows the Python
+    # stack. Every rule that can nest is a generator: where the recursive
+    # parser would call a sub-rule, the generator yields the sub-rule's
+    # generator instead and gets its result sent back. run() keeps the
+    # pending rules on a list, so the depth of the input is only bounded by
+    # memory. Rules that never nest (parameters, break) are reused as is.
+    def run(self, rule):
+        stack = [rule]
+        result = None
+        while True:
+            try:
+                sub_rule = stack[-1].send(result)
+            except StopIteration as finished:
+                stack.pop()
+                if not stack:
+                    return finished.value
+                result = finished.value
+            else:
+                stack.append(sub_rule)
+                result = None
+
+    # Entry points, each runs a whole rule to completion
+    def parse_program(self):
+        try:
+            return self.run(self.program_rule())
+        except (ParserException, ParserParenthesisException) as error:
+            self.locate_error(error)
+            raise
+
+    def parse_classdef(self):
+        return self.run(self.classdef_rule())
+
+    def parse_statement(self):
+        return self.run(self.statement_rule())
+
+    def parse_block(self):
+        return self.run(self.block_rule())
+
+    def parse_expression(self, min_precedence: int = EQUALITY_PRECEDENCE):
+        return self.run(self.expression_rule(min_precedence))
+
+    def parse_call(self):
+        return self.run(self.call_rule())
+
+    def parse_primary(self):
+        return self.run(self.primary_rule())
+
+    # Rules
+    def program_rule(self):
+        class_defs = []
+        statements = []
+
+        while self.current_type == TokenType.CLASS:
+            self.next_token()
+            class_defs.append((yield self.classdef_rule()))
+        while self.current_type != TokenType.EOF:
+            statements.append((yield self.statement_rule()))
+
+        if not statements:
+            raise ParserException("No statements provided.")
+        return self.factory.ProgramNode(class_defs, statements)
+
+    def classdef_rule(self):
+        extend_class_name = None
+        offset = self.current_offset
+        if self.current_type == TokenType.IDENTIFIER:
+            class_name = self.current_value
+            self.next_token()
+            if self.current_type == TokenType.EXTENDS:
+                self.next_token()
+                if self.current_type == TokenType.IDENTIFIER:
+                    extend_class_name = self.current_value
+                    self.next_token()
+            if self.current_type == TokenType.LEFT_BRACE:
+                self.next_token()
+                params = []
+                while self.current_type != TokenType.INIT:
+                    if self.current_type in TYPES:
+                        param_type = self.current_value
+                        self.next_token()
+                        if self.current_type == TokenType.IDENTIFIER:
+                            param_name = self.current_value
+                            self.next_token()
+                            if self.current_type == TokenType.SEMICOLON:
+                                self.next_token()
+                                params.append((param_type, param_name))
+                            else:
+                                raise ParserException(
+                                    "Missing semicolon from params in classdef"
+                                )
+                        else:
+                            raise ParserException()
+                    else:
+                        raise ParserException()
+                init_offset = self.current_offset
+                self.next_token()
+                class_constructor = yield self.constructor_rule()
+                self.located(class_constructor, init_offset)
+                methods = []
+                while self.current_type != TokenType.RIGHT_BRACE:
+                    if self.current_type == TokenType.DEF:
+                        self.next_token()
+                        methods.append((yield self.methoddef_rule()))
+                    else:
+                        raise ParserException(
+                            f"Expected 'def' or '}}' but found {self.current_type}"
+                        )
+                self.next_token()
+                class_def = self.factory.ClassDef(
+                    class_name, extend_class_name, params, class_constructor, methods
+                )
+                return self.located(class_def, offset)
+        raise ParserException("No identifier after class token.")
+
+    def constructor_rule(self):
+        if self.current_type != TokenType.LEFT_PAREN:
+            raise ParserException("No parens for init constructor")
+        self.next_token()
+        parameters = self.parse_comma_params()
+        if self.current_type != TokenType.LEFT_BRACE:
+            raise ParserException("Missing block for constructor")
+        self.next_token()
+        super_args = None
+        if self.current_type == TokenType.SUPER:
+            self.next_token()
+            if self.current_type != TokenType.LEFT_PAREN:
+                raise ParserException("No Parens on constructor")
+            self.next_token()
+            super_args = yield self.comma_exp_rule()
+            if self.current_type != TokenType.SEMICOLON:
+                raise ParserException("Missing semicolon on constructor")
+            self.next_token()
+        block = yield self.block_rule()
+        return self.factory.Constructor(parameters, super_args, block.stmts)
+
+    def methoddef_rule(self):
+        if self.current_type not in TYPES:
+            raise ParserException("No 'type' after def")
+        method_type = self.current_value
+        self.next_token()
+        if self.current_type != TokenType.IDENTIFIER:
+            raise ParserException("Invalid syntax")
+        method_name = self.current_value
+        offset = self.current_offset
+        self.next_token()
+        if self.current_type != TokenType.LEFT_PAREN:
+            raise ParserException("Missing parens on methoddef")
+        self.next_token()
+        parameters = self.parse_comma_params()
+        if self.current_type != TokenType.LEFT_BRACE:
+            raise ParserException("Couldn't find a block after method def attempt.")
+        self.next_token()
+        block = yield self.block_rule()
+        method = self.factory.MethodDef(
+            method_type, method_name, parameters, block.stmts
+        )
+        return self.located(method, offset)
+
+    def comma_exp_rule(self):
+        arguments = []
+        while self.current_type != TokenType.RIGHT_PAREN:
+            arguments.append((yield self.expression_rule()))
+            if self.current_type != TokenType.COMMA:
+                break
+            self.next_token()
+        if self.current_type != TokenType.RIGHT_PAREN:
+            raise ParserParenthesisException("Error! No closing parenthesis.")
+        self.next_token()
+        return arguments
+
+    def statement_rule(self):
+        offset = self.current_offset
+        statement = yield self.bare_statement_rule()
+        return self.located(statement, offset)
+
+    def bare_statement_rule(self):
+        token_type = self.current_type
+        if token_type in TYPES:
+            return (yield self.vardec_rule())
+        elif token_type == TokenType.IDENTIFIER:
+            following_type = self.lookahead_type()
+            if following_type == TokenType.ASSIGN:
+                return (yield self.assignment_rule())
+            elif following_type == TokenType.IDENTIFIER:
+                return (yield self.vardec_rule())
+        elif token_type == TokenType.WHILE:
+            return (yield self.while_rule())
+        elif token_type == TokenType.BREAK:
+            return self.parse_break()
+        elif token_type == TokenType.RETURN:
+            return (yield self.return_rule())
+        elif token_type == TokenType.IF:
+            return (yield self.if_rule())
+        elif token_type == TokenType.LEFT_BRACE:
+            self.next_token()
+            return (yield self.block_rule())
+        # Default case
+        exp = yield self.expression_rule()
+        if self.current_type != TokenType.SEMICOLON:
+            raise ParserException("Error! Missing semicolon on expression.")
+        self.next_token()
+        return self.factory.ExpressionStatement(exp)
+
+    def vardec_rule(self):
+        vardec_type = self.current_value
+        self.next_token()
+        if self.current_type != TokenType.IDENTIFIER:
+            raise ParserException("Error in variable declaration.")
+        vardec_id = self.current_value
+        self.next_token()
+        if self.current_type != TokenType.ASSIGN:
+            raise ParserException("Error in variable declaration.")
+        self.next_token()
+        vardec_val = yield self.expression_rule()
+        if self.current_type != TokenType.SEMICOLON:
+            raise ParserException("Missing semi colon in variable declaration.")
+        self.next_token()
+        return self.factory.VarDecStatement(vardec_type, vardec_id, vardec_val)
+
+    def assignment_rule(self):
+        assignment_var = self.current_value
+        self.next_token()
+        self.next_token()  # Skip '='
+        assignment_exp = yield self.expression_rule()
+        if self.current_type != TokenType.SEMICOLON:
+            raise ParserException("Error! Missing semi colon in assignment.")
+        self.next_token()
+        return self.factory.AssignmentStatement(assignment_var, assignment_exp)
+
+    def while_rule(self):
+        self.next_token()
+        if self.current_type != TokenType.LEFT_PAREN:
+            raise ParserException("Error! Missing left paren on while.")
+        self.next_token()
+        while_expression = yield self.expression_rule()
+        if self.current_type != TokenType.RIGHT_PAREN:
+            raise ParserException("Error! Missing right paren on while.")
+        self.next_token()
+        while_stmt = yield self.statement_rule()
+        return self.factory.WhileStatement(while_expression, while_stmt)
+
+    def return_rule(self):
+        self.next_token()
+        if self.current_type == TokenType.SEMICOLON:
+            self.next_token()
+            return self.factory.ReturnStatement()
+        return_exp = yield self.expression_rule()
+        if self.current_type != TokenType.SEMICOLON:
+            raise ParserException("Error! Missing semicolon from return.")
+        self.next_token()
+        return self.factory.ReturnStatement(return_exp)
+
+    def if_rule(self):
+        self.next_token()
+        if self.current_type != TokenType.LEFT_PAREN:
+            raise ParserParenthesisException("Error! Missing left paren on if.")
+        self.next_token()
+        if_expression = yield self.expression_rule()
+        if self.current_type != TokenType.RIGHT_PAREN:
+            raise ParserParenthesisException("Error! Missing right paren on if.")
+        self.next_token()
+        then_stmt = yield self.statement_rule()
+        if self.current_type == TokenType.ELSE:
+            self.next_token()
+            else_stmt = yield self.statement_rule()
+            return self.factory.IfStatement(if_expression, then_stmt, else_stmt)
+        return self.factory.IfStatement(if_expression, then_stmt)
+
+    def block_rule(self):
+        block_stmts = []
+        while self.current_type != TokenType.RIGHT_BRACE:
+            block_stmts.append((yield self.statement_rule()))
+        self.next_token()
+        return self.factory.BlockStatement(block_stmts)
+
+    def expression_rule(self, min_precedence: int = EQUALITY_PRECEDENCE):
+        left_expression = yield self.call_rule()
+        precedence = BINARY_PRECEDENCE.get(self.current_type)
+        while precedence is not None and precedence >= min_precedence:
+            operator = self.current_value
+            self.next_token()
+            right_expression = yield self.expression_rule(precedence + 1)
+            left_expression = self.factory.BinaryOpNode(
+                operator, left_expression, right_expression
+            )
+            precedence = BINARY_PRECEDENCE.get(self.current_type)
+        return left_expression
+
+    def call_rule(self):
+        offset = self.current_offset
+        obj_node = yield self.primary_rule()
+        while self.current_type == TokenType.DOT:
+            self.next_token()
+            if self.current_type != TokenType.IDENTIFIER:
+                raise ParserException("Error! Invalid method type.")
+            method_name = self.current_value
+            self.next_token()
+            if self.current_type != TokenType.LEFT_PAREN:
+                raise ParserParenthesisException("Error! Missing parenthesis.")
+            self.next_token()
+            arguments = yield self.comma_exp_rule()
+            obj_node = self.factory.CallNode(obj_node, method_name, arguments)
+            self.located(obj_node, offset)
+        return obj_node
+
+    def primary_rule(self):
+        token_type = self.current_type
+        if token_type == TokenType.INTEGER:
+            value = self.current_value
+            self.next_token()
+            return self.factory.IntegerNode(value)
+        elif token_type == TokenType.BOOLEAN:
+            value = self.current_value
+            self.next_token()
+            return self.factory.BooleanNode(value)
+        elif token_type == TokenType.IDENTIFIER:
+            value = self.current_value
+            self.next_token()
+            return self.factory.IdentifierNode(value)
+        elif token_type == TokenType.THIS:
+            self.next_token()
+            return self.factory.ThisNode()
+        elif token_type == TokenType.NEW:
+            offset = self.current_offset
+            self.next_token()
+            if self.current_type != TokenType.IDENTIFIER:
+                raise ParserException("Error! No class name after 'new'.")
+            class_name = self.current_value
+            self.next_token()
+            if self.current_type != TokenType.LEFT_PAREN:
+                raise ParserParenthesisException(
+                    "Error! No opening parenthesis on new class."
+                )
+            self.next_token()
+            arguments = yield self.comma_exp_rule()
+            return self.located(self.factory.NewNode(class_name, arguments), offset)
+        elif token_type == TokenType.PRINT:
+            self.next_token()
+            if self.current_type != TokenType.LEFT_PAREN:
+                raise ParserParenthesisException(
+                    "Error! Missing open parenthesis after print"
+                )
+            self.next_token()
+            inner_expression = yield self.expression_rule()
+            if self.current_type != TokenType.RIGHT_PAREN:
+                raise ParserParenthesisException("Error! Missing closing parenthesis.")
+            self.next_token()
+            return self.factory.PrintNode(inner_expression)
+        elif token_type == TokenType.LEFT_PAREN:
+            self.next_token()
+            inner_expression = yield self.expression_rule()
+            if self.current_type != TokenType.RIGHT_PAREN:
+                raise ParserParenthesisException("Error! Missing closing parenthesis.")
+            self.next_token()
+            return inner_expression
+        else:
+            raise ParserException(
+                f"Error! Unexpected invalid input: {self.current_value} of type {self.current_type}"
+            )
@@ -0,0 +1,105 @@
+from collections.abc import MutableSequence
+from typing import Optional, Union, cast
+
+from src.lexer.line_index import LineIndex
+from src.lexer.token_buffer import TokenBuffer
+from src.parser.parser import (Parser, ParserException,
+                               ParserParenthesisException)
+from src.parser.token_spans import TokenSpanException, closing_brace
+
+
+class LazyStatements(MutableSequence):
+    # Stands in for the statements list of a method or constructor. Holds the
+    # token range of the body and parses it the first time the list is read
+    # or changed. Syntax errors inside the body are raised at that point.
+    def __init__(
+        self,
+        tokens: Union[list, TokenBuffer],
+        start: int,
+        end: int,
+        line_index: Optional[LineIndex] = None,
+    ):
+        # Dropped once the body is parsed
+        self.tokens: Optional[Union[list, TokenBuffer]] = tokens
+        self.start = start
+        self.end = end  # Index of the closing '}'
+        self.line_index = line_index
+        self.statements: Optional[list] = None
+
+    @property
+    def is_parsed(self) -> bool:
+        return self.statements is not None
+
+    def materialize(self) -> list:
+        if self.statements is None:
+            parser = Parser(
+                cast(Union[list, TokenBuffer], self.tokens), self.line_index
+            )
+            parser.move_to(self.start)
+            statements = []
+            try:
+                while parser.position < self.end:
+                    statements.append(parser.parse_statement())
+                if parser.position != self.end:
+                    raise ParserException("Error! Statement runs past the body.")
+            except (ParserException, ParserParenthesisException) as error:
+                parser.locate_error(error)
+                raise
+            self.statements = statements
+            # The tokens are not needed anymore
+            self.tokens = None
+            self.line_index = None
+        return self.statements
+
+    def __len__(self) -> int:
+        return len(self.materialize())
+
+    def __getitem__(self, index):
+        return self.materialize()[index]
+
+    def __setitem__(self, index, value):
+        self.materialize()[index] = value
+
+    def __delitem__(self, index):
+        del self.materialize()[index]
+
+    def insert(self, index: int, value):
+        self.materialize().insert(index, value)
+
+    def __iter__(self):
+        return iter(self.materialize())
+
+    def __eq__(self, other):
+        return self.materialize() == other
+
+    def __repr__(self) -> str:
+        if self.statements is None:
+            return f"LazyStatements(tokens {self.start}-{self.end})"
+        return repr(self.statements)
+
+
+class LazyParser(Parser):
+    # Parses classes, constructors and method signatures, but skips method
+    # and constructor bodies by brace matching. Each body becomes a
+    # LazyStatements that is parsed on first use. Needs random access to the
+    # tokens, so a list or a TokenBuffer, not a TokenStream.
+    def __init__(
+        self,
+        tokens: Union[list, TokenBuffer],
+        line_index: Optional[LineIndex] = None,
+    ):
+        super().__init__(tokens, line_index)
+        if isinstance(tokens, TokenBuffer):
+            self.type_codes = tokens.types.tobytes()
+        else:
+            self.type_codes = bytes(token.type.value for token in tokens)
+
+    def parse_body(self):
+        try:
+            end = closing_brace(self.type_codes, self.position)
+        except TokenSpanException:
+            raise ParserException("Error! No closing brace on the body.")
+        statements = LazyStatements(self.tokens, self.position, end, self.line_index)
+        self.move_to(end)
+        self.next_token()  # Skip '}'
+        return statements
@@ -0,0 +1,88 @@
+from typing import Callable
+
+from src.parser.ast_nodes import *
+from src.parser.ast_serialization import NODE, NODE_CODES, NODE_SCHEMA, NODES
+
+# Expressions and statements. Declarations and the program are never shared.
+SHARED_CLASSES = [
+    node_class
+    for node_class, _ in NODE_SCHEMA
+    if not issubclass(node_class, (DeclarationNode, ProgramNode))
+]
+
+
+class NodeFactory:
+    # Makes the nodes for a Parser. Every node class is an attribute of the
+    # same name, the plain factory just hands out the classes themselves so
+    # parsing pays nothing for going through it.
+    shares_nodes = False
+
+    def __init__(self):
+        for node_class, _ in NODE_SCHEMA:
+            setattr(self, node_class.__name__, node_class)
+
+    # Only reached for names that are not node classes. Tells type checkers
+    # the attributes set above exist.
+    def __getattr__(self, name: str) -> Callable[..., Node]:
+        raise AttributeError(name)
+
+
+DEFAULT_FACTORY = NodeFactory()
+
+
+class HashConsingFactory(NodeFactory):
+    # Shares structurally identical expressions and statements: asking twice
+    # for the same node gives back the same object. Children are shared
+    # before their parents, so two nodes are equal exactly when they are the
+    # same object and a lookup only needs the identity of each child. Every
+    # node made here has its structural_hash set, which is equal for equal
+    # trees from any factory. Shared nodes must not be changed in place.
+    shares_nodes = True
+
+    def __init__(self):
+        super().__init__()
+        self.table: dict = {}
+        self.requested = 0  # Nodes asked for, shared or not
+        for node_class in SHARED_CLASSES:
+            setattr(self, node_class.__name__, self.consing(node_class))
+
+    def consing(self, node_class: type):
+        code, fields = NODE_CODES[node_class]
+        kinds = [kind for _, kind in fields]
+        table = self.table
+
+        def make(*arguments):
+            self.requested += 1
+            # Defaults of node arguments are all None
+            arguments += (None,) * (len(kinds) - len(arguments))
+            key = [node_class]
+            hashed = [code]
+            for kind, value in zip(kinds, arguments):
+                if value is None:
+                    key.append(None)
+                    hashed.append(None)
+                elif kind == NODE:
+                    key.append(value)
+                    hashed.append(value.structural_hash)
+                elif kind == NODES:
+                    key.append(tuple(value))
+                    hashed.append(tuple(item.structural_hash for item in value))
+                else:
+                    # Parameter lists are the only unhashable values
+                    value = tuple(value) if isinstance(value, list) else value
+                    key.append((type(value), value))
+                    hashed.append(value)
+            key = tuple(key)
+            node = table.get(key)
+            if node is None:
+                node = node_class(*arguments)
+                node.structural_hash = hash(tuple(hashed))
+                table[key] = node
+            return node
+
+        return make
+
+    @property
+    def shared(self) -> int:
+        # Nodes that were handed out again instead of being made
+        return self.requested - len(self.table)
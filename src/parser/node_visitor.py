@@ -0,0 +1,83 @@
+from src.parser.ast_nodes import *
+from src.parser.ast_serialization import NODE, NODE_CODES, NODES
+
+
+# (name, value) of every field of a node, in the order of its __init__
+def iter_fields(node: Node):
+    for name, _ in NODE_CODES[type(node)][1]:
+        yield name, getattr(node, name)
+
+
+# Direct children of a node, in field order
+def iter_child_nodes(node: Node):
+    for name, kind in NODE_CODES[type(node)][1]:
+        value = getattr(node, name)
+        if value is None:
+            continue
+        if kind == NODE:
+            yield value
+        elif kind == NODES:
+            yield from value
+
+
+class NodeVisitor:
+    # Base class of passes over the tree. visit(node) calls the method named
+    # visit_<node class name>, or the one of the nearest base class that has
+    # one (visit_StatementNode covers every statement), or generic_visit.
+    # The method for each node class is looked up once and kept in a table
+    # per visitor class, so a visit costs one dict lookup.
+    dispatch: dict = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.dispatch = {}
+
+    def visit(self, node: Node):
+        try:
+            method = self.dispatch[type(node)]
+        except KeyError:
+            method = self.resolve(type(node))
+        return method(self, node)
+
+    @classmethod
+    def resolve(cls, node_class: type):
+        method = cls.generic_visit
+        for base in node_class.__mro__:
+            found = getattr(cls, f"visit_{base.__name__}", None)
+            if found is not None:
+                method = found
+                break
+        cls.dispatch[node_class] = method
+        return method
+
+    # Visits every child, for node classes without a visit_ method
+    def generic_visit(self, node: Node):
+        for child in iter_child_nodes(node):
+            self.visit(child)
+
+
+class NodeTransformer(NodeVisitor):
+    # A visitor that rewrites the tree. Whatever visit returns replaces the
+    # visited node: None removes it from a list (or clears the field) and a
+    # list is spliced into the enclosing list. generic_visit rewrites the
+    # children of a node in place and returns the node. Nodes shared by a
+    # HashConsingFactory are rewritten everywhere they appear.
+    def generic_visit(self, node: Node):
+        for name, kind in NODE_CODES[type(node)][1]:
+            value = getattr(node, name)
+            if value is None:
+                continue
+            if kind == NODE:
+                setattr(node, name, self.visit(value))
+            elif kind == NODES:
+                items = []
+                for item in value:
+                    new_item = self.visit(item)
+                    if new_item is None:
+                        continue
+                    if isinstance(new_item, list):
+                        items.extend(new_item)
+                    else:
+                        items.append(new_item)
+                value[:] = items
+        return node
@@ -0,0 +1,124 @@
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Union
+
+from src.lexer.line_index import LineIndex
+from src.lexer.parallel_lexer import MIN_PARALLEL_SIZE, tokenize_parallel
+from src.lexer.token import TokenType
+from src.lexer.token_buffer import EOF_CODE, TokenBuffer
+from src.parser.ast_nodes import ProgramNode
+from src.parser.ast_serialization import deserialize_nodes, serialize_nodes
+from src.parser.parser import (Parser, ParserException,
+                               ParserParenthesisException)
+from src.parser.token_spans import TokenSpanException, split_program
+
+# More batches than workers, so a worker that finishes early takes another
+BATCHES_PER_WORKER = 4
+
+
+# Runs in a worker process. Parses a run of whole class definitions, or the
+# top-level statements after the last class, and returns them serialized.
+# Gets the chunk's text and its slice of the parent's token columns, so the
+# chunk is not lexed again. Offsets are made relative to the chunk here.
+# None if the chunk does not parse, the parent then reports the error.
+def parse_chunk(
+    chunk: Union[str, bytes],
+    types: array,
+    starts: array,
+    ends: array,
+    statements: bool,
+) -> Optional[bytes]:
+    base = starts[0] if starts else 0
+    buffer = TokenBuffer(chunk)
+    buffer.types = types
+    buffer.starts = array("q", [start - base for start in starts])
+    buffer.ends = array("q", [end - base for end in ends])
+    # Runs of classes end before the end of the input
+    if not types or types[-1] != EOF_CODE:
+        buffer.append(EOF_CODE, len(chunk), len(chunk))
+    try:
+        parser = Parser(buffer)
+        nodes = []
+        if statements:
+            while parser.current_type != TokenType.EOF:
+                nodes.append(parser.parse_statement())
+        else:
+            while parser.current_type == TokenType.CLASS:
+                parser.next_token()
+                nodes.append(parser.parse_classdef())
+            if parser.current_type != TokenType.EOF:
+                return None
+    except (ParserException, ParserParenthesisException):
+        return None
+    return serialize_nodes(nodes)
+
+
+# Groups consecutive class spans into about batch_count runs of similar size
+def batch_classes(class_spans: list, batch_count: int) -> list:
+    if not class_spans:
+        return []
+    total = class_spans[-1][1] - class_spans[0][0]
+    batches = [[class_spans[0][0], class_spans[0][1]]]
+    for start, end in class_spans[1:]:
+        batch = batches[-1]
+        if (batch[1] - batch[0]) * batch_count < total:
+            batch[1] = end
+        else:
+            batches.append([start, end])
+    return batches
+
+
+# Parses the class definitions of a program in worker processes, in batches
+# found by brace matching on the parent's tokens, and the statement tail as
+# one more job. Falls
+# back to a sequential parse (with its error messages) if anything fails.
+def parse_parallel(
+    text: Union[str, bytes], workers: int, min_size: int = MIN_PARALLEL_SIZE
+) -> ProgramNode:
+    buffer = tokenize_parallel(text, workers, min_size=min_size)
+    if workers <= 1 or len(text) < min_size:
+        return parse_sequential(text, buffer)
+    try:
+        spans = split_program(buffer.types.tobytes())
+    except TokenSpanException:
+        return parse_sequential(text, buffer)
+
+    class_spans = [(start, end) for is_class, start, end in spans if is_class]
+    # Token ranges of the jobs, the statement tail (with the EOF) last
+    ranges = batch_classes(class_spans, workers * BATCHES_PER_WORKER)
+    tail_start = class_spans[-1][1] if class_spans else 0
+    ranges.append([tail_start, len(buffer)])
+    chunks = []
+    for start, end in ranges:
+        chunks.append(text[buffer.starts[start] : buffer.ends[end - 1]])
+    kinds = [False] * (len(ranges) - 1) + [True]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(
+            pool.map(
+                parse_chunk,
+                chunks,
+                [buffer.types[start:end] for start, end in ranges],
+                [buffer.starts[start:end] for start, end in ranges],
+                [buffer.ends[start:end] for start, end in ranges],
+                kinds,
+            )
+        )
+    batches = []
+    for result in results:
+        if result is None:
+            # Parsed again for the error message and its location. A chunk
+            # of a program that parses as a whole always parses on its own.
+            parse_sequential(text, buffer)
+            raise ParserException("Error! Part of the program did not parse.")
+        batches.append(deserialize_nodes(result))
+
+    class_defs = [class_def for batch in batches[:-1] for class_def in batch]
+    statements = batches[-1]
+    if not statements:
+        return parse_sequential(text, buffer)
+    return ProgramNode(class_defs, statements)
+
+
+def parse_sequential(text: Union[str, bytes], buffer: TokenBuffer) -> ProgramNode:
+    return Parser(buffer, LineIndex(text)).parse_program()
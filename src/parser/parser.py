@@ -1,4 +1,10 @@
+from typing import Optional, Protocol, Union
+
+from src.lexer.line_index import LineIndex
+from src.lexer.token import Token, TokenType
+from src.lexer.token_buffer import TOKEN_TYPES, TokenBuffer
 from src.parser.ast_nodes import *
+from src.parser.node_factory import DEFAULT_FACTORY, NodeFactory
 from src.parser.parser_constants import *
 
 
@@ -10,27 +16,121 @@ class ParserException(Exception):
     pass
 
 
+# Anything the parser can read tokens from by index
+class TokenSequence(Protocol):
+    def __getitem__(self, index: int) -> Token: ...
+
+
 class Parser:
-    def __init__(self, tokens: list):
+    current_type: TokenType
+    current_token: Token  # Not kept up to date when reading a TokenBuffer
+
+    # tokens can be a list from Lexer.tokenize, a TokenStream or a TokenBuffer,
+    # the parser only indexes forward and never needs the total length. On a
+    # TokenBuffer types are read from the type codes and values only when
+    # used, without building Tokens. Nodes are made by the factory, a
+    # HashConsingFactory shares repeated subtrees. Given an offsets dict, the
+    # parser fills it with the source offset where each class, constructor,
+    # method, statement, call and 'new' starts (a method's is that of its
+    # name), for source maps. Nodes themselves carry no offsets, the dict is
+    # keyed by node, so it cannot be used with a factory that shares nodes.
+    def __init__(
+        self,
+        tokens: TokenSequence,
+        line_index: Optional[LineIndex] = None,
+        factory: Optional[NodeFactory] = None,
+        offsets: Optional[dict] = None,
+    ):
         self.tokens = tokens
+        self.buffer = tokens if isinstance(tokens, TokenBuffer) else None
         self.position = 0
-        self.current_token = tokens[0] if tokens else None
+        if tokens:
+            self.move_to(0)
+        else:
+            # Reads as if it only held the end of the input
+            self.current_token = Token(TokenType.EOF, None)
+            self.current_type = TokenType.EOF
+        self.line_index = line_index
+        self.factory = factory if factory is not None else DEFAULT_FACTORY
+        if offsets is not None and self.factory.shares_nodes:
+            # A shared node stands for several places in the source
+            raise ValueError("Offsets cannot be recorded for shared nodes.")
+        self.offsets = offsets
 
     # Helper Functions
     def next_token(self):
-        if self.position < len(self.tokens) - 1:
+        if self.current_type != TokenType.EOF:
             self.position += 1
-            self.current_token = self.tokens[self.position]
+            if self.buffer is None:
+                self.current_token = self.tokens[self.position]
+                self.current_type = self.current_token.type
+            else:
+                self.current_type = TOKEN_TYPES[self.buffer.types[self.position]]
+
+    def move_to(self, position: int):
+        self.position = position
+        if self.buffer is None:
+            self.current_token = self.tokens[position]
+            self.current_type = self.current_token.type
+        else:
+            self.current_type = self.buffer.type_at(position)
+
+    @property
+    def current_value(self) -> Union[int, bool, str, None]:
+        if self.buffer is None:
+            return self.current_token.value
+        return self.buffer.value_at(self.position)
+
+    # Only looked up when offsets are being recorded
+    @property
+    def current_offset(self) -> Optional[int]:
+        if self.offsets is None:
+            return None
+        if self.buffer is None:
+            return self.current_token.offset
+        return self.buffer.starts[self.position]
+
+    # Records where the node starts in the source, if offsets are wanted
+    def located(self, node: Node, offset: Optional[int]) -> Node:
+        if self.offsets is not None and offset is not None:
+            self.offsets[node] = offset
+        return node
+
+    def lookahead_type(self, distance: int = 1) -> Optional[TokenType]:
+        position = self.position + distance
+        try:
+            if self.buffer is None:
+                return self.tokens[position].type
+            return self.buffer.type_at(position)
+        except IndexError:
+            return None
+
+    # Adds the position of the current token to an error message. Line and
+    # column are only worked out here, once parsing has already failed.
+    def locate_error(self, error: Exception):
+        if self.buffer is None:
+            offset = self.current_token.offset
+        else:
+            offset = self.buffer.starts[self.position]
+        if offset is None or getattr(error, "offset", None) is not None:
+            return
+        error.offset = offset  # type: ignore[attr-defined]
+        if self.line_index is not None:
+            where = self.line_index.describe(offset)
+        else:
+            where = f"offset {offset}"
+        message = error.args[0] if error.args else "Syntax error."
+        error.args = (f"{message} (at {where})",)
 
     def parse_comma_exp(self):
         arguments = []
-        while self.current_token.type != TokenType.RIGHT_PAREN:
-            expression = self.parse_equality()
+        while self.current_type != TokenType.RIGHT_PAREN:
+            expression = self.parse_expression()
             arguments.append(expression)
-            if self.current_token.type != TokenType.COMMA:
+            if self.current_type != TokenType.COMMA:
                 break
             self.next_token()
-        if self.current_token.type == TokenType.RIGHT_PAREN:
+        if self.current_type == TokenType.RIGHT_PAREN:
             self.next_token()
             return arguments
         else:
@@ -38,15 +138,15 @@ class Parser:
 
     def parse_comma_params(self):
         parameters = []
-        while self.current_token.type != TokenType.RIGHT_PAREN:
-            if self.current_token.type in TYPES:
-                param_type = self.current_token.value
+        while self.current_type != TokenType.RIGHT_PAREN:
+            if self.current_type in TYPES:
+                param_type = self.current_value
                 self.next_token()
-                if self.current_token.type == TokenType.IDENTIFIER:
-                    param_name = self.current_token.value
+                if self.current_type == TokenType.IDENTIFIER:
+                    param_name = self.current_value
                     self.next_token()
                     parameters.append((param_type, param_name))
-                    if self.current_token.type != TokenType.COMMA:
+                    if self.current_type != TokenType.COMMA:
                         break
                     self.next_token()
                 else:
@@ -57,7 +157,7 @@ class Parser:
                 raise ParserException(
                     "Unexpected error when parsing parameters. No type provided."
                 )
-        if self.current_token.type == TokenType.RIGHT_PAREN:
+        if self.current_type == TokenType.RIGHT_PAREN:
             self.next_token()
             return parameters
         else:
@@ -65,17 +165,19 @@ class Parser:
 
     # Statements
     def parse_vardec(self):
-        vardec_type = self.current_token.value
+        vardec_type = self.current_value
         self.next_token()
-        if self.current_token.type == TokenType.IDENTIFIER:
-            vardec_id = self.current_token.value
+        if self.current_type == TokenType.IDENTIFIER:
+            vardec_id = self.current_value
             self.next_token()
-            if self.current_token.type == TokenType.ASSIGN:
+            if self.current_type == TokenType.ASSIGN:
                 self.next_token()
-                vardec_val = self.parse_equality()
-                if self.current_token.type == TokenType.SEMICOLON:
+                vardec_val = self.parse_expression()
+                if self.current_type == TokenType.SEMICOLON:
                     self.next_token()
-                    return VarDecStatement(vardec_type, vardec_id, vardec_val)
+                    return self.factory.VarDecStatement(
+                        vardec_type, vardec_id, vardec_val
+                    )
                 else:
                     raise ParserException("Missing semi colon in variable declaration.")
             else:
@@ -84,25 +186,25 @@ class Parser:
             raise ParserException("Error in variable declaration.")
 
     def parse_assignment(self):
-        assignment_var = self.current_token.value
+        assignment_var = self.current_value
         self.next_token()
         self.next_token()  # Skip '='
-        assignment_exp = self.parse_equality()
-        if self.current_token.type == TokenType.SEMICOLON:
+        assignment_exp = self.parse_expression()
+        if self.current_type == TokenType.SEMICOLON:
             self.next_token()
-            return AssignmentStatement(assignment_var, assignment_exp)
+            return self.factory.AssignmentStatement(assignment_var, assignment_exp)
         else:
             raise ParserException("Error! Missing semi colon in assignment.")
 
     def parse_while(self):
         self.next_token()
-        if self.current_token.type == TokenType.LEFT_PAREN:
+        if self.current_type == TokenType.LEFT_PAREN:
             self.next_token()
-            while_expression = self.parse_equality()
-            if self.current_token.type == TokenType.RIGHT_PAREN:
+            while_expression = self.parse_expression()
+            if self.current_type == TokenType.RIGHT_PAREN:
                 self.next_token()
                 while_stmt = self.parse_statement()
-                return WhileStatement(while_expression, while_stmt)
+                return self.factory.WhileStatement(while_expression, while_stmt)
             else:
                 raise ParserException("Error! Missing right paren on while.")
         else:
@@ -110,39 +212,39 @@ class Parser:
 
     def parse_break(self):
         self.next_token()
-        if self.current_token.type == TokenType.SEMICOLON:
+        if self.current_type == TokenType.SEMICOLON:
             self.next_token()
-            return BreakStatement()
+            return self.factory.BreakStatement()
         else:
             raise ParserException("Error! Missing semicolon from break.")
 
     def parse_return(self):
         self.next_token()
-        if self.current_token.type == TokenType.SEMICOLON:
+        if self.current_type == TokenType.SEMICOLON:
             self.next_token()
-            return ReturnStatement()
+            return self.factory.ReturnStatement()
         else:
-            return_exp = self.parse_equality()
-            if self.current_token.type == TokenType.SEMICOLON:
+            return_exp = self.parse_expression()
+            if self.current_type == TokenType.SEMICOLON:
                 self.next_token()
-                return ReturnStatement(return_exp)
+                return self.factory.ReturnStatement(return_exp)
             else:
                 raise ParserException("Error! Missing semicolon from return.")
 
     def parse_if(self):
         self.next_token()
-        if self.current_token.type == TokenType.LEFT_PAREN:
+        if self.current_type == TokenType.LEFT_PAREN:
             self.next_token()
-            if_expression = self.parse_equality()
-            if self.current_token.type == TokenType.RIGHT_PAREN:
+            if_expression = self.parse_expression()
+            if self.current_type == TokenType.RIGHT_PAREN:
                 self.next_token()
                 then_stmt = self.parse_statement()
-                if self.current_token.type == TokenType.ELSE:
+                if self.current_type == TokenType.ELSE:
                     self.next_token()
                     else_stmt = self.parse_statement()
-                    return IfStatement(if_expression, then_stmt, else_stmt)
+                    return self.factory.IfStatement(if_expression, then_stmt, else_stmt)
                 else:
-                    return IfStatement(if_expression, then_stmt)
+                    return self.factory.IfStatement(if_expression, then_stmt)
             else:
                 raise ParserParenthesisException("Error! Missing right paren on if.")
         else:
@@ -150,49 +252,58 @@ class Parser:
 
     def parse_block(self):
         block_stmts = []
-        while self.current_token.type != TokenType.RIGHT_BRACE:
+        while self.current_type != TokenType.RIGHT_BRACE:
             stmt = self.parse_statement()
             block_stmts.append(stmt)
         self.next_token()
-        return BlockStatement(block_stmts)
+        return self.factory.BlockStatement(block_stmts)
+
+    # Statements of a method or constructor body, up to and including the '}'
+    def parse_body(self):
+        return self.parse_block().stmts
 
     # Start Of Chain
     def parse_program(self):
-        class_defs = []
-        statements = []
+        try:
+            class_defs = []
+            statements = []
 
-        while self.current_token.type == TokenType.CLASS:
-            self.next_token()
-            class_defs.append(self.parse_classdef())
-        while self.current_token.type != TokenType.EOF:
-            statements.append(self.parse_statement())
+            while self.current_type == TokenType.CLASS:
+                self.next_token()
+                class_defs.append(self.parse_classdef())
+            while self.current_type != TokenType.EOF:
+                statements.append(self.parse_statement())
 
-        if not statements:
-            raise ParserException("No statements provided.")
-        return ProgramNode(class_defs, statements)
+            if not statements:
+                raise ParserException("No statements provided.")
+            return self.factory.ProgramNode(class_defs, statements)
+        except (ParserException, ParserParenthesisException) as error:
+            self.locate_error(error)
+            raise
 
     def parse_classdef(self):
         extend_class_name = None
-        if self.current_token.type == TokenType.IDENTIFIER:
-            class_name = self.current_token.value
+        offset = self.current_offset
+        if self.current_type == TokenType.IDENTIFIER:
+            class_name = self.current_value
             self.next_token()
-            if self.current_token.type == TokenType.EXTENDS:
+            if self.current_type == TokenType.EXTENDS:
                 self.next_token()
-                if self.current_token.type == TokenType.IDENTIFIER:
-                    extend_class_name = self.current_token.value
+                if self.current_type == TokenType.IDENTIFIER:
+                    extend_class_name = self.current_value
                     self.next_token()
-            if self.current_token.type == TokenType.LEFT_BRACE:
+            if self.current_type == TokenType.LEFT_BRACE:
                 # If not extending another class
                 self.next_token()
                 params = []
-                while self.current_token.type != TokenType.INIT:
-                    if self.current_token.type in TYPES:
-                        param_type = self.current_token.value
+                while self.current_type != TokenType.INIT:
+                    if self.current_type in TYPES:
+                        param_type = self.current_value
                         self.next_token()
-                        if self.current_token.type == TokenType.IDENTIFIER:
-                            param_name = self.current_token.value
+                        if self.current_type == TokenType.IDENTIFIER:
+                            param_name = self.current_value
                             self.next_token()
-                            if self.current_token.type == TokenType.SEMICOLON:
+                            if self.current_type == TokenType.SEMICOLON:
                                 self.next_token()
                                 params.append((param_type, param_name))
                             else:
@@ -203,68 +314,74 @@ class Parser:
                             raise ParserException()
                     else:
                         raise ParserException()
+                init_offset = self.current_offset
                 self.next_token()
-                class_constructor = self.parse_constructor()
+                class_constructor = self.located(self.parse_constructor(), init_offset)
                 methods = []
-                while self.current_token.type != TokenType.RIGHT_BRACE:
-                    if self.current_token.type == TokenType.DEF:
+                while self.current_type != TokenType.RIGHT_BRACE:
+                    if self.current_type == TokenType.DEF:
                         self.next_token()
                         method = self.parse_methoddef()
                         methods.append(method)
                     else:
                         raise ParserException(
-                            f"Expected 'def' or '}}' but found {self.current_token.type}"
+                            f"Expected 'def' or '}}' but found {self.current_type}"
                         )
                 self.next_token()
-                return ClassDef(
+                class_def = self.factory.ClassDef(
                     class_name, extend_class_name, params, class_constructor, methods
                 )
+                return self.located(class_def, offset)
         raise ParserException("No identifier after class token.")
 
     def parse_constructor(self):
-        if self.current_token.type == TokenType.LEFT_PAREN:
+        if self.current_type == TokenType.LEFT_PAREN:
             self.next_token()
             parameters = self.parse_comma_params()
-            if self.current_token.type == TokenType.LEFT_BRACE:
+            if self.current_type == TokenType.LEFT_BRACE:
                 self.next_token()
-                if self.current_token.type == TokenType.SUPER:
+                if self.current_type == TokenType.SUPER:
                     self.next_token()
-                    if self.current_token.type == TokenType.LEFT_PAREN:
+                    if self.current_type == TokenType.LEFT_PAREN:
                         self.next_token()
                         super_args = self.parse_comma_exp()
-                        if self.current_token.type == TokenType.SEMICOLON:
+                        if self.current_type == TokenType.SEMICOLON:
                             self.next_token()
-                            statements = self.parse_block().stmts
-                            return Constructor(parameters, super_args, statements)
+                            statements = self.parse_body()
+                            return self.factory.Constructor(
+                                parameters, super_args, statements
+                            )
                         else:
                             raise ParserException("Missing semicolon on constructor")
                     else:
                         raise ParserException("No Parens on constructor")
                 else:
                     super_args = None
-                    statements = self.parse_block().stmts
-                    return Constructor(parameters, super_args, statements)
+                    statements = self.parse_body()
+                    return self.factory.Constructor(parameters, super_args, statements)
             else:
                 raise ParserException("Missing block for constructor")
         else:
             raise ParserException("No parens for init constructor")
 
     def parse_methoddef(self):
-        if self.current_token.type in TYPES:
-            method_type = self.current_token.value
+        if self.current_type in TYPES:
+            method_type = self.current_value
             self.next_token()
-            if self.current_token.type == TokenType.IDENTIFIER:
-                method_name = self.current_token.value
+            if self.current_type == TokenType.IDENTIFIER:
+                method_name = self.current_value
+                offset = self.current_offset
                 self.next_token()
-                if self.current_token.type == TokenType.LEFT_PAREN:
+                if self.current_type == TokenType.LEFT_PAREN:
                     self.next_token()
                     parameters = self.parse_comma_params()
-                    if self.current_token.type == TokenType.LEFT_BRACE:
+                    if self.current_type == TokenType.LEFT_BRACE:
                         self.next_token()
-                        statements = self.parse_block().stmts
-                        return MethodDef(
+                        statements = self.parse_body()
+                        method = self.factory.MethodDef(
                             method_type, method_name, parameters, statements
                         )
+                        return self.located(method, offset)
                     else:
                         raise ParserException(
                             "Couldn't find a block after method def attempt."
@@ -278,144 +395,125 @@ class Parser:
             raise ParserException("No 'type' after def")
 
     def parse_statement(self):
-        if self.current_token.type in TYPES:
+        offset = self.current_offset
+        return self.located(self.parse_bare_statement(), offset)
+
+    def parse_bare_statement(self):
+        if self.current_type in TYPES:
             return self.parse_vardec()
-        elif self.current_token.type == TokenType.IDENTIFIER:
-            if (
-                self.position + 1 < len(self.tokens)
-                and self.tokens[self.position + 1].type == TokenType.ASSIGN
-            ):
+        elif self.current_type == TokenType.IDENTIFIER:
+            following_type = self.lookahead_type()
+            if following_type == TokenType.ASSIGN:
                 return self.parse_assignment()
-            elif (
-                self.position + 1 < len(self.tokens)
-                and self.tokens[self.position + 1].type == TokenType.IDENTIFIER
-            ):
+            elif following_type == TokenType.IDENTIFIER:
                 return self.parse_vardec()
-        elif self.current_token.type == TokenType.WHILE:
+        elif self.current_type == TokenType.WHILE:
             return self.parse_while()
-        elif self.current_token.type == TokenType.BREAK:
+        elif self.current_type == TokenType.BREAK:
             return self.parse_break()
-        elif self.current_token.type == TokenType.RETURN:
+        elif self.current_type == TokenType.RETURN:
             return self.parse_return()
-        elif self.current_token.type == TokenType.IF:
+        elif self.current_type == TokenType.IF:
             return self.parse_if()
-        elif self.current_token.type == TokenType.LEFT_BRACE:
+        elif self.current_type == TokenType.LEFT_BRACE:
             self.next_token()
             return self.parse_block()
         # Default case
-        exp = self.parse_equality()
-        if self.current_token.type == TokenType.SEMICOLON:
+        exp = self.parse_expression()
+        if self.current_type == TokenType.SEMICOLON:
             self.next_token()
-            return ExpressionStatement(exp)
+            return self.factory.ExpressionStatement(exp)
         else:
             raise ParserException("Error! Missing semicolon on expression.")
 
-    def parse_equality(self):
-        left_expression = self.parse_comparison()
-        while self.current_token.type in EQUAL_OPERATORS:
-            current_operator_token = self.current_token
+    # Precedence climbing over BINARY_PRECEDENCE. Parses operators binding at
+    # least as tight as min_precedence, the right operand of an operator only
+    # takes operators binding tighter than it (left associativity).
+    def parse_expression(self, min_precedence: int = EQUALITY_PRECEDENCE):
+        left_expression = self.parse_call()
+        precedence = BINARY_PRECEDENCE.get(self.current_type)
+        while precedence is not None and precedence >= min_precedence:
+            operator = self.current_value
             self.next_token()
-            right_expression = self.parse_comparison()
-            left_expression = BinaryOpNode(
-                current_operator_token.value, left_expression, right_expression
+            right_expression = self.parse_expression(precedence + 1)
+            left_expression = self.factory.BinaryOpNode(
+                operator, left_expression, right_expression
             )
+            precedence = BINARY_PRECEDENCE.get(self.current_type)
         return left_expression
 
+    # Entry points for each level of the grammar
+    def parse_equality(self):
+        return self.parse_expression(EQUALITY_PRECEDENCE)
+
     def parse_comparison(self):
-        left_expression = self.parse_addition()
-        while self.current_token.type in COMPARISON_OPERATORS:
-            current_operator_token = self.current_token
-            self.next_token()
-            right_expression = self.parse_addition()
-            left_expression = BinaryOpNode(
-                current_operator_token.value, left_expression, right_expression
-            )
-        return left_expression
+        return self.parse_expression(COMPARISON_PRECEDENCE)
 
     def parse_addition(self):
-        left_expression = self.parse_multiplication()
-        while (
-            self.current_token.type == TokenType.PLUS
-            or self.current_token.type == TokenType.MINUS
-        ):
-            current_operator_token = self.current_token
-            self.next_token()
-            right_expression = self.parse_multiplication()
-            left_expression = BinaryOpNode(
-                current_operator_token.value, left_expression, right_expression
-            )
-        return left_expression
+        return self.parse_expression(ADDITION_PRECEDENCE)
 
     def parse_multiplication(self):
-        left_expression = self.parse_call()
-        while (
-            self.current_token.type == TokenType.MULTIPLY
-            or self.current_token.type == TokenType.DIVIDE
-        ):
-            current_operator_token = self.current_token
-            self.next_token()
-            right_expression = self.parse_call()
-            left_expression = BinaryOpNode(
-                current_operator_token.value, left_expression, right_expression
-            )
-        return left_expression
+        return self.parse_expression(MULTIPLICATION_PRECEDENCE)
 
     def parse_call(self):
+        offset = self.current_offset
         obj_node = self.parse_primary()
-        while self.current_token.type == TokenType.DOT:
+        while self.current_type == TokenType.DOT:
             self.next_token()
-            if self.current_token.type == TokenType.IDENTIFIER:
-                method_name = self.current_token.value
+            if self.current_type == TokenType.IDENTIFIER:
+                method_name = self.current_value
                 self.next_token()
             else:
                 raise ParserException("Error! Invalid method type.")
-            if self.current_token.type == TokenType.LEFT_PAREN:
+            if self.current_type == TokenType.LEFT_PAREN:
                 self.next_token()
                 arguments = self.parse_comma_exp()
-                obj_node = CallNode(obj_node, method_name, arguments)
+                obj_node = self.factory.CallNode(obj_node, method_name, arguments)
+                self.located(obj_node, offset)
             else:
                 raise ParserParenthesisException("Error! Missing parenthesis.")
         return obj_node
 
     def parse_primary(self):
-        if self.current_token.type == TokenType.INTEGER:
-            value = self.current_token.value
+        if self.current_type == TokenType.INTEGER:
+            value = self.current_value
             self.next_token()
-            return IntegerNode(value)
-        elif self.current_token.type == TokenType.BOOLEAN:
-            value = self.current_token.value
+            return self.factory.IntegerNode(value)
+        elif self.current_type == TokenType.BOOLEAN:
+            value = self.current_value
             self.next_token()
-            return BooleanNode(value)
-        elif self.current_token.type == TokenType.IDENTIFIER:
-            value = self.current_token.value
+            return self.factory.BooleanNode(value)
+        elif self.current_type == TokenType.IDENTIFIER:
+            value = self.current_value
             self.next_token()
-            return IdentifierNode(value)
-        elif self.current_token.type == TokenType.THIS:
+            return self.factory.IdentifierNode(value)
+        elif self.current_type == TokenType.THIS:
             self.next_token()
-            return ThisNode()
-        elif self.current_token.type == TokenType.NEW:
+            return self.factory.ThisNode()
+        elif self.current_type == TokenType.NEW:
+            offset = self.current_offset
             self.next_token()
-            if self.current_token.type == TokenType.IDENTIFIER:
-                class_name = self.current_token.value
+            if self.current_type == TokenType.IDENTIFIER:
+                class_name = self.current_value
                 self.next_token()
             else:
                 raise ParserException("Error! No class name after 'new'.")
-            if self.current_token.type == TokenType.LEFT_PAREN:
+            if self.current_type == TokenType.LEFT_PAREN:
                 self.next_token()
                 arguments = self.parse_comma_exp()
-                return NewNode(class_name, arguments)
+                return self.located(self.factory.NewNode(class_name, arguments), offset)
             else:
                 raise ParserParenthesisException(
                     "Error! No opening parenthesis on new class."
                 )
-        elif self.current_token.type == TokenType.PRINT:
+        elif self.current_type == TokenType.PRINT:
             self.next_token()
-            if self.current_token.type == TokenType.LEFT_PAREN:
+            if self.current_type == TokenType.LEFT_PAREN:
                 self.next_token()
-                inner_expression = self.parse_equality()
-                if self.current_token.type == TokenType.RIGHT_PAREN:
+                inner_expression = self.parse_expression()
+                if self.current_type == TokenType.RIGHT_PAREN:
                     self.next_token()
-                    return PrintNode(inner_expression)
+                    return self.factory.PrintNode(inner_expression)
                 else:
                     raise ParserParenthesisException(
                         "Error! Missing closing parenthesis."
@@ -424,15 +522,15 @@ class Parser:
                 raise ParserParenthesisException(
                     "Error! Missing open parenthesis after print"
                 )
-        elif self.current_token.type == TokenType.LEFT_PAREN:
+        elif self.current_type == TokenType.LEFT_PAREN:
             self.next_token()
-            inner_expression = self.parse_equality()
-            if self.current_token.type == TokenType.RIGHT_PAREN:
+            inner_expression = self.parse_expression()
+            if self.current_type == TokenType.RIGHT_PAREN:
                 self.next_token()
                 return inner_expression
             else:
                 raise ParserParenthesisException("Error! Missing closing parenthesis.")
         else:
             raise ParserException(
-                f"Error! Unexpected invalid input: {self.current_token.value} of type {self.current_token.type}"
+                f"Error! Unexpected invalid input: {self.current_value} of type {self.current_type}"
             )
@@ -17,3 +17,23 @@ TYPES = {
     TokenType.BOOL_TYPE,
     TokenType.VOID_TYPE,
 }
+
+# Binding power of every binary operator, higher binds tighter. All binary
+# operators are left-associative. A new operator only needs a row here.
+EQUALITY_PRECEDENCE = 1
+COMPARISON_PRECEDENCE = 2
+ADDITION_PRECEDENCE = 3
+MULTIPLICATION_PRECEDENCE = 4
+
+BINARY_PRECEDENCE = {
+    TokenType.EQUAL: EQUALITY_PRECEDENCE,
+    TokenType.NOT_EQUAL: EQUALITY_PRECEDENCE,
+    TokenType.LESS_THAN: COMPARISON_PRECEDENCE,
+    TokenType.GREATER_THAN: COMPARISON_PRECEDENCE,
+    TokenType.LESS_EQUAL: COMPARISON_PRECEDENCE,
+    TokenType.GREATER_EQUAL: COMPARISON_PRECEDENCE,
+    TokenType.PLUS: ADDITION_PRECEDENCE,
+    TokenType.MINUS: ADDITION_PRECEDENCE,
+    TokenType.MULTIPLY: MULTIPLICATION_PRECEDENCE,
+    TokenType.DIVIDE: MULTIPLICATION_PRECEDENCE,
+}
@@ -0,0 +1,118 @@
+"""
+FINDS WHERE CLASSES, METHODS AND TOP-LEVEL STATEMENTS START AND END BY
+LOOKING AT TOKEN TYPES ONLY (BRACES, PARENS AND SEMICOLONS), WITHOUT PARSING.
+
+SPANS ARE HALF-OPEN RANGES OF TOKEN INDEXES INTO A TokenBuffer.
+"""
+
+import re
+
+from src.lexer.token import Token, TokenType
+from src.lexer.token_buffer import TokenBuffer
+
+CLASS_CODE = TokenType.CLASS.value
+ELSE_CODE = TokenType.ELSE.value
+SEMICOLON_CODE = TokenType.SEMICOLON.value
+LEFT_BRACE_CODE = TokenType.LEFT_BRACE.value
+RIGHT_BRACE_CODE = TokenType.RIGHT_BRACE.value
+LEFT_PAREN_CODE = TokenType.LEFT_PAREN.value
+RIGHT_PAREN_CODE = TokenType.RIGHT_PAREN.value
+EOF_CODE = TokenType.EOF.value
+
+OPENING_CODES = {LEFT_BRACE_CODE, LEFT_PAREN_CODE}
+CLOSING_CODES = {RIGHT_BRACE_CODE, RIGHT_PAREN_CODE}
+
+
+class TokenSpanException(Exception):
+    pass
+
+
+# Matches any brace in the bytes of TokenBuffer.types
+BRACE_PATTERN = re.compile(
+    re.escape(bytes([LEFT_BRACE_CODE])) + b"|" + re.escape(bytes([RIGHT_BRACE_CODE]))
+)
+
+
+# End of a braced body (class or method) whose header starts at start: one
+# past the brace closing the first '{' after start. types is the bytes of
+# TokenBuffer.types, so only the braces are visited.
+def block_end(types: bytes, start: int) -> int:
+    open_index = types.find(LEFT_BRACE_CODE, start)
+    if open_index < 0:
+        raise TokenSpanException("No '{' after the declaration.")
+    return closing_brace(types, open_index + 1) + 1
+
+
+# Index of the '}' closing a body whose '{' comes just before start
+def closing_brace(types: bytes, start: int) -> int:
+    depth = 1
+    for brace in BRACE_PATTERN.finditer(types, start):
+        if types[brace.start()] == LEFT_BRACE_CODE:
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return brace.start()
+    raise TokenSpanException("Unbalanced braces.")
+
+
+# End of the statement starting at start. A statement ends at a ';' or a '}'
+# that is not nested in parens or braces, unless an 'else' follows it.
+def statement_end(types: bytes, start: int) -> int:
+    index = start
+    depth = 0
+    while True:
+        code = types[index]
+        index += 1
+        if code in OPENING_CODES:
+            depth += 1
+            continue
+        if code in CLOSING_CODES:
+            depth -= 1
+            if depth < 0:
+                raise TokenSpanException("Unbalanced parens or braces.")
+            if depth > 0 or code == RIGHT_PAREN_CODE:
+                continue
+        elif code == EOF_CODE:
+            raise TokenSpanException("Statement runs into the end of the file.")
+        elif code != SEMICOLON_CODE or depth > 0:
+            continue
+        if types[index] != ELSE_CODE:
+            return index
+        index += 1
+
+
+# (is_class, start, end) for each class definition and each top-level
+# statement, in source order. The EOF token is not part of any span.
+def split_program(types: bytes) -> list:
+    spans = []
+    index = 0
+    while types[index] == CLASS_CODE:
+        end = block_end(types, index)
+        spans.append((True, index, end))
+        index = end
+    while types[index] != EOF_CODE:
+        end = statement_end(types, index)
+        spans.append((False, index, end))
+        index = end
+    return spans
+
+
+class TokenSlice:
+    # Indexes like a token list holding buffer[start:end] followed by an EOF
+    # token, so a Parser can parse one span on its own
+    def __init__(self, buffer: TokenBuffer, start: int, end: int):
+        self.buffer = buffer
+        self.start = start
+        self.end = end
+
+    def __len__(self) -> int:
+        return self.end - self.start + 1
+
+    def __getitem__(self, index: int) -> Token:
+        position = self.start + index
+        if position < self.end:
+            return self.buffer[position]
+        if position == self.end:
+            return Token(TokenType.EOF, None, self.buffer.starts[position])
+        raise IndexError("Read past the end of the token slice.")
@@ -8,6 +8,16 @@ MAKES TESTING EASIER BY RECURSIVELY CHECKING NESTED NODES.
 
 
 def nodes_equal(test_input: Node, test_output: Node):
+    # Shared subtrees from a HashConsingFactory are equal by identity, and
+    # trees with different structural hashes can't be equal
+    if test_input is test_output:
+        return True
+    input_hash = getattr(test_input, "structural_hash", None)
+    output_hash = getattr(test_output, "structural_hash", None)
+    if input_hash is not None and output_hash is not None:
+        if input_hash != output_hash:
+            return False
+
     # Early exit for invalid input
     if type(test_input) != type(test_output):
         return False
@@ -0,0 +1,130 @@
+import hashlib
+import marshal
+import os
+
+from benchmarks.program_generator import generate_program
+from src.compiler import load_or_parse
+from src.lexer.lexer import Lexer
+from src.lexer.mapped_source import map_source
+from src.parser.ast_cache import MAGIC, AstCache
+from src.parser.iterative_parser import IterativeParser
+from src.parser.parser import Parser
+from tests.helpers.nodes_equal import nodes_equal
+
+PROGRAM = generate_program(3)
+
+
+def parse(text: str):
+    return Parser(Lexer(text).tokenize()).parse_program()
+
+
+def test_miss_then_hit(tmp_path):
+    cache = AstCache(str(tmp_path))
+
+    assert cache.load(cache.key(PROGRAM)) is None
+    assert cache.store(cache.key(PROGRAM), parse(PROGRAM))
+    assert nodes_equal(cache.load(cache.key(PROGRAM)), parse(PROGRAM))
+
+
+def test_mapped_source_key(tmp_path):
+    cache = AstCache(str(tmp_path))
+    path = tmp_path / "program.pp"
+    path.write_text(PROGRAM)
+
+    with map_source(str(path)) as mapped:
+        assert cache.key(mapped) == cache.key(PROGRAM)
+
+
+def test_load_or_parse_hashes_source_once(tmp_path):
+    class CountingCache(AstCache):
+        keys = 0
+
+        def key(self, source):
+            CountingCache.keys += 1
+            return super().key(source)
+
+    cache = CountingCache(str(tmp_path))
+
+    load_or_parse(PROGRAM, cache)
+    assert CountingCache.keys == 1
+    assert nodes_equal(load_or_parse(PROGRAM, cache), parse(PROGRAM))
+    assert CountingCache.keys == 2
+
+
+def test_key_depends_on_content_and_version(tmp_path):
+    cache = AstCache(str(tmp_path))
+    other = AstCache(str(tmp_path))
+    other.version += b" next"
+
+    assert cache.key(PROGRAM) == cache.key(PROGRAM.encode("utf-8"))
+    assert cache.key(PROGRAM) != cache.key(PROGRAM + " ")
+    assert cache.key(PROGRAM) != other.key(PROGRAM)
+
+
+def test_corrupt_entries_are_misses_and_removed(tmp_path):
+    cache = AstCache(str(tmp_path))
+    path = cache.entry_path(cache.key(PROGRAM))
+    cache.store(cache.key(PROGRAM), parse(PROGRAM))
+    with open(path, "rb") as file:
+        data = file.read()
+
+    for corrupt in [
+        b"",
+        b"garbage",
+        data[:-10],
+        data[:-1] + bytes([data[-1] ^ 0xFF]),
+        MAGIC,
+    ]:
+        with open(path, "wb") as file:
+            file.write(corrupt)
+        assert cache.load(cache.key(PROGRAM)) is None
+        assert not os.path.exists(path)
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    sources = [f"x = {index};" for index in range(4)]
+    cache = AstCache(str(tmp_path))
+    for index, source in enumerate(sources[:3]):
+        cache.store(cache.key(source), parse(source))
+        path = cache.entry_path(cache.key(source))
+        os.utime(path, ns=(index * 10**9, index * 10**9))
+    entry_size = os.path.getsize(cache.entry_path(cache.key(sources[0])))
+
+    # Using the oldest entry makes the second one the least recently used
+    cache.load(cache.key(sources[0]))
+    cache.max_bytes = entry_size * 3
+    cache.store(cache.key(sources[3]), parse(sources[3]))
+
+    assert cache.load(cache.key(sources[1])) is None
+    for source in [sources[0], sources[2], sources[3]]:
+        assert cache.load(cache.key(source)) is not None
+
+
+def test_store_failure_is_not_fatal(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    cache = AstCache(str(blocker / "cache"))
+
+    assert not cache.store(cache.key(PROGRAM), parse(PROGRAM))
+    assert cache.load(cache.key(PROGRAM)) is None
+
+
+def test_deep_program_is_not_cached(tmp_path):
+    depth = 5000
+    source = "x = " + "(1 + " * depth + "1" + ")" * depth + ";"
+    cache = AstCache(str(tmp_path))
+
+    program = IterativeParser(Lexer(source).tokenize()).parse_program()
+    assert not cache.store(cache.key(source), program)
+    assert cache.entries() == []
+
+
+def test_wrong_payload_with_valid_checksum(tmp_path):
+    cache = AstCache(str(tmp_path))
+    path = cache.entry_path(cache.key(PROGRAM))
+    os.makedirs(str(tmp_path), exist_ok=True)
+
+    for payload in [marshal.dumps([(999,)]), marshal.dumps([(0, 1)]), b"\xff"]:
+        with open(path, "wb") as file:
+            file.write(MAGIC + hashlib.sha256(payload).digest() + payload)
+        assert cache.load(cache.key(PROGRAM)) is None
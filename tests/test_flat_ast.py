@@ -0,0 +1,103 @@
+from benchmarks.program_generator import generate_program
+from src.code_generator.code_generator import CodeGenerator
+from src.code_generator.flat_code_generator import FlatCodeGenerator
+from src.lexer.lexer import Lexer
+from src.parser.ast_nodes import *
+from src.parser.flat_ast import NO_NODE, FlatAst, flatten, unflatten
+from src.parser.iterative_parser import IterativeParser
+from src.parser.parser import Parser
+from tests.helpers.nodes_equal import nodes_equal
+
+PROGRAM = generate_program(4) + """
+if (a) { return; } else while (true) { break; }
+println(this.f(new A(), b));
+"""
+
+
+def parse(text: str):
+    return Parser(Lexer(text).tokenize()).parse_program()
+
+
+def test_round_trip():
+    program = parse(PROGRAM)
+
+    assert nodes_equal(unflatten(flatten(program)), program)
+
+
+def test_nodes_are_in_pre_order():
+    flat = flatten(parse("x = 1 + 2 * 3;"))
+
+    assert [flat.node_class(index) for index in range(len(flat))] == [
+        ProgramNode,
+        AssignmentStatement,
+        BinaryOpNode,
+        IntegerNode,
+        BinaryOpNode,
+        IntegerNode,
+        IntegerNode,
+    ]
+    for index in range(len(flat)):
+        assert all(child > index for child in flat.child_indexes(index))
+
+
+def test_field_access():
+    flat = flatten(parse("class A { int x; init() {} } A a = new A(1, 2);"))
+
+    class_def = flat.get(0, "class_defs")[0]
+    assert flat.get(class_def, "class_name") == "A"
+    assert flat.get(class_def, "extend_class_name") is None
+    assert flat.get(class_def, "class_instance_vars") == [("int", "x")]
+    constructor = flat.get(class_def, "constructor")
+    assert flat.get(constructor, "super_args") is None
+    new_node = flat.get(flat.get(0, "statements")[0], "val")
+    assert list(flat.child_indexes(new_node)) == list(flat.get(new_node, "arguments"))
+
+
+def test_names_are_stored_once():
+    flat = flatten(parse("x = x + x; y = x;"))
+
+    assert flat.payloads.count("x") == 1
+
+
+def test_analysis_over_kinds():
+    program = parse(PROGRAM)
+    flat = flatten(program)
+
+    calls = sum(1 for index in range(len(flat)) if flat.node_class(index) is CallNode)
+
+    assert calls == PROGRAM.count(".compute") + PROGRAM.count(".f(")
+
+
+def test_same_javascript_as_code_generator():
+    program = parse(PROGRAM)
+
+    assert FlatCodeGenerator().generate(flatten(program)) == CodeGenerator().visit(
+        program
+    )
+
+
+def test_bytes_round_trip():
+    flat = flatten(parse(PROGRAM))
+
+    copy = FlatAst.from_bytes(flat.to_bytes())
+
+    assert copy.kinds == flat.kinds and copy.operands == flat.operands
+    assert nodes_equal(unflatten(copy), parse(PROGRAM))
+
+
+def test_deep_tree_without_recursion():
+    depth = 50_000
+    text = "x = " + "(1 + " * depth + "1" + ")" * depth + ";"
+    program = IterativeParser(Lexer(text).tokenize()).parse_program()
+
+    flat = flatten(program)
+    code = FlatCodeGenerator().generate(flat)
+    rebuilt = unflatten(flat)
+
+    assert len(flat) == 2 * depth + 3
+    assert code == "x = " + "1 + " * depth + "1;"
+    node = rebuilt.statements[0].exp
+    for _ in range(depth):
+        node = node.right_child
+    assert isinstance(node, IntegerNode)
+    assert flat.operand(len(flat) - 1, 0) != NO_NODE
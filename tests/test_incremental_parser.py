@@ -0,0 +1,227 @@
+import pytest
+
+import src.compiler as compiler
+from benchmarks.program_generator import generate_program
+from src.lexer.lexer import Lexer, TokenizerExceptions
+from src.lexer.line_index import LineIndex
+from src.parser.incremental_parser import IncrementalParser, edit_range
+from src.parser.parser import Parser, ParserException
+from src.parser.token_spans import split_program
+from tests.helpers.nodes_equal import nodes_equal
+
+PROGRAM = generate_program(20)
+
+
+def full_parse(text: str):
+    return Parser(Lexer(text).tokenize()).parse_program()
+
+
+def replace_once(text: str, old: str, new: str, start: int = 0) -> str:
+    index = text.index(old, start)
+    return text[:index] + new + text[index + len(old) :]
+
+
+def test_edit_range():
+    assert edit_range("abcdef", "abXYef") == (2, 2, "XY")
+    assert edit_range("abc", "abc") == (3, 0, "")
+    assert edit_range("aaa", "aaaa") == (3, 0, "a")
+    assert edit_range("abc", "") == (0, 3, "")
+
+
+def test_split_program_spans():
+    text = "class A { init() { x = {}; } } if (a) { b; } else if (c) d; else { } e;"
+    buffer = Lexer(text).tokenize_buffer()
+
+    spans = split_program(buffer.types.tobytes())
+
+    assert [(is_class, buffer.text_at(start)) for is_class, start, _ in spans] == [
+        (True, "class"),
+        (False, "if"),
+        (False, "e"),
+    ]
+    assert spans[-1][2] == len(buffer) - 1
+
+
+def test_first_parse_matches_parser():
+    parser = IncrementalParser()
+
+    assert nodes_equal(parser.parse(PROGRAM), full_parse(PROGRAM))
+    assert parser.parsed_classes == 20
+
+
+def test_method_edit_reparses_one_class_and_one_method():
+    parser = IncrementalParser()
+    before = parser.parse(PROGRAM)
+    edited = replace_once(
+        PROGRAM, "floor_result + 1", "floor_result + 2", PROGRAM.index("class Class7")
+    )
+
+    after = parser.parse(edited)
+
+    assert nodes_equal(after, full_parse(edited))
+    assert parser.parsed_classes == 1
+    assert parser.parsed_methods == 1
+    assert parser.parsed_statements == 0
+    changed = [
+        index
+        for index, (old, new) in enumerate(zip(before.class_defs, after.class_defs))
+        if old is not new
+    ]
+    assert changed == [7]
+
+
+def test_edit_with_known_range():
+    parser = IncrementalParser()
+    parser.parse(PROGRAM)
+    offset = PROGRAM.index("compute0(3, ")
+
+    after = parser.edit(offset, len("compute0"), "compute4")
+
+    edited = PROGRAM[:offset] + "compute4" + PROGRAM[offset + len("compute0") :]
+    assert nodes_equal(after, full_parse(edited))
+    assert parser.parsed_classes == 0
+    assert parser.parsed_statements == 1
+
+
+def test_added_class_is_parsed_alone():
+    parser = IncrementalParser()
+    parser.parse(PROGRAM)
+    new_class = "class Extra { init() {} def int f() { return 1; } }\n"
+    edited = new_class + PROGRAM
+
+    after = parser.parse(edited)
+
+    assert nodes_equal(after, full_parse(edited))
+    assert parser.parsed_classes == 1
+
+
+def test_else_added_after_reused_statement():
+    parser = IncrementalParser()
+    parser.parse("if (a) x = 1; y = 2;")
+
+    after = parser.parse("if (a) x = 1; else y = 2;")
+
+    assert nodes_equal(after, full_parse("if (a) x = 1; else y = 2;"))
+
+
+def test_syntax_error_then_fix():
+    parser = IncrementalParser()
+    parser.parse(PROGRAM)
+    broken = replace_once(PROGRAM, "x = x - 1;", "x = x - 1")
+
+    with pytest.raises(ParserException) as error:
+        parser.parse(broken)
+    with pytest.raises(ParserException) as expected:
+        Parser(Lexer(broken).tokenize(), LineIndex(broken)).parse_program()
+    assert str(error.value) == str(expected.value)
+
+    # The failed parse left the cached subtrees alone
+    after = parser.parse(PROGRAM)
+    assert nodes_equal(after, full_parse(PROGRAM))
+    assert parser.parsed_classes == 0
+
+
+def test_whitespace_outside_spans_is_ignored():
+    parser = IncrementalParser()
+    parser.parse(PROGRAM)
+
+    after = parser.parse(f"\n\n{PROGRAM}   ")
+
+    assert nodes_equal(after, full_parse(PROGRAM))
+    assert parser.parsed_classes == 0
+    assert parser.parsed_statements == 0
+
+
+def test_lexer_error_keeps_previous_state():
+    parser = IncrementalParser()
+    parser.parse(PROGRAM)
+
+    with pytest.raises(TokenizerExceptions):
+        parser.parse(PROGRAM + "$")
+
+    assert nodes_equal(parser.parse(PROGRAM), full_parse(PROGRAM))
+    assert parser.parsed_classes == 0
+
+
+REPEATED = """class A {
+    init() {}
+    def int one() { return 1; }
+}
+class B {
+    init() {}
+    def int one() { return 1; }
+}
+class B {
+    init() {}
+    def int one() { return 1; }
+}
+x = 1;
+x = 1;
+"""
+
+
+def all_nodes(program) -> list:
+    nodes = [program, *program.class_defs, *program.statements]
+    for class_def in program.class_defs:
+        nodes.extend(class_def.methods)
+        nodes.extend(class_def.methods[0].statements)
+    nodes.extend(statement.exp for statement in program.statements)
+    return nodes
+
+
+def assert_no_shared_nodes(program):
+    nodes = all_nodes(program)
+    assert len({id(node) for node in nodes}) == len(nodes)
+
+
+def test_identical_sites_get_their_own_nodes():
+    parser = IncrementalParser()
+    before = parser.parse(REPEATED)
+    assert_no_shared_nodes(before)
+
+    # Class A is parsed again, its method is cached from class B
+    edited = replace_once(REPEATED, "class A {", "class C {")
+    after = parser.parse(edited)
+
+    assert nodes_equal(after, full_parse(edited))
+    assert parser.parsed_classes == 1
+    assert_no_shared_nodes(after)
+    assert after.class_defs[1] is before.class_defs[1]
+    assert after.statements[0] is before.statements[0]
+    assert after.class_defs[0].methods[0] is not after.class_defs[1].methods[0]
+    after.statements[1].exp.value = 2
+    assert after.statements[0].exp.value == 1
+
+
+@pytest.mark.parametrize("source_map", [False, True])
+def test_watch_file_passes_options_on(tmp_path, monkeypatch, source_map):
+    path = tmp_path / "program.pp"
+    path.write_text(PROGRAM)
+    runs = []
+
+    def stop(interval):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(compiler, "generate_and_run", lambda *args: runs.append(args))
+    monkeypatch.setattr(compiler.time, "sleep", stop)
+    compiler.watch_file(
+        str(path),
+        jobs=3,
+        style=compiler.MINIFY,
+        mangle_private=True,
+        source_map=source_map,
+    )
+
+    [(input_path, program, style, mangle_private, deep, jobs, mapping)] = runs
+    assert nodes_equal(program, full_parse(PROGRAM))
+    assert (input_path, style, mangle_private, deep, jobs) == (
+        str(path),
+        compiler.MINIFY,
+        True,
+        False,
+        3,
+    )
+    if source_map:
+        assert program.class_defs[0] in mapping.offsets
+    else:
+        assert mapping is None
@@ -0,0 +1,128 @@
+from pathlib import Path
+
+import pytest
+
+from benchmarks.program_generator import generate_expressions, generate_program
+from src.lexer.lexer import Lexer
+from src.parser.ast_nodes import *
+from src.parser.iterative_parser import IterativeParser
+from src.parser.parser import (Parser, ParserException,
+                               ParserParenthesisException)
+from tests.helpers.nodes_equal import nodes_equal
+
+DEPTH = 100_000
+
+TEST_FILES = sorted((Path(__file__).parent.parent / "test_files").glob("*.pp"))
+
+SOURCES = [
+    "x = 1 + 2 * (3 - y) / 4 >= 5 != false;",
+    "if (x < 1) { println(x); } else while (true) { break; }",
+    "int a = obj.method(1, b.c(), new D(2 + 3)).e();",
+    "return;",
+    generate_program(3),
+    generate_expressions(20),
+]
+
+
+def parse(parser_class, text: str):
+    return parser_class(Lexer(text).tokenize()).parse_program()
+
+
+@pytest.mark.parametrize("text", SOURCES)
+def test_same_tree_as_recursive_parser(text):
+    assert nodes_equal(parse(IterativeParser, text), parse(Parser, text))
+
+
+# The two parsers each spell out the grammar, so they are compared on every
+# example program, with the offsets they record and with each token left out
+@pytest.mark.parametrize("path", TEST_FILES, ids=lambda path: path.name)
+def test_same_results_on_test_files(path):
+    text = path.read_text()
+    tokens = Lexer(text).tokenize()
+    offsets: dict = {}
+    program = IterativeParser(tokens, offsets=offsets).parse_program()
+    expected_offsets: dict = {}
+    expected = Parser(tokens, offsets=expected_offsets).parse_program()
+
+    assert nodes_equal(program, expected)
+    assert sorted(offsets.values()) == sorted(expected_offsets.values())
+    for index in range(len(tokens) - 1):
+        assert_same_outcome(tokens[:index] + tokens[index + 1 :])
+
+
+def assert_same_outcome(tokens: list):
+    try:
+        expected = Parser(tokens).parse_program()
+    except (ParserException, ParserParenthesisException) as error:
+        with pytest.raises(error.__class__) as actual:
+            IterativeParser(tokens).parse_program()
+        assert str(actual.value) == str(error)
+    else:
+        assert nodes_equal(IterativeParser(tokens).parse_program(), expected)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "int x = ;",
+        "x = (1 + 2;",
+        "if x) {}",
+        "println 1;",
+        "class A { init() {} def int f() { return 1 } } f();",
+    ],
+)
+def test_same_error_as_recursive_parser(text):
+    with pytest.raises((ParserException, ParserParenthesisException)) as expected:
+        parse(Parser, text)
+    with pytest.raises(expected.type) as actual:
+        parse(IterativeParser, text)
+
+    assert str(actual.value) == str(expected.value)
+
+
+def test_deeply_nested_parentheses():
+    program = parse(IterativeParser, "x = " + "(" * DEPTH + "1" + ")" * DEPTH + ";")
+
+    assert nodes_equal(
+        program, ProgramNode([], [AssignmentStatement("x", IntegerNode(1))])
+    )
+
+
+def test_deeply_nested_binary_operators():
+    program = parse(IterativeParser, "1 + (" * DEPTH + "2" + ")" * DEPTH + ";")
+
+    node = program.statements[0].exp
+    for _ in range(DEPTH):
+        assert isinstance(node, BinaryOpNode) and node.left_child.value == 1
+        node = node.right_child
+    assert isinstance(node, IntegerNode) and node.value == 2
+
+
+def test_deeply_nested_blocks():
+    program = parse(IterativeParser, "{" * DEPTH + "x = 1;" + "}" * DEPTH)
+
+    node = program.statements[0]
+    for _ in range(DEPTH - 1):
+        assert isinstance(node, BlockStatement) and len(node.stmts) == 1
+        node = node.stmts[0]
+    assert nodes_equal(node, BlockStatement([AssignmentStatement("x", IntegerNode(1))]))
+
+
+def test_deeply_nested_if_and_while():
+    program = parse(IterativeParser, "if (a) while (b) " * DEPTH + "break;")
+
+    node = program.statements[0]
+    for _ in range(DEPTH):
+        assert isinstance(node, IfStatement) and node.else_stmt is None
+        assert isinstance(node.then_stmt, WhileStatement)
+        node = node.then_stmt.stmt
+    assert isinstance(node, BreakStatement)
+
+
+def test_entry_points_match_recursive_parser():
+    text = "a.b(c) * (d + 1)"
+
+    assert nodes_equal(
+        IterativeParser(Lexer(text).tokenize()).parse_expression(),
+        Parser(Lexer(text).tokenize()).parse_expression(),
+    )
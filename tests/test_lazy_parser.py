@@ -0,0 +1,93 @@
+import pytest
+
+from benchmarks.program_generator import generate_program
+from src.code_generator.code_generator import CodeGenerator
+from src.lexer.lexer import Lexer
+from src.lexer.line_index import LineIndex
+from src.parser.ast_nodes import *
+from src.parser.lazy_parser import LazyParser, LazyStatements
+from src.parser.parser import Parser, ParserException
+from tests.helpers.nodes_equal import nodes_equal
+
+PROGRAM = generate_program(5)
+
+
+@pytest.mark.parametrize("buffered", [False, True])
+def test_same_tree_as_parser(buffered):
+    lexer = Lexer(PROGRAM)
+    tokens = lexer.tokenize_buffer() if buffered else lexer.tokenize()
+
+    lazy = LazyParser(tokens).parse_program()
+
+    assert nodes_equal(lazy, Parser(Lexer(PROGRAM).tokenize()).parse_program())
+
+
+def test_same_javascript_as_parser():
+    lazy = LazyParser(Lexer(PROGRAM).tokenize_buffer()).parse_program()
+    eager = Parser(Lexer(PROGRAM).tokenize()).parse_program()
+
+    assert CodeGenerator().visit(lazy) == CodeGenerator().visit(eager)
+
+
+def test_bodies_are_parsed_on_first_use():
+    program = LazyParser(Lexer(PROGRAM).tokenize()).parse_program()
+    method = program.class_defs[0].methods[0]
+
+    # Signatures are there without touching any body
+    assert method.method_name == "compute0"
+    assert method.parameters == [("int", "i"), ("int", "j")]
+    assert isinstance(method.statements, LazyStatements)
+    assert not method.statements.is_parsed
+
+    assert isinstance(method.statements[0], VarDecStatement)
+    assert method.statements.is_parsed
+    assert not program.class_defs[0].methods[1].statements.is_parsed
+
+
+def test_constructor_with_super_call():
+    text = "class B extends A { init(int a) { super(a, 1); x = a; } } b;"
+
+    program = LazyParser(Lexer(text).tokenize()).parse_program()
+
+    constructor = program.class_defs[0].constructor
+    assert nodes_equal(constructor.super_args[1], IntegerNode(1))
+    assert nodes_equal(
+        constructor.statements[0], AssignmentStatement("x", IdentifierNode("a"))
+    )
+
+
+def test_nested_braces_in_body():
+    text = "class A { init() {} def int f() { if (a) { { b; } } return 1; } } a;"
+
+    program = LazyParser(Lexer(text).tokenize()).parse_program()
+
+    assert len(program.class_defs[0].methods[0].statements) == 2
+    assert nodes_equal(program, Parser(Lexer(text).tokenize()).parse_program())
+
+
+def test_body_errors_are_raised_on_use():
+    text = "class A { init() {} def int f() { return 1 } } a;"
+    tokens = Lexer(text).tokenize()
+
+    program = LazyParser(tokens, LineIndex(text)).parse_program()
+
+    with pytest.raises(ParserException) as error:
+        list(program.class_defs[0].methods[0].statements)
+    assert "line 1, column 44" in str(error.value)
+
+
+def test_missing_closing_brace():
+    with pytest.raises(ParserException):
+        LazyParser(Lexer("class A { init() {").tokenize()).parse_program()
+
+
+def test_lazy_statements_can_be_changed():
+    program = LazyParser(Lexer(PROGRAM).tokenize()).parse_program()
+    statements = program.class_defs[1].methods[2].statements
+    count = len(statements)
+
+    statements.append(BreakStatement())
+    del statements[0]
+
+    assert len(statements) == count
+    assert isinstance(statements[-1], BreakStatement)
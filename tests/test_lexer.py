@@ -1,3 +1,6 @@
+import subprocess
+import sys
+
 import pytest
 
 from src.lexer.lexer import Lexer, TokenizerExceptions
@@ -350,3 +353,87 @@ def test_this():
     assert len(tokens) == 2
     assert tokens[0].type == TokenType.THIS
     assert tokens[1].type == TokenType.EOF
+
+
+LEXER_ENGINE_PROGRAMS = [
+    "",
+    "   \n\t  ",
+    "int x = 3; bool y = true;",
+    "x<=y>=z!=w==v<u>t!s=r",
+    "while (x >= 1) { x = x - 1; floor_result = floor_result + 1; }",
+    "abc_123 123abc a1b2_c3",
+    "obj.method(42, true).other(new Foo(1, 2))",
+    """class Cat extends Animal {
+    int x;
+    init(int x) { super(x); }
+    def void speak() { return println(1); }
+}
+Animal cat = new Cat(3);
+cat.speak();""",
+]
+
+
+@pytest.mark.parametrize("program", LEXER_ENGINE_PROGRAMS)
+def test_regex_engine_matches_reference(program):
+    regex_tokens = Lexer(program, engine="regex").tokenize()
+    reference_tokens = Lexer(program, engine="reference").tokenize()
+
+    assert regex_tokens == reference_tokens
+
+
+@pytest.mark.parametrize("engine", ["regex", "reference"])
+def test_invalid_input_all_engines(engine):
+    with pytest.raises(TokenizerExceptions, match="Invalid character: '@'"):
+        Lexer("int x = 3 @ 4;", engine=engine).tokenize()
+
+
+def test_unknown_engine():
+    with pytest.raises(TokenizerExceptions):
+        Lexer("x", engine="turbo")
+
+
+NUMPY_ENGINE_PROGRAMS = LEXER_ENGINE_PROGRAMS + [
+    "x===y!==z<==w =<= >== !!= ====",
+    "12ab 3 ab_1 a__b 0 007",
+    "x\x1cy\x0bz",
+]
+
+
+@pytest.mark.parametrize("program", NUMPY_ENGINE_PROGRAMS)
+def test_numpy_engine_matches_reference(program):
+    pytest.importorskip("numpy")
+    numpy_tokens = Lexer(program, engine="numpy").tokenize()
+    reference_tokens = Lexer(program, engine="reference").tokenize()
+
+    assert numpy_tokens == reference_tokens
+    assert [token.offset for token in numpy_tokens] == [
+        token.offset for token in reference_tokens
+    ]
+
+
+@pytest.mark.parametrize("program", ["_x", "12_a", "x = 3 @ 4;", "a\n  #"])
+def test_numpy_engine_invalid_input(program):
+    pytest.importorskip("numpy")
+    with pytest.raises(TokenizerExceptions) as numpy_error:
+        Lexer(program, engine="numpy").tokenize()
+    with pytest.raises(TokenizerExceptions) as reference_error:
+        Lexer(program, engine="reference").tokenize()
+
+    assert str(numpy_error.value) == str(reference_error.value)
+
+
+def test_numpy_engine_bytes_and_unicode():
+    pytest.importorskip("numpy")
+    program = "int x = 1; while (x <= 10) { x = x + 1; }"
+
+    assert Lexer(program.encode("ascii"), engine="numpy").tokenize() == init_lexer(
+        program
+    )
+    # Non-ASCII text is lexed by the regex scan instead
+    assert Lexer("café = 1;", engine="numpy").tokenize() == init_lexer("café = 1;")
+
+
+def test_numpy_is_only_imported_by_the_numpy_engine():
+    check = "import sys, src.compiler; assert 'numpy' not in sys.modules"
+
+    assert subprocess.run([sys.executable, "-c", check]).returncode == 0
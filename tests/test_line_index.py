@@ -0,0 +1,67 @@
+import pytest
+
+from src.lexer.lexer import Lexer, TokenizerExceptions
+from src.lexer.line_index import LineIndex
+from src.parser.parser import Parser, ParserException
+
+
+def test_location_first_line():
+    index = LineIndex("int x = 3;")
+
+    assert index.location(0) == (1, 1)
+    assert index.location(4) == (1, 5)
+
+
+def test_location_later_lines():
+    index = LineIndex("a\nbc\n\nd")
+
+    assert index.location(1) == (1, 2)  # The newline belongs to its line
+    assert index.location(2) == (2, 1)
+    assert index.location(3) == (2, 2)
+    assert index.location(5) == (3, 1)
+    assert index.location(6) == (4, 1)
+
+
+def test_location_is_lazy():
+    index = LineIndex("a\nb")
+
+    assert index.line_starts is None
+    index.location(2)
+    assert list(index.line_starts) == [0, 2]
+
+
+def test_location_bytes_source():
+    index = LineIndex(b"x;\ny;")
+
+    assert index.describe(3) == "line 2, column 1"
+
+
+def test_token_offsets():
+    text = "int x =\n  42;"
+    tokens = Lexer(text).tokenize()
+    buffer = Lexer(text).tokenize_buffer()
+    reference = Lexer(text, engine="reference").tokenize()
+
+    assert [token.offset for token in tokens] == [0, 4, 6, 10, 12, 13]
+    assert [token.offset for token in buffer] == [0, 4, 6, 10, 12, 13]
+    assert [token.offset for token in reference] == [0, 4, 6, 10, 12, 13]
+
+
+@pytest.mark.parametrize("engine", ["regex", "reference"])
+def test_tokenizer_error_location(engine):
+    with pytest.raises(TokenizerExceptions, match="line 2, column 7"):
+        Lexer("x = 1;\ny = 2 $ 3;", engine=engine).tokenize()
+
+
+def test_parser_error_location():
+    text = "int x = 1;\nint y = 2\nx = y;"
+    parser = Parser(Lexer(text).tokenize(), LineIndex(text))
+
+    with pytest.raises(ParserException, match="line 3, column 1") as error:
+        parser.parse_program()
+    assert error.value.offset == 21
+
+
+def test_parser_error_offset_without_line_index():
+    with pytest.raises(ParserException, match="offset 9"):
+        Parser(Lexer("int x = 1").tokenize()).parse_program()
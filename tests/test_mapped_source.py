@@ -0,0 +1,92 @@
+import pytest
+
+from src.compiler import parse_source
+from src.lexer.lexer import Lexer, TokenizerExceptions
+from src.lexer.mapped_source import map_source, read_released, release_behind
+from src.parser.parser import Parser
+from tests.helpers.nodes_equal import nodes_equal
+
+PROGRAM = """class Counter {
+    int count;
+    init(int start) {}
+    def int next(int step) { return step + 1; }
+}
+Counter counter = new Counter(10);
+bool done = false;
+while (counter.next(1) <= 100) { break; }
+"""
+
+
+@pytest.fixture
+def source_path(tmp_path):
+    path = tmp_path / "program.pp"
+    path.write_text(PROGRAM)
+    return path
+
+
+def test_mapped_tokens_match_str_tokens(source_path):
+    with map_source(source_path) as mapped:
+        tokens = Lexer(mapped).tokenize()
+
+    assert tokens == Lexer(PROGRAM).tokenize()
+    assert [token.offset for token in tokens] == [
+        token.offset for token in Lexer(PROGRAM).tokenize()
+    ]
+
+
+def test_mapped_token_buffer(source_path):
+    with map_source(source_path) as mapped:
+        buffer = Lexer(mapped).tokenize_buffer()
+        assert list(buffer) == Lexer(PROGRAM).tokenize()
+        assert buffer.value_at(1) == "Counter"
+
+
+def test_mapped_parse(source_path):
+    with map_source(source_path) as mapped:
+        ast = parse_source(mapped)
+
+    assert nodes_equal(ast, Parser(Lexer(PROGRAM).tokenize()).parse_program())
+
+
+def test_mapped_empty_file(tmp_path):
+    path = tmp_path / "empty.pp"
+    path.write_text("")
+
+    with map_source(path) as mapped:
+        assert len(Lexer(mapped).tokenize()) == 1
+
+
+def test_mapped_invalid_input(tmp_path):
+    path = tmp_path / "invalid.pp"
+    path.write_bytes(b"int x = 1;\nx = \xc3\xa9;")
+
+    with pytest.raises(TokenizerExceptions, match="line 2, column 5"):
+        with map_source(path) as mapped:
+            parse_source(mapped)
+
+
+def test_reference_engine_rejects_bytes():
+    with pytest.raises(TokenizerExceptions):
+        Lexer(b"x", engine="reference")
+
+
+def test_release_behind_keeps_tokens(source_path):
+    with map_source(source_path) as mapped:
+        tokens = list(release_behind(Lexer(mapped).iter_tokens(), mapped, 1))
+
+    assert tokens == Lexer(PROGRAM).tokenize()
+
+
+def test_release_behind_plain_bytes():
+    source = PROGRAM.encode("ascii")
+    tokens = list(release_behind(Lexer(source).iter_tokens(), source))
+
+    assert tokens == Lexer(PROGRAM).tokenize()
+
+
+def test_read_released_returns_whole_source(source_path):
+    with map_source(source_path) as mapped:
+        chunks = list(read_released(mapped, 10))
+
+    assert b"".join(chunks) == PROGRAM.encode("ascii")
+    assert max(len(chunk) for chunk in chunks) == 10
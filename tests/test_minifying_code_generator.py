@@ -0,0 +1,130 @@
+import io
+import shutil
+import subprocess
+
+import pytest
+
+from src.code_generator.minifying_code_generator import (
+    MinifyingCodeGenerator, short_names)
+from src.code_generator.pretty_code_generator import PrettyCodeGenerator
+from src.compiler import MINIFY, write_javascript
+from src.lexer.lexer import Lexer
+from src.parser.parser import Parser
+
+PRIVATE = """
+class Counter {
+    init() {}
+    def int step(int amount, int times) {
+        int result = amount * times;
+        return result;
+    }
+    def int run(int amount) {
+        return this.step(amount, 2) + this.add(amount);
+    }
+    def int add(int amount) { return amount + 1; }
+}
+class Twice extends Counter {
+    init() { super(); }
+    def int add(int amount) { return amount + 2; }
+}
+Counter counter = new Counter();
+println(counter.run(5));
+println(new Twice().run(5));
+"""
+
+
+def parse(text: str):
+    return Parser(Lexer(text).tokenize()).parse_program()
+
+
+def minify(text: str, mangle_private: bool = False) -> str:
+    sink = io.StringIO()
+    MinifyingCodeGenerator(mangle_private).generate(parse(text), sink)
+    return sink.getvalue()
+
+
+def test_fizzbuzz():
+    assert minify(open("test_files/fizzbuzz.pp").read()) == (
+        "class Solution{constructor(){}fizzbuzz(a){let b=a/3;let c=0;"
+        "while(b>=1){b=b-1;c=c+1;}let d=a-c*3;if(d===0){b=a/5;c=0;"
+        "while(b>=1){b=b-1;c=c+1;}d=a-c*5;if(d===0){return console.log(10);}}"
+        "b=a/3;c=0;while(b>=1){b=b-1;c=c+1;}d=a-c*3;"
+        "if(d===0){return console.log(1);}b=a/5;c=0;while(b>=1){b=b-1;c=c+1;}"
+        "d=a-c*5;if(d===0){return console.log(0);}}}"
+        "solution=new Solution();solution.fizzbuzz(15);"
+    )
+
+
+def test_short_names_avoid_names_in_use():
+    # 'a' is a global used by the method, so the parameter can't become 'a'
+    js = minify("class A { init() {} def int f(int x) { return x + a; } } 1;")
+    assert "f(b){return b+a;}" in js
+
+
+def test_only_declared_names_are_renamed():
+    # The 'y' after the block is not the block's 'y' but a global
+    js = minify(
+        "class A { init() {} def int f(int x) { { int y = x; } return y; } } 1;"
+    )
+    assert "f(a){{let b=a;}return y;}" in js
+
+
+def test_top_level_names_are_kept():
+    assert minify("int x = 1; if (x) { int y = 2; } else x = 3;") == (
+        "let x=1;if(x){let y=2;}else x=3;"
+    )
+
+
+def test_constructor_locals():
+    js = minify(
+        "class A { init(int start) { int x = start; } } class B extends A "
+        "{ init(int start) { super(start + 1); } } 1;"
+    )
+    assert "constructor(a){let b=a;}" in js
+    assert "constructor(a){super(a+1);}" in js
+
+
+def test_mangle_private_methods():
+    # add and step are only called on 'this', run is called from outside
+    js = minify(PRIVATE, mangle_private=True)
+    assert "add" not in js and "step" not in js
+    assert "_a(a){return a+1;}" in js
+    assert "_a(a){return a+2;}" in js
+    assert "run(a){return this._b(a,2)+this._a(a);}" in js
+    # Without the option the names are kept
+    assert "this.step(a,2)" in minify(PRIVATE)
+
+
+def test_short_names():
+    names = short_names({"a", "c"})
+    assert [next(names) for _ in range(3)] == ["b", "d", "e"]
+    assert "do" not in [next(names) for _ in range(200)]
+
+
+def test_write_javascript():
+    sink = io.StringIO()
+    write_javascript(parse(PRIVATE), sink, MINIFY, mangle_private=True)
+    assert sink.getvalue() == minify(PRIVATE, mangle_private=True)
+
+
+def run_node(js: str) -> str:
+    result = subprocess.run(["node", "-e", js], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    return result.stdout
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+@pytest.mark.parametrize(
+    "source",
+    [
+        PRIVATE,
+        open("test_files/fizzbuzz.pp").read(),
+        open("test_files/test.pp").read(),
+    ],
+    ids=["private", "fizzbuzz", "test"],
+)
+def test_same_output_when_run(source):
+    sink = io.StringIO()
+    PrettyCodeGenerator().generate(parse(source), sink)
+
+    assert run_node(minify(source, mangle_private=True)) == run_node(sink.getvalue())
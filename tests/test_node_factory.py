@@ -0,0 +1,71 @@
+from pathlib import Path
+
+import pytest
+
+from benchmarks.program_generator import generate_program
+from src.code_generator.code_generator import CodeGenerator
+from src.lexer.lexer import Lexer
+from src.parser.ast_nodes import *
+from src.parser.iterative_parser import IterativeParser
+from src.parser.node_factory import HashConsingFactory
+from src.parser.parser import Parser
+from tests.helpers.nodes_equal import nodes_equal
+
+FIZZBUZZ = (Path(__file__).parent.parent / "test_files" / "fizzbuzz.pp").read_text()
+
+
+def parse(source: str, factory=None, parser_class=Parser):
+    return parser_class(Lexer(source).tokenize(), factory=factory).parse_program()
+
+
+def test_same_tree_as_plain_parser():
+    for source in [FIZZBUZZ, generate_program(5)]:
+        shared = parse(source, HashConsingFactory())
+        assert nodes_equal(shared, parse(source))
+        assert CodeGenerator().visit(shared) == CodeGenerator().visit(parse(source))
+
+
+def test_repeated_subtrees_are_shared():
+    factory = HashConsingFactory()
+    program = parse(FIZZBUZZ, factory)
+    statements = program.class_defs[0].methods[0].statements
+    # The first and last 'while (x >= 1) { ... }' loops of the method
+    first_loop = statements[2]
+    last_loop = statements[-3]
+    assert isinstance(first_loop, WhileStatement)
+    assert first_loop is last_loop
+    assert factory.shared > 0
+    assert len(factory.table) < factory.requested
+
+
+def test_different_subtrees_are_not_shared():
+    program = parse("1 + 2; 2 + 1; 1 + 2; true; 1;", HashConsingFactory())
+    first, second, third, boolean, integer = [s.exp for s in program.statements]
+    assert first is third
+    assert first is not second
+    assert first.structural_hash != second.structural_hash
+    # Same value, different node class
+    assert boolean is not integer
+
+
+def test_structural_hash_matches_across_factories():
+    source = "x = 1 * (2 + y); println(x);"
+    one = parse(source, HashConsingFactory())
+    other = parse(source, HashConsingFactory(), IterativeParser)
+    for left, right in zip(one.statements, other.statements):
+        assert left is not right
+        assert left.structural_hash == right.structural_hash
+        assert nodes_equal(left, right)
+
+
+def test_plain_parser_sets_no_hash():
+    program = parse("1 + 2;")
+    assert getattr(program.statements[0], "structural_hash", None) is None
+
+
+def test_no_offsets_for_shared_nodes():
+    tokens = Lexer("x = 1 + 2; y = 1 + 2;").tokenize()
+    with pytest.raises(ValueError):
+        Parser(tokens, factory=HashConsingFactory(), offsets={})
+    with pytest.raises(ValueError):
+        IterativeParser(tokens, factory=HashConsingFactory(), offsets={})
@@ -0,0 +1,93 @@
+import pytest
+
+from src.code_generator.code_generator import (CodeGenerator,
+                                               CodeGeneratorException)
+from src.lexer.lexer import Lexer
+from src.parser.ast_nodes import *
+from src.parser.node_visitor import (NodeTransformer, NodeVisitor,
+                                     iter_child_nodes)
+from src.parser.parser import Parser
+
+
+def parse(source: str) -> ProgramNode:
+    return Parser(Lexer(source).tokenize()).parse_program()
+
+
+class IdentifierCollector(NodeVisitor):
+    def __init__(self):
+        self.names = []
+
+    def visit_IdentifierNode(self, node: IdentifierNode):
+        self.names.append(node.value)
+
+
+class StatementCounter(NodeVisitor):
+    def __init__(self):
+        self.count = 0
+
+    # Covers every subclass of StatementNode
+    def visit_StatementNode(self, node: StatementNode):
+        self.count += 1
+        self.generic_visit(node)
+
+
+class ConstantFolder(NodeTransformer):
+    def visit_BinaryOpNode(self, node: BinaryOpNode):
+        self.generic_visit(node)
+        left, right = node.left_child, node.right_child
+        if isinstance(left, IntegerNode) and isinstance(right, IntegerNode):
+            if node.op == "+":
+                return IntegerNode(left.value + right.value)
+            if node.op == "*":
+                return IntegerNode(left.value * right.value)
+        return node
+
+
+class BreakRemover(NodeTransformer):
+    def visit_BreakStatement(self, node: BreakStatement):
+        return None
+
+
+def test_generic_visit_reaches_every_child():
+    collector = IdentifierCollector()
+    collector.visit(parse("int x = a + b.f(c, d); while (e) { y = g; }"))
+    assert collector.names == ["a", "b", "c", "d", "e", "g"]
+
+
+def test_dispatch_falls_back_to_base_classes():
+    counter = StatementCounter()
+    counter.visit(parse("while (true) { x = 1; if (x) { break; } }"))
+    # while, block, assignment, if, block, break
+    assert counter.count == 6
+    assert (
+        StatementCounter.dispatch[WhileStatement]
+        is StatementCounter.visit_StatementNode
+    )
+
+
+def test_dispatch_tables_are_per_class():
+    IdentifierCollector().visit(parse("x;"))
+    assert IdentifierNode in IdentifierCollector.dispatch
+    assert IdentifierCollector.dispatch is not StatementCounter.dispatch
+    assert IdentifierNode not in NodeVisitor.dispatch
+
+
+def test_transformer_replaces_nodes():
+    program = ConstantFolder().visit(parse("int x = 1 + 2 * 3; y = z + 1;"))
+    assert CodeGenerator().visit(program) == "let x = 7; y = z + 1;"
+
+
+def test_transformer_removes_nodes_from_lists():
+    program = BreakRemover().visit(parse("while (true) { x = 1; break; }"))
+    assert CodeGenerator().visit(program) == "while (true) { x = 1; }"
+
+
+def test_iter_child_nodes():
+    node = parse("if (a) { b; } else { c; }").statements[0]
+    children = list(iter_child_nodes(node))
+    assert children == [node.exp, node.then_stmt, node.else_stmt]
+
+
+def test_code_generator_rejects_unknown_nodes():
+    with pytest.raises(CodeGeneratorException):
+        CodeGenerator().visit(None)
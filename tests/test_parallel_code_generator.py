@@ -0,0 +1,112 @@
+import io
+
+import pytest
+
+from benchmarks.program_generator import generate_program
+from src.code_generator.code_generator import CodeGenerator
+from src.code_generator.minifying_code_generator import MinifyingCodeGenerator
+from src.code_generator.parallel_code_generator import (batch_ranges,
+                                                        generate_chunk,
+                                                        generate_parallel)
+from src.code_generator.pretty_code_generator import PrettyCodeGenerator
+from src.code_generator.stack_code_generator import (PrettyStackCodeGenerator,
+                                                     StackCodeGenerator)
+from src.code_generator.streaming_code_generator import StreamingCodeGenerator
+from src.lexer.lexer import Lexer
+from src.parser.ast_serialization import serialize_nodes
+from src.parser.parser import Parser
+
+PROGRAM = generate_program(12) + """
+if (object1.compute2(1, 2) != 0) { println(this); } else while (true) break;
+return;
+"""
+
+
+def parse(text: str):
+    return Parser(Lexer(text).tokenize()).parse_program()
+
+
+def sequential(program, generator_class) -> str:
+    sink = io.StringIO()
+    generator_class().generate(program, sink)
+    return sink.getvalue()
+
+
+def parallel(program, workers, generator_class, fork=True) -> str:
+    sink = io.StringIO()
+    generate_parallel(program, sink, workers, generator_class, 0, fork)
+    return sink.getvalue()
+
+
+def test_batch_ranges_keep_order_and_cover_all():
+    assert batch_ranges(10, 3) == [(0, 4), (4, 8), (8, 10)]
+    assert batch_ranges(2, 8) == [(0, 1), (1, 2)]
+
+
+def test_generate_chunk_returns_code_of_each_class():
+    program = parse(PROGRAM)
+
+    codes = generate_chunk(serialize_nodes(program.class_defs[:3]), PrettyCodeGenerator)
+
+    assert codes == [
+        sequential(class_def, PrettyCodeGenerator)
+        for class_def in program.class_defs[:3]
+    ]
+
+
+@pytest.mark.parametrize(
+    "generator_class",
+    [
+        StreamingCodeGenerator,
+        PrettyCodeGenerator,
+        StackCodeGenerator,
+        PrettyStackCodeGenerator,
+    ],
+)
+@pytest.mark.parametrize("workers", [2, 3])
+def test_parallel_matches_sequential(generator_class, workers):
+    program = parse(PROGRAM)
+
+    assert parallel(program, workers, generator_class) == sequential(
+        program, generator_class
+    )
+
+
+@pytest.mark.parametrize(
+    "generator_class", [StreamingCodeGenerator, PrettyCodeGenerator]
+)
+def test_parallel_with_serialized_batches(generator_class):
+    program = parse(PROGRAM)
+
+    assert parallel(program, 2, generator_class, fork=False) == sequential(
+        program, generator_class
+    )
+
+
+def test_parallel_matches_code_generator():
+    program = parse(PROGRAM)
+
+    assert parallel(program, 2, StreamingCodeGenerator) == CodeGenerator().visit(
+        program
+    )
+
+
+def test_parallel_without_statements_or_classes():
+    classes_only = parse(generate_program(3))
+    classes_only.statements = []
+    statements_only = parse("x = 1; println(x);")
+
+    for program in (classes_only, statements_only):
+        for generator_class in (StreamingCodeGenerator, PrettyCodeGenerator):
+            assert parallel(program, 2, generator_class) == sequential(
+                program, generator_class
+            )
+
+
+def test_minifying_generates_sequentially():
+    # Mangled names depend on the whole program, so no workers are used
+    program = parse(PROGRAM)
+
+    assert parallel(program, 2, MinifyingCodeGenerator) == sequential(
+        program, MinifyingCodeGenerator
+    )
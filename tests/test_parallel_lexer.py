@@ -0,0 +1,48 @@
+import pytest
+
+from src.lexer.lexer import Lexer, TokenizerExceptions
+from src.lexer.parallel_lexer import split_source, tokenize_parallel
+
+PROGRAM = "\n".join(
+    f"int value{index} = {index} * (value{index} + 1) <= {index};"
+    for index in range(200)
+)
+
+
+def test_split_source_cuts_at_whitespace():
+    boundaries = split_source(PROGRAM, 4)
+
+    assert boundaries[0] == 0
+    assert boundaries[-1] == len(PROGRAM)
+    assert boundaries == sorted(set(boundaries))
+    for boundary in boundaries[1:-1]:
+        assert PROGRAM[boundary].isspace()
+
+
+def test_split_source_without_whitespace():
+    assert split_source("abcdef", 3) == [0, 6]
+
+
+@pytest.mark.parametrize("workers", [2, 3])
+def test_parallel_matches_sequential(workers):
+    parallel = tokenize_parallel(PROGRAM, workers, min_size=0)
+    sequential = Lexer(PROGRAM).tokenize_buffer()
+
+    assert list(parallel.types) == list(sequential.types)
+    assert list(parallel.starts) == list(sequential.starts)
+    assert list(parallel.ends) == list(sequential.ends)
+    assert list(parallel) == list(sequential)
+
+
+def test_parallel_bytes_source():
+    source = PROGRAM.encode("ascii")
+    parallel = tokenize_parallel(source, 2, min_size=0)
+
+    assert list(parallel) == Lexer(PROGRAM).tokenize()
+
+
+def test_parallel_error_location():
+    text = PROGRAM + "\nint broken = @;"
+
+    with pytest.raises(TokenizerExceptions, match="line 201, column 14"):
+        tokenize_parallel(text, 2, min_size=0)
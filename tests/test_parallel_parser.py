@@ -0,0 +1,129 @@
+import marshal
+
+import pytest
+
+from benchmarks.program_generator import generate_program
+from src.lexer.lexer import Lexer
+from src.lexer.line_index import LineIndex
+from src.parser import parallel_parser
+from src.parser.ast_nodes import *
+from src.parser.ast_serialization import (deserialize_nodes, node_to_tuple,
+                                          serialize_nodes, tuple_to_node)
+from src.parser.parallel_parser import (batch_classes, parse_chunk,
+                                        parse_parallel)
+from src.parser.parser import Parser, ParserException
+from src.parser.token_spans import split_program
+from tests.helpers.nodes_equal import nodes_equal
+
+PROGRAM = generate_program(12) + """
+if (object1.compute2(1, 2) != 0) { println(this); } else while (true) break;
+return;
+"""
+
+
+def sequential_parse(text: str):
+    return Parser(Lexer(text).tokenize()).parse_program()
+
+
+def test_tuple_round_trip_covers_every_node():
+    program = sequential_parse(PROGRAM)
+
+    encoded = node_to_tuple(program)
+
+    assert marshal.loads(marshal.dumps(encoded)) == encoded
+    assert nodes_equal(tuple_to_node(encoded), program)
+
+
+def test_serialize_nodes_round_trip():
+    program = sequential_parse(PROGRAM)
+
+    nodes = deserialize_nodes(serialize_nodes(program.class_defs))
+
+    assert len(nodes) == 12
+    for node, expected in zip(nodes, program.class_defs):
+        assert nodes_equal(node, expected)
+
+
+def test_batch_classes_keeps_order_and_covers_all():
+    spans = [(index * 10, index * 10 + 10) for index in range(10)]
+
+    batches = batch_classes(spans, 3)
+
+    assert batches[0][0] == 0 and batches[-1][1] == 100
+    for (_, end), (start, _) in zip(batches, batches[1:]):
+        assert end == start
+    assert len(batches) == 3
+
+
+# A chunk and its token columns, as the parent hands them to a worker
+def chunk_of(text: str, start: int = 0, end=None) -> tuple:
+    buffer = Lexer(text).tokenize_buffer()
+    end = len(buffer) if end is None else end
+    chunk = text[buffer.starts[start] : buffer.ends[end - 1]]
+    return (
+        chunk,
+        buffer.types[start:end],
+        buffer.starts[start:end],
+        buffer.ends[start:end],
+    )
+
+
+def test_parse_chunk_rejects_bad_chunk():
+    assert parse_chunk(*chunk_of("class A { init() {} } x"), False) is None
+    assert parse_chunk(*chunk_of("x = ;"), True) is None
+
+
+def test_parse_chunk_of_tokens_mid_program():
+    buffer = Lexer(PROGRAM).tokenize_buffer()
+    spans = split_program(buffer.types.tobytes())
+    (_, start, _), _, (_, _, end) = spans[1:4]
+
+    result = parse_chunk(*chunk_of(PROGRAM, start, end), False)
+
+    expected = sequential_parse(PROGRAM).class_defs[1:4]
+    nodes = deserialize_nodes(result)
+    assert len(nodes) == 3
+    for node, class_def in zip(nodes, expected):
+        assert nodes_equal(node, class_def)
+
+
+@pytest.mark.parametrize("workers", [2, 3])
+def test_parallel_matches_sequential(workers):
+    program = parse_parallel(PROGRAM, workers, min_size=0)
+
+    assert nodes_equal(program, sequential_parse(PROGRAM))
+    assert len(program.class_defs) == 12
+
+
+def test_parallel_without_classes():
+    program = parse_parallel("x = 1; println(x);", 2, min_size=0)
+
+    assert nodes_equal(program, sequential_parse("x = 1; println(x);"))
+
+
+def test_parallel_reports_sequential_error():
+    broken = PROGRAM.replace("x = x - 1;", "x = x - ;", 1)
+
+    with pytest.raises(ParserException) as error:
+        parse_parallel(broken, 2, min_size=0)
+    with pytest.raises(ParserException) as expected:
+        Parser(Lexer(broken).tokenize(), LineIndex(broken)).parse_program()
+
+    assert str(error.value) == str(expected.value)
+
+
+def test_parallel_with_unbalanced_braces():
+    with pytest.raises(ParserException):
+        parse_parallel("class A { init() { } x = 1;", 2, min_size=0)
+
+
+# Stands in for parse_chunk in the workers, which are forked from the test
+def parse_nothing(chunk, types, starts, ends, statements):
+    return None
+
+
+def test_parallel_missing_result(monkeypatch):
+    monkeypatch.setattr(parallel_parser, "parse_chunk", parse_nothing)
+
+    with pytest.raises(ParserException, match="did not parse"):
+        parse_parallel(PROGRAM, 2, min_size=0)
@@ -26,7 +26,7 @@ def init_parser(text_input: str):
     #     print(f"TYPE: {result.var_type}, VAR: {result.var}, VAL: {result.val.value}")
 
     # Makes sure we are at the EOF token
-    if parser.current_token.type != TokenType.EOF:
+    if parser.current_type != TokenType.EOF:
         raise ParserException(
             f"Error! Did not find an EOF Token after the input. Current Token: {parser.current_token}"
         )
@@ -640,3 +640,81 @@ def test_class_type():
     expected = ProgramNode([], [VarDecStatement("Animal", "cat", NewNode("Cat", []))])
 
     assert nodes_equal(program, expected)
+
+
+def test_left_associative_operators():
+    program = init_parser("10 - 4 - 3;")
+
+    expected = ProgramNode(
+        [],
+        [
+            ExpressionStatement(
+                BinaryOpNode(
+                    "-", BinaryOpNode("-", IntegerNode(10), IntegerNode(4)), IntegerNode(3)
+                )
+            )
+        ],
+    )
+
+    assert nodes_equal(program, expected)
+
+
+def test_mixed_precedence_levels():
+    program = init_parser("a == b < c + d * e;")
+
+    expected = ProgramNode(
+        [],
+        [
+            ExpressionStatement(
+                BinaryOpNode(
+                    "==",
+                    IdentifierNode("a"),
+                    BinaryOpNode(
+                        "<",
+                        IdentifierNode("b"),
+                        BinaryOpNode(
+                            "+",
+                            IdentifierNode("c"),
+                            BinaryOpNode("*", IdentifierNode("d"), IdentifierNode("e")),
+                        ),
+                    ),
+                )
+            )
+        ],
+    )
+
+    assert nodes_equal(program, expected)
+
+
+def test_lower_precedence_after_higher():
+    program = init_parser("a * b + c != d;")
+
+    expected = ProgramNode(
+        [],
+        [
+            ExpressionStatement(
+                BinaryOpNode(
+                    "!=",
+                    BinaryOpNode(
+                        "+",
+                        BinaryOpNode("*", IdentifierNode("a"), IdentifierNode("b")),
+                        IdentifierNode("c"),
+                    ),
+                    IdentifierNode("d"),
+                )
+            )
+        ],
+    )
+
+    assert nodes_equal(program, expected)
+
+
+def test_nodes_have_no_instance_dict():
+    node_classes = [Node]
+    for node_class in node_classes:
+        node_classes.extend(node_class.__subclasses__())
+        assert node_class.__dictoffset__ == 0, node_class.__name__
+
+    node = BinaryOpNode("+", IntegerNode(1), IntegerNode(2))
+    with pytest.raises(AttributeError):
+        node.line = 1
@@ -0,0 +1,89 @@
+import io
+
+import jsbeautifier  # type: ignore
+import pytest
+
+from benchmarks.program_generator import generate_expressions, generate_program
+from src.code_generator.code_generator import CodeGenerator
+from src.code_generator.pretty_code_generator import PrettyCodeGenerator
+from src.compiler import write_javascript
+from src.lexer.lexer import Lexer
+from src.parser.parser import Parser
+
+STATEMENTS = """
+class A {
+    int x;
+    bool y;
+    init(int a, int b) { x = a; }
+    def int f() { }
+    def int g(int q) { if (q) return 1; else return 2; while (q) break; return; }
+}
+class B extends A { init() { super(1, 2); } def void h() { println(this.f()); } }
+class C extends A { int z; init() { super(); } }
+if (a) { b; } else if (c) { d; } else { e; }
+if (a) b; else c;
+if (a) b; else { c; }
+while (true) { if (x) { while (y) { break; } } }
+x = new A(1, new B()).f(2).g(a == b, c != d);
+{ x = 1; }
+"""
+
+
+def parse(text: str):
+    return Parser(Lexer(text).tokenize()).parse_program()
+
+
+def pretty(program) -> str:
+    sink = io.StringIO()
+    PrettyCodeGenerator().generate(program, sink)
+    return sink.getvalue()
+
+
+@pytest.mark.parametrize("name", ["test", "fizzbuzz"])
+def test_matches_test_files(name):
+    program = parse(open(f"test_files/{name}.pp").read())
+
+    assert pretty(program) == open(f"test_files/{name}.js").read()
+
+
+@pytest.mark.parametrize(
+    "source",
+    [STATEMENTS, generate_program(5), generate_expressions(30)],
+    ids=["statements", "program", "expressions"],
+)
+def test_same_layout_as_jsbeautifier(source):
+    program = parse(source)
+
+    assert pretty(program) == jsbeautifier.beautify(CodeGenerator().visit(program))
+
+
+def test_nested_indentation():
+    program = parse("while (a) { if (b) { c; } else { while (d) { e; } } }")
+
+    assert pretty(program) == "\n".join(
+        [
+            "while (a) {",
+            "    if (b) {",
+            "        c;",
+            "    } else {",
+            "        while (d) {",
+            "            e;",
+            "        }",
+            "    }",
+            "}",
+        ]
+    )
+
+
+def test_empty_bodies():
+    program = parse("class A { init() { } def void f() { } } { }")
+
+    assert pretty(program) == "class A {\n    constructor() {}\n    f() {}\n}\n{}"
+
+
+def test_is_the_default_output():
+    program = parse(STATEMENTS)
+    sink = io.StringIO()
+    write_javascript(program, sink)
+
+    assert sink.getvalue() == pretty(program)
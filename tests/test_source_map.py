@@ -0,0 +1,276 @@
+import io
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from src.code_generator.minifying_code_generator import MinifyingCodeGenerator
+from src.code_generator.pretty_code_generator import PrettyCodeGenerator
+from src.code_generator.source_map import (BASE64_DIGITS,
+                                           MappedMinifyingCodeGenerator,
+                                           MappedPrettyCodeGenerator,
+                                           MappedPrettyStackCodeGenerator,
+                                           MappedStackCodeGenerator,
+                                           MappedStreamingCodeGenerator,
+                                           PositionSink, SourceMap, encode_vlq)
+from src.code_generator.stack_code_generator import (PrettyStackCodeGenerator,
+                                                     StackCodeGenerator)
+from src.code_generator.streaming_code_generator import StreamingCodeGenerator
+from src.compiler import (JSBEAUTIFIER, MINIFY, generate_and_run,
+                          load_or_parse, write_javascript)
+from src.lexer.lexer import Lexer
+from src.lexer.line_index import LineIndex
+from src.parser.ast_cache import AstCache
+from src.parser.ast_nodes import *
+from src.parser.iterative_parser import IterativeParser
+from src.parser.parser import Parser
+
+SOURCE = """class Counter {
+    int count;
+    init(int start) {
+    }
+    def int boom(int x) {
+        int y = x + 1;
+        return this.missing(y);
+    }
+}
+Counter c = new Counter(1);
+println(1);
+if (true) { println(c.boom(2)); }
+"""
+
+GENERATORS = [
+    (StreamingCodeGenerator, MappedStreamingCodeGenerator),
+    (PrettyCodeGenerator, MappedPrettyCodeGenerator),
+    (StackCodeGenerator, MappedStackCodeGenerator),
+    (PrettyStackCodeGenerator, MappedPrettyStackCodeGenerator),
+    (MinifyingCodeGenerator, MappedMinifyingCodeGenerator),
+]
+
+
+def decode_vlq(digits: str) -> list:
+    values = []
+    value = shift = 0
+    for digit in digits:
+        bits = BASE64_DIGITS.index(digit)
+        value |= (bits & 31) << shift
+        shift += 5
+        if not bits & 32:
+            values.append(-(value >> 1) if value & 1 else value >> 1)
+            value = shift = 0
+    return values
+
+
+# (generated line, generated column, source line, source column), 0-based
+def decode_mappings(mappings: str) -> list:
+    decoded = []
+    source_line = source_column = 0
+    for line, segments in enumerate(mappings.split(";")):
+        column = 0
+        for segment in filter(None, segments.split(",")):
+            column_delta, source, line_delta, column_delta_in_source = decode_vlq(
+                segment
+            )
+            assert source == 0
+            column += column_delta
+            source_line += line_delta
+            source_column += column_delta_in_source
+            decoded.append((line, column, source_line, source_column))
+    return decoded
+
+
+def mapped(text: str, generator) -> tuple:
+    source_map = SourceMap("test.pp", LineIndex(text), file="test.js")
+    program = Parser(Lexer(text).tokenize(), offsets=source_map.offsets).parse_program()
+    sink = io.StringIO()
+    generator.generate_mapped(program, sink, source_map)
+    return sink.getvalue(), source_map
+
+
+def text_at(text: str, line: int, column: int) -> str:
+    return text.split("\n")[line][column:]
+
+
+def test_encode_vlq():
+    assert [encode_vlq(value) for value in (0, 1, -1, 15, 16, -17, 123)] == [
+        "A",
+        "C",
+        "D",
+        "e",
+        "gB",
+        "jB",
+        "2H",
+    ]
+    for value in (0, 5, -5, 1000, -123456):
+        assert decode_vlq(encode_vlq(value)) == [value]
+
+
+def test_position_sink_maps_marks_to_lines_and_columns(monkeypatch):
+    monkeypatch.setattr("src.code_generator.source_map.FLUSH_SIZE", 8)
+    sink = io.StringIO()
+    source_map = SourceMap("test.pp", LineIndex(""))
+    position = PositionSink(sink, source_map)
+
+    position.mark(1)
+    position.write("class A {")
+    position.mark(2)  # Past FLUSH_SIZE, the buffer is passed on
+    position.write("\n    ")
+    position.mark(3)
+    position.write("x;\n\n  y")
+    position.mark(4)
+    position.write("z")
+    position.flush()
+
+    assert source_map.mappings == [(0, 0, 1), (0, 9, 2), (1, 4, 3), (3, 3, 4)]
+    assert sink.getvalue() == "class A {\n    x;\n\n  yz"
+
+
+def test_position_sink_counts_utf16_units(monkeypatch):
+    monkeypatch.setattr("src.code_generator.source_map.FLUSH_SIZE", 4)
+    sink = io.StringIO()
+    source_map = SourceMap("test.pp", LineIndex(""))
+    position = PositionSink(sink, source_map)
+
+    # é is one UTF-16 unit, 𝒳 (outside the BMP) two
+    position.write("é𝒳 = ")
+    position.mark(1)
+    position.write("x;\n𝒳𝒳")
+    position.mark(2)
+    position.write("y")
+    position.mark(3)
+    position.flush()
+
+    assert source_map.mappings == [(0, 6, 1), (1, 4, 2), (1, 5, 3)]
+
+
+def test_non_ascii_names_are_mapped_in_utf16_units():
+    source = "int 𝒳 = 1;\nint é𝒳 = 2; println(é𝒳);"
+    code, source_map = mapped(source, MappedStreamingCodeGenerator())
+    decoded = decode_mappings(source_map.encode_mappings())
+
+    assert code == "let 𝒳 = 1; let é𝒳 = 2; console.log(é𝒳);"
+    assert decoded == [(0, 0, 0, 0), (0, 12, 1, 0), (0, 25, 1, 13)]
+
+
+def test_parser_records_where_nodes_start():
+    offsets: dict = {}
+    program = Parser(Lexer(SOURCE).tokenize(), offsets=offsets).parse_program()
+    class_def = program.class_defs[0]
+    method = class_def.methods[0]
+    returned = method.statements[1]
+
+    assert offsets[class_def] == SOURCE.index("Counter {")
+    assert offsets[class_def.constructor] == SOURCE.index("init")
+    assert offsets[method] == SOURCE.index("boom")
+    assert offsets[returned] == SOURCE.index("return")
+    assert offsets[returned.exp] == SOURCE.index("this.missing")
+    assert offsets[program.statements[0].val] == SOURCE.index("new Counter")
+    assert offsets[program.statements[2]] == SOURCE.index("if")
+    assert offsets[program.statements[2].then_stmt] == SOURCE.index("{ println")
+
+
+def test_iterative_parser_records_the_same_offsets():
+    offsets: dict = {}
+    iterative_offsets: dict = {}
+    Parser(Lexer(SOURCE).tokenize(), offsets=offsets).parse_program()
+    IterativeParser(Lexer(SOURCE).tokenize(), offsets=iterative_offsets).parse_program()
+
+    assert sorted(offsets.values()) == sorted(iterative_offsets.values())
+    assert len(offsets) == 13
+
+
+def test_parser_records_nothing_by_default():
+    parser = Parser(Lexer(SOURCE).tokenize())
+    parser.parse_program()
+
+    assert parser.offsets is None
+
+
+@pytest.mark.parametrize("generator_class, mapped_class", GENERATORS)
+def test_mapped_output_is_unchanged(generator_class, mapped_class):
+    program = Parser(Lexer(SOURCE).tokenize()).parse_program()
+    sink = io.StringIO()
+    generator_class().generate(program, sink)
+
+    code, source_map = mapped(SOURCE, mapped_class())
+
+    assert code == sink.getvalue()
+    assert len(source_map.mappings) == 13
+
+
+@pytest.mark.parametrize("generator_class, mapped_class", GENERATORS)
+def test_mappings_point_at_matching_code(generator_class, mapped_class):
+    code, source_map = mapped(SOURCE, mapped_class())
+    decoded = decode_mappings(json.loads(source_map.to_json())["mappings"])
+
+    assert len(decoded) == 13
+    starts = {
+        text_at(SOURCE, source_line, source_column)[:9]: text_at(code, line, column)
+        for line, column, source_line, source_column in decoded
+    }
+    assert starts["return th"].startswith("return")
+    assert starts["this.miss"].startswith("this.missing(")
+    assert starts["new Count"].startswith("new Counter(")
+    assert starts["boom(int "].startswith("boom(")
+    assert starts["init(int "].startswith("constructor(")
+    assert starts["Counter {"].startswith("class Counter")
+    assert starts["if (true)"].startswith("if")
+    assert starts["Counter c"].startswith("let c")
+
+
+def test_source_map_json():
+    _, source_map = mapped(SOURCE, MappedPrettyCodeGenerator())
+
+    assert json.loads(source_map.to_json()) == {
+        "version": 3,
+        "file": "test.js",
+        "sources": ["test.pp"],
+        "names": [],
+        "mappings": source_map.encode_mappings(),
+    }
+
+
+def test_mappings_on_skipped_lines_are_empty():
+    source_map = SourceMap("test.pp", LineIndex("a\nb"))
+    source_map.add(0, 4, 0)
+    source_map.add(3, 0, 2)
+
+    assert source_map.encode_mappings() == "IAAA;;;AACA"
+
+
+def test_jsbeautifier_output_cannot_be_mapped():
+    source_map = SourceMap("test.pp", LineIndex(SOURCE))
+    program = Parser(
+        Lexer(SOURCE).tokenize(), offsets=source_map.offsets
+    ).parse_program()
+
+    with pytest.raises(ValueError):
+        write_javascript(program, io.StringIO(), JSBEAUTIFIER, source_map=source_map)
+
+
+def test_cached_trees_are_not_used_for_source_maps(tmp_path):
+    cache = AstCache(str(tmp_path))
+    load_or_parse(SOURCE, cache)
+    offsets: dict = {}
+
+    load_or_parse(SOURCE, cache, offsets=offsets)
+
+    assert len(offsets) == 13
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+@pytest.mark.parametrize("style", ["pretty", "compact", MINIFY])
+def test_node_reports_errors_in_the_source(tmp_path, capsys, style):
+    input_path = tmp_path / "crash.pp"
+    input_path.write_text(SOURCE)
+    source_map = SourceMap("crash.pp", LineIndex(SOURCE), file="crash.js")
+    program = Parser(
+        Lexer(SOURCE).tokenize(), offsets=source_map.offsets
+    ).parse_program()
+
+    generate_and_run(str(input_path), program, style, source_map=source_map)
+
+    output = capsys.readouterr().out
+    assert f"{input_path}:7:16" in output
+    assert (tmp_path / "crash.js.map").exists()
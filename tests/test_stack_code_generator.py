@@ -0,0 +1,185 @@
+import io
+from pathlib import Path
+
+import pytest
+
+from benchmarks.program_generator import generate_expressions, generate_program
+from src.code_generator.code_generator import (CodeGenerator,
+                                               CodeGeneratorException)
+from src.code_generator.pretty_code_generator import PrettyCodeGenerator
+from src.code_generator.source_map import SourceMap
+from src.code_generator.stack_code_generator import (PrettyStackCodeGenerator,
+                                                     StackCodeGenerator)
+from src.compiler import COMPACT, JSBEAUTIFIER, PRETTY, write_javascript
+from src.lexer.lexer import Lexer
+from src.lexer.line_index import LineIndex
+from src.parser.ast_nodes import *
+from src.parser.iterative_parser import IterativeParser
+from src.parser.parser import Parser
+
+DEPTH = 100_000
+
+TEST_FILES = Path(__file__).parent.parent / "test_files"
+
+SOURCES = [
+    (TEST_FILES / "test.pp").read_text(),
+    (TEST_FILES / "fizzbuzz.pp").read_text(),
+    generate_program(3),
+    generate_expressions(20),
+    """
+    class B extends A { int x; int y; init(int a) { super(a, 2); x = a; } }
+    if (a) { return; } else while (true) { break; }
+    if (a) b; else if (c) { d; } else e;
+    println(this.f(new A(), b));
+    { }
+    """,
+]
+
+
+def parse(text: str, parser_class=Parser):
+    return parser_class(Lexer(text).tokenize()).parse_program()
+
+
+def pretty(program) -> str:
+    sink = io.StringIO()
+    PrettyStackCodeGenerator().generate(program, sink)
+    return sink.getvalue()
+
+
+class CountingStackCodeGenerator(StackCodeGenerator):
+    def __init__(self):
+        self.visits = 0
+
+    def visit(self, node):
+        self.visits += 1
+        return super().visit(node)
+
+
+class CountingSink(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+# Nodes expanded plus strings written, which is what the time is made of
+def operations(program) -> int:
+    generator = CountingStackCodeGenerator()
+    sink = CountingSink()
+    generator.generate(program, sink)
+    return generator.visits + sink.writes
+
+
+@pytest.mark.parametrize("text", SOURCES)
+def test_same_javascript_as_recursive_generators(text):
+    program = parse(text)
+
+    assert StackCodeGenerator().code(program) == CodeGenerator().visit(program)
+    sink = io.StringIO()
+    PrettyCodeGenerator().generate(program, sink)
+    assert pretty(program) == sink.getvalue()
+
+
+def test_long_operator_chain():
+    # Left-deep: every '+' is the left child of the next one
+    program = parse("x = " + " + ".join(["a"] * DEPTH) + ";")
+
+    with pytest.raises(RecursionError):
+        CodeGenerator().visit(program)
+    assert StackCodeGenerator().code(program) == (
+        "x = " + " + ".join(["a"] * DEPTH) + ";"
+    )
+
+
+def test_deeply_nested_blocks():
+    program = parse("{ " * DEPTH + "x = 1;" + " }" * DEPTH, IterativeParser)
+
+    assert StackCodeGenerator().code(program) == (
+        "{ " * DEPTH + "x = 1;" + " }" * DEPTH
+    )
+
+
+def test_deeply_indented_blocks():
+    # Indentation makes pretty output grow with the square of the depth
+    depth = 2000
+    program = parse("{ " * depth + "x = 1;" + " }" * depth, IterativeParser)
+
+    lines = pretty(program).split("\n")
+    assert len(lines) == 2 * depth + 1
+    assert lines[depth] == "    " * depth + "x = 1;"
+    assert lines[depth + 1] == "    " * (depth - 1) + "}"
+    assert lines[-1] == "}"
+
+
+def test_deeply_nested_statements():
+    program = parse("while (a) " * DEPTH + "if (b) c; else d;", IterativeParser)
+
+    assert pretty(program) == "while (a) " * DEPTH + "if (b) c;\nelse d;"
+
+
+@pytest.mark.parametrize(
+    "make_source",
+    [
+        lambda size: "x = " + " + ".join(["a"] * size) + ";",
+        lambda size: "{ " * size + "x = 1;" + " }" * size,
+        lambda size: "if (a) { b; } else " * size + "c;",
+    ],
+    ids=["operator chain", "nested blocks", "else-if chain"],
+)
+def test_work_grows_linearly(make_source):
+    small = parse(make_source(10_000), IterativeParser)
+    large = parse(make_source(40_000), IterativeParser)
+
+    # Four times the nodes: linear is at most 4x, quadratic would be 16x
+    assert operations(large) <= 4 * operations(small)
+
+
+@pytest.mark.parametrize("style", [PRETTY, COMPACT, JSBEAUTIFIER])
+def test_write_javascript_deep(style):
+    program = parse(SOURCES[4])
+    deep = io.StringIO()
+    write_javascript(program, deep, style, deep=True)
+    recursive = io.StringIO()
+    write_javascript(program, recursive, style)
+
+    assert deep.getvalue() == recursive.getvalue()
+
+
+@pytest.mark.parametrize("style", [PRETTY, COMPACT, JSBEAUTIFIER])
+def test_write_javascript_retries_too_deep_trees(style, tmp_path):
+    # Well past the recursion limit, small enough for jsbeautifier
+    program = parse("while (a) " * 5000 + "b;", IterativeParser)
+    expected = io.StringIO()
+    write_javascript(program, expected, style, deep=True)
+
+    path = tmp_path / "program.js"
+    with open(path, "w") as sink:
+        sink.write("// Generated\n")
+        write_javascript(program, sink, style)
+
+    assert path.read_text() == "// Generated\n" + expected.getvalue()
+
+
+def test_write_javascript_retries_with_source_map():
+    text = "while (a) " * 5000 + "b;"
+    offsets: dict = {}
+    program = IterativeParser(Lexer(text).tokenize(), offsets=offsets).parse_program()
+    maps = [SourceMap("program.pp", LineIndex(text)) for _ in range(2)]
+    for source_map in maps:
+        source_map.offsets = offsets
+    expected = io.StringIO()
+    write_javascript(program, expected, COMPACT, deep=True, source_map=maps[0])
+
+    sink = io.StringIO()
+    write_javascript(program, sink, COMPACT, source_map=maps[1])
+
+    assert sink.getvalue() == expected.getvalue()
+    assert maps[1].mappings == maps[0].mappings
+
+
+def test_rejects_unknown_nodes():
+    with pytest.raises(CodeGeneratorException):
+        StackCodeGenerator().code(ExpressionStatement(None))
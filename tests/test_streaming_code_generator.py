@@ -0,0 +1,91 @@
+import io
+
+import jsbeautifier  # type: ignore
+import pytest
+
+from benchmarks.program_generator import generate_expressions, generate_program
+from src.code_generator.code_generator import (CodeGenerator,
+                                               CodeGeneratorException)
+from src.code_generator.streaming_code_generator import StreamingCodeGenerator
+from src.compiler import COMPACT, JSBEAUTIFIER, write_javascript
+from src.lexer.lexer import Lexer
+from src.parser.ast_nodes import *
+from src.parser.parser import Parser
+
+PROGRAM = (
+    """
+class B extends A {
+    int x;
+    int y;
+    init(int a) { super(a, 2); x = a; }
+}
+"""
+    + generate_program(4)
+    + """
+if (a) { return; } else while (true) { break; }
+if (a == b) { return 1 + 2 * 3; }
+println(this.f(new A(), b));
+"""
+)
+
+
+def parse(text: str):
+    return Parser(Lexer(text).tokenize()).parse_program()
+
+
+def stream(node) -> str:
+    sink = io.StringIO()
+    StreamingCodeGenerator().generate(node, sink)
+    return sink.getvalue()
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        PROGRAM,
+        generate_expressions(50),
+        open("test_files/test.pp").read(),
+        open("test_files/fizzbuzz.pp").read(),
+    ],
+    ids=["program", "expressions", "test", "fizzbuzz"],
+)
+def test_same_javascript_as_code_generator(source):
+    program = parse(source)
+
+    assert stream(program) == CodeGenerator().visit(program)
+
+
+def test_single_nodes():
+    for node in [
+        ReturnStatement(),
+        BlockStatement([]),
+        NewNode("A", []),
+        BinaryOpNode("==", IntegerNode(1), BooleanNode(False)),
+    ]:
+        assert stream(node) == CodeGenerator().visit(node)
+
+
+def test_writes_to_a_file(tmp_path):
+    program = parse(PROGRAM)
+    path = tmp_path / "out.js"
+    with open(path, "w") as file:
+        StreamingCodeGenerator().generate(program, file)
+
+    assert path.read_text() == CodeGenerator().visit(program)
+
+
+def test_rejects_unknown_nodes():
+    with pytest.raises(CodeGeneratorException):
+        stream(ExpressionStatement(None))
+
+
+@pytest.mark.parametrize("style", [COMPACT, JSBEAUTIFIER])
+def test_write_javascript(style):
+    program = parse(PROGRAM)
+    sink = io.StringIO()
+    write_javascript(program, sink, style)
+
+    expected = CodeGenerator().visit(program)
+    if style == JSBEAUTIFIER:
+        expected = jsbeautifier.beautify(expected)
+    assert sink.getvalue() == expected
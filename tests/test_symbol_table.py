@@ -0,0 +1,62 @@
+from src.lexer.lexer import Lexer
+from src.lexer.symbol_table import SymbolTable
+from src.lexer.token import TokenType
+from src.parser.parser import Parser
+
+
+def test_intern_assigns_stable_ids():
+    symbols = SymbolTable()
+
+    assert symbols.intern("x") == 0
+    assert symbols.intern("y") == 1
+    assert symbols.intern("x") == 0
+    assert symbols.name(1) == "y"
+    assert len(symbols) == 2
+    assert "y" in symbols
+    assert "z" not in symbols
+
+
+def test_identifier_tokens_share_symbols():
+    lexer = Lexer("counter = counter + other; other = counter;")
+    tokens = lexer.tokenize()
+    identifiers = [token for token in tokens if token.type == TokenType.IDENTIFIER]
+
+    assert [token.symbol for token in identifiers] == [0, 0, 1, 1, 0]
+    assert identifiers[0].value is identifiers[1].value
+    assert identifiers[0].value is lexer.symbols.name(0)
+    assert lexer.symbols.names == ["counter", "other"]
+
+
+def test_keywords_are_not_interned():
+    lexer = Lexer("while (true) { break; }")
+    tokens = lexer.tokenize()
+
+    assert len(lexer.symbols) == 0
+    assert all(token.symbol is None for token in tokens)
+
+
+def test_buffer_interns_on_read():
+    lexer = Lexer("a b a")
+    buffer = lexer.tokenize_buffer()
+
+    assert len(lexer.symbols) == 0
+    assert [token.symbol for token in buffer][:3] == [0, 1, 0]
+    assert buffer[0].value is buffer[2].value
+
+
+def test_shared_table_across_lexers():
+    symbols = SymbolTable()
+    first = Lexer("alpha beta", symbols=symbols).tokenize()
+    second = Lexer("beta alpha", symbols=symbols).tokenize()
+
+    assert first[0].symbol == second[1].symbol
+    assert first[1].value is second[0].value
+
+
+def test_ast_identifiers_share_strings():
+    text = "int total = 1; total = total + 1;"
+    program = Parser(Lexer(text).tokenize()).parse_program()
+
+    declaration, assignment = program.statements
+    assert declaration.var is assignment.var
+    assert assignment.var is assignment.exp.left_child.value
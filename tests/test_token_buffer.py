@@ -0,0 +1,177 @@
+from array import array
+
+import pytest
+
+from src.lexer.lexer import Lexer, TokenizerExceptions
+from src.lexer.mapped_source import map_source
+from src.lexer.token import Token, TokenType
+from src.lexer.token_buffer import TokenBuffer
+from src.parser.parser import Parser
+from tests.helpers.nodes_equal import nodes_equal
+
+PROGRAM = """class Animal {
+    int legs;
+    init(int legs) {}
+    def bool speak(int volume) { return println(volume >= 10); }
+}
+Animal cat = new Animal(4);
+bool loud = false;
+cat.speak(12345 != 0 == true);"""
+
+
+def test_buffer_matches_token_list():
+    buffer = Lexer(PROGRAM).tokenize_buffer()
+    tokens = Lexer(PROGRAM).tokenize()
+
+    assert len(buffer) == len(tokens)
+    assert list(buffer) == tokens
+
+
+def test_buffer_storage_is_compact():
+    buffer = Lexer("x = 42;").tokenize_buffer()
+
+    assert isinstance(buffer.types, array)
+    assert list(buffer.types) == [
+        TokenType.IDENTIFIER.value,
+        TokenType.ASSIGN.value,
+        TokenType.INTEGER.value,
+        TokenType.SEMICOLON.value,
+        TokenType.EOF.value,
+    ]
+    assert list(buffer.starts) == [0, 2, 4, 6, 7]
+    assert list(buffer.ends) == [1, 3, 6, 7, 7]
+
+
+def test_buffer_values():
+    buffer = Lexer("false 007 true name <=").tokenize_buffer()
+
+    assert buffer.value_at(0) is False
+    assert buffer.value_at(1) == 7
+    assert buffer.value_at(2) is True
+    assert buffer.value_at(3) == "name"
+    assert buffer.value_at(4) == "<="
+    assert buffer.text_at(1) == "007"
+    assert buffer[5] == Token(TokenType.EOF, None)
+    assert buffer.type_at(-1) == TokenType.EOF
+
+
+def test_parser_on_buffer():
+    from_list = Parser(Lexer(PROGRAM).tokenize()).parse_program()
+    from_buffer = Parser(Lexer(PROGRAM).tokenize_buffer()).parse_program()
+
+    assert nodes_equal(from_list, from_buffer)
+
+
+def test_parser_on_buffer_builds_no_tokens(monkeypatch):
+    buffer = Lexer(PROGRAM).tokenize_buffer()
+
+    def no_tokens(self, index):
+        raise AssertionError("The parser built a Token.")
+
+    monkeypatch.setattr(TokenBuffer, "__getitem__", no_tokens)
+    offsets: dict = {}
+    from_buffer = Parser(buffer, offsets=offsets).parse_program()
+
+    list_offsets: dict = {}
+    from_list = Parser(Lexer(PROGRAM).tokenize(), offsets=list_offsets).parse_program()
+    assert nodes_equal(from_list, from_buffer)
+    assert sorted(offsets.values()) == sorted(list_offsets.values())
+
+
+def test_buffer_invalid_input():
+    with pytest.raises(TokenizerExceptions):
+        Lexer("x = #;").tokenize_buffer()
+
+
+RELEX_PROGRAM = """class Counter {
+    int count;
+    init(int start) {}
+    def int next(int step) { return step + 1; }
+}
+Counter counter = new Counter(10);
+while (counter.next(1) <= 100) { break; }
+"""
+
+
+def assert_same_buffer(left, right):
+    assert left.source == right.source
+    assert list(left.types) == list(right.types)
+    assert list(left.starts) == list(right.starts)
+    assert list(left.ends) == list(right.ends)
+
+
+@pytest.mark.parametrize(
+    "offset, removed_length, inserted_text",
+    [
+        (0, 0, "int a = 1; "),  # Insert at the start
+        (len(RELEX_PROGRAM), 0, "println(1);"),  # Append at the end
+        (RELEX_PROGRAM.index("count;"), 5, "total"),  # Rename an identifier
+        (RELEX_PROGRAM.index("count;") + 5, 0, "er"),  # Grow a token
+        (RELEX_PROGRAM.index("<="), 1, ""),  # Split "<=" into "="
+        (RELEX_PROGRAM.index("<=") + 1, 1, ""),  # Shrink "<=" to "<"
+        (RELEX_PROGRAM.index("step + 1"), 8, "step*2-1"),  # Retokenize a run
+        (RELEX_PROGRAM.index("int count"), 3, "int"),  # Same text, no change
+        (RELEX_PROGRAM.index(" = new"), 1, ""),  # Glue two tokens together
+        (0, len(RELEX_PROGRAM), "x;"),  # Replace everything
+    ],
+)
+def test_relex_matches_full_scan(offset, removed_length, inserted_text):
+    lexer = Lexer(RELEX_PROGRAM)
+    previous = lexer.tokenize_buffer()
+
+    updated = lexer.relex(previous, offset, removed_length, inserted_text)
+
+    edited = (
+        RELEX_PROGRAM[:offset]
+        + inserted_text
+        + RELEX_PROGRAM[offset + removed_length :]
+    )
+    assert lexer.text == edited
+    assert_same_buffer(updated, Lexer(edited).tokenize_buffer())
+
+
+def test_relex_repeated_edits():
+    lexer = Lexer(RELEX_PROGRAM)
+    buffer = lexer.tokenize_buffer()
+
+    for position in range(len(RELEX_PROGRAM) - 1, 0, -7):
+        buffer = lexer.relex(buffer, position, 1, " ")
+        assert_same_buffer(buffer, Lexer(lexer.text).tokenize_buffer())
+
+
+def test_relex_invalid_edit():
+    lexer = Lexer(RELEX_PROGRAM)
+    previous = lexer.tokenize_buffer()
+
+    with pytest.raises(TokenizerExceptions):
+        lexer.relex(previous, 4, 1, "$")
+    assert lexer.text == RELEX_PROGRAM
+    with pytest.raises(TokenizerExceptions):
+        lexer.relex(previous, len(RELEX_PROGRAM), 1, "")
+
+
+@pytest.mark.parametrize("mapped", [False, True])
+def test_relex_binary_source(tmp_path, mapped):
+    path = tmp_path / "program.pp"
+    path.write_text(RELEX_PROGRAM)
+    offset = RELEX_PROGRAM.index("count;")
+    edited = RELEX_PROGRAM[:offset] + "total" + RELEX_PROGRAM[offset + 5 :]
+
+    with map_source(path) as source:
+        lexer = Lexer(source if mapped else path.read_bytes())
+        previous = lexer.tokenize_buffer()
+        updated = lexer.relex(previous, offset, 5, "total")
+
+    assert lexer.text == edited.encode("ascii")
+    assert list(updated) == Lexer(edited).tokenize()
+    assert_same_buffer(updated, Lexer(edited.encode("ascii")).tokenize_buffer())
+
+
+def test_relex_binary_source_rejects_non_ascii():
+    source = RELEX_PROGRAM.encode("ascii")
+    lexer = Lexer(source)
+    previous = lexer.tokenize_buffer()
+
+    with pytest.raises(TokenizerExceptions, match="line 2, column 9"):
+        lexer.relex(previous, RELEX_PROGRAM.index("count;"), 5, "é")
+    assert lexer.text == source
@@ -0,0 +1,68 @@
+import pytest
+
+from src.lexer.lexer import Lexer, TokenizerExceptions
+from src.lexer.token import TokenType
+from src.lexer.token_stream import TokenStream
+from src.parser.parser import Parser
+from tests.helpers.nodes_equal import nodes_equal
+
+
+def test_iter_tokens_is_lazy():
+    tokens = Lexer("x = 1; $").iter_tokens()
+
+    assert next(tokens).type == TokenType.IDENTIFIER
+    assert next(tokens).type == TokenType.ASSIGN
+    assert next(tokens).type == TokenType.INTEGER
+    assert next(tokens).type == TokenType.SEMICOLON
+    with pytest.raises(TokenizerExceptions):
+        next(tokens)
+
+
+def test_iter_tokens_matches_tokenize():
+    text = "class A { init() {} def int f() { return 1 <= 2; } } A a = new A();"
+
+    assert list(Lexer(text).iter_tokens()) == Lexer(text).tokenize()
+
+
+def test_stream_indexing():
+    stream = TokenStream(Lexer("a b c").iter_tokens())
+
+    assert stream[0].value == "a"
+    assert stream[1].value == "b"
+    assert stream[3].type == TokenType.EOF
+    with pytest.raises(IndexError):
+        stream[4]
+
+
+def test_stream_evicts_old_tokens():
+    stream = TokenStream(Lexer("a b c d").iter_tokens(), lookahead=2)
+
+    assert stream[2].value == "c"
+    assert stream[1].value == "b"
+    with pytest.raises(IndexError):
+        stream[0]
+
+
+def test_stream_window_stays_bounded():
+    stream = TokenStream(Lexer("x " * 1000).iter_tokens(), lookahead=3)
+
+    for index in range(1000):
+        assert stream[index].value == "x"
+    assert len(stream.window) == 3
+
+
+def test_parser_on_stream():
+    text = """class Animal {
+    init() {}
+    def void speak() { return println(0); }
+}
+Animal cat = new Animal();
+cat = cat;
+if (1 < 2) { cat.speak(); } else { while (true) { break; } }"""
+
+    from_list = Parser(Lexer(text).tokenize()).parse_program()
+    parser = Parser(TokenStream(Lexer(text).iter_tokens()))
+    from_stream = parser.parse_program()
+
+    assert nodes_equal(from_list, from_stream)
+    assert parser.current_type == TokenType.EOF